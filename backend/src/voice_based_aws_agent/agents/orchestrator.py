@@ -9,6 +9,7 @@ from .supervisor_agent import SupervisorAgent
 from .photo_memory_agent import PhotoMemoryAgent
 from ..config.tool_config import setup_tool_environment, get_tool_config
 from ..config.conversation_config import ConversationConfig
+from ..utils.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -68,18 +69,44 @@ class AgentOrchestrator:
         Returns:
             Response from the appropriate specialized agent
         """
+        response, _ = await self.process_query_with_status(query)
+        return response
+
+    async def process_query_with_status(self, query: str):
+        """
+        Process a user query and report whether an agent answered it.
+
+        Args:
+            query: User query to process
+
+        Returns:
+            Tuple of the agent's response and True, or an error message and False
+        """
         if not self.supervisor:
-            return "Error: Agent system not properly initialized"
+            return "Error: Agent system not properly initialized", False
 
         try:
             logger.info(f"Processing query: {query}")
-            response = await self.supervisor.route_query(query)
-            logger.info("Query processed successfully")
-            return response
+            with span("orchestrator.process_query"):
+                response, ok = await self.supervisor.route_query_with_status(query)
+            logger.info("Query processed successfully" if ok else "Query failed")
+            return response, ok
 
         except Exception as e:
             logger.error(f"Error processing query: {str(e)}")
-            return f"Error: Unable to process query - {str(e)}"
+            return f"Error: Unable to process query - {str(e)}", False
+
+    async def record_exchange(self, query: str, response: str):
+        """
+        Add an exchange answered without the agents, e.g. from a cache shared
+        with other sessions, to the conversation history.
+
+        Args:
+            query: User query
+            response: Response the user was given
+        """
+        if self.supervisor:
+            await self.supervisor.record_exchange(query, response)
 
     def get_agent_status(self) -> Dict[str, Any]:
         """
@@ -95,6 +122,8 @@ class AgentOrchestrator:
                 ConversationConfig.get_recommended_config(agent_type)
             )
 
+        photo_memory_agent = self.specialized_agents.get("PhotoMemoryAgent")
+
         return {
             "supervisor": "active" if self.supervisor else "inactive",
             "specialized_agents": {
@@ -108,6 +137,9 @@ class AgentOrchestrator:
                 "configurations": conversation_configs,
                 "manager_type": "SlidingWindowConversationManager",
             },
+            "intent_fast_path": (
+                photo_memory_agent.intent_fast_path.stats() if photo_memory_agent else None
+            ),
         }
 
     def shutdown(self):
@@ -6,11 +6,16 @@ Handles photo-related queries and memory operations using MCP tools via AgentCor
 from strands import Agent
 import logging
 import os
-import requests
 import json
+import time
 from typing import Dict, Any
+from ..config.config import IntentFastPathConfig
 from ..config.conversation_config import ConversationConfig, log_conversation_config
-from ..config.config import create_bedrock_model
+from ..utils.shared_clients import HTTP_TIMEOUT, get_bedrock_model, get_http_session, get_oauth_token
+from ..utils.deadlines import DeadlineExceeded, request_timeout
+from ..utils.intents import get_intent_fast_path
+from ..utils.metrics import MCP_CALL_SECONDS
+from ..utils.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -28,8 +33,8 @@ class PhotoMemoryAgent(Agent):
         Args:
             config: AgentConfig instance for AWS profile and region settings
         """
-        # Create properly configured Bedrock model
-        bedrock_model = create_bedrock_model(config)
+        # Share the Bedrock model (and its client) with every other session
+        bedrock_model = get_bedrock_model(config)
 
         # Create conversation manager for this agent
         conversation_manager = ConversationConfig.create_conversation_manager(
@@ -53,6 +58,50 @@ class PhotoMemoryAgent(Agent):
         self.oauth_client_id = os.environ.get('OAUTH_CLIENT_ID')
         self.oauth_client_secret = os.environ.get('OAUTH_CLIENT_SECRET')
 
+        # Simple requests call their MCP tool directly instead of taking a model turn
+        self.intent_fast_path = get_intent_fast_path(
+            getattr(config, "intent_fast_path", None) or IntentFastPathConfig()
+        )
+
+    def __call__(self, prompt=None, **kwargs):
+        """
+        Answer a query, directly if it is a simple request the fast path recognizes.
+
+        Args:
+            prompt: User query
+            **kwargs: Passed to the Strands Agent call
+
+        Returns:
+            The tool result text for fast path answers, otherwise the agent's result
+        """
+        if not self.gateway_url or not isinstance(prompt, str):
+            return super().__call__(prompt, **kwargs)
+        return self.intent_fast_path.handle(
+            prompt,
+            answer=lambda intent: self._answer_intent(prompt, intent),
+            fallback=lambda query: super(PhotoMemoryAgent, self).__call__(query, **kwargs),
+        )
+
+    def _answer_intent(self, query: str, intent) -> str:
+        """Call the MCP tool for a recognized intent and record the exchange."""
+        with span("agent.fast_path", intent=intent.name):
+            if intent.name == "get_tags":
+                response = self._get_photo_tags()
+            elif intent.name == "start_slideshow":
+                response = self._start_photo_slideshow(query=intent.slots or None)
+            else:
+                response = self._remember_memory(intent.slots["text"])
+
+        self.record_exchange(query, response)
+        return response
+
+    def record_exchange(self, query: str, response: str):
+        """Add an exchange answered without the model to the conversation history."""
+        # Keep the conversation history complete for follow-ups the model answers
+        self.messages.append({"role": "user", "content": [{"text": query}]})
+        self.messages.append({"role": "assistant", "content": [{"text": response}]})
+        self.conversation_manager.apply_management(self)
+
     async def process_query(self, query: str) -> str:
         """
         Process a query for photo/memory operations.
@@ -154,16 +203,13 @@ NEVER:
         if not all([self.cognito_token_url, self.oauth_client_id, self.oauth_client_secret]):
             raise RuntimeError('Missing Cognito token endpoint or client credentials in environment')
         
-        resp = requests.post(
-            self.cognito_token_url,
-            data={'grant_type': 'client_credentials', 'client_id': self.oauth_client_id},
-            auth=(self.oauth_client_id, self.oauth_client_secret)
-        )
-        resp.raise_for_status()
-        return resp.json().get('access_token')
+        # Tokens are cached process-wide until shortly before they expire
+        return get_oauth_token(self.cognito_token_url, self.oauth_client_id, self.oauth_client_secret)
 
     def _call_mcp_tool(self, tool_name: str, arguments: dict) -> dict:
         """Call an MCP tool via the AgentCore Gateway."""
+        start_time = time.perf_counter()
+        outcome = "error"
         try:
             token = self._get_token()
             headers = {
@@ -174,16 +220,27 @@ NEVER:
             url = self.gateway_url.rstrip('/') + '/tools/call'
             
             logger.info(f"Calling MCP tool: {tool_name} with arguments: {arguments}")
-            response = requests.post(url, headers=headers, data=json.dumps(body))
+            with span("mcp.call", tool=tool_name):
+                response = get_http_session().post(
+                    url, headers=headers, data=json.dumps(body), timeout=request_timeout(HTTP_TIMEOUT)
+                )
             response.raise_for_status()
             
             result = response.json()
             logger.info(f"MCP tool {tool_name} returned: {result}")
+            outcome = "ok"
             return result
             
+        except DeadlineExceeded as e:
+            # The voice turn gave up on this call, don't start or wait for it
+            outcome = "deadline"
+            logger.warning(f"Skipped MCP tool {tool_name}: {str(e)}")
+            return {"error": str(e)}
         except Exception as e:
             logger.error(f"Error calling MCP tool {tool_name}: {str(e)}")
             return {"error": str(e)}
+        finally:
+            MCP_CALL_SECONDS.observe(time.perf_counter() - start_time, tool=tool_name, outcome=outcome)
 
     def _start_photo_slideshow(self, query: dict = None, settings: dict = None) -> str:
         """Start a photo slideshow using the MCP photo service."""
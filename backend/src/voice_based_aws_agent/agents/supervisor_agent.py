@@ -5,8 +5,14 @@ Routes user queries to appropriate specialized agents without any tools or reaso
 
 from strands import Agent
 from typing import Dict, Any
+from ..config.config import AgentPoolConfig
 from ..config.conversation_config import ConversationConfig, log_conversation_config
-from ..config.config import create_bedrock_model
+from ..config.routing_config import DEFAULT_AGENT, ROUTES
+from ..utils.agent_executor import get_agent_executor
+from ..utils.shared_clients import get_bedrock_model
+from ..utils.deadlines import check_deadline
+from ..utils.routing_table import RoutingTable
+from ..utils.tracing import span
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,6 +24,9 @@ class SupervisorAgent(Agent):
     No tools, no reasoning - just routing based on query type.
     """
 
+    # Compiled once at import and shared by every session's supervisor
+    routing_table = RoutingTable(ROUTES, default_agent=DEFAULT_AGENT)
+
     def __init__(self, specialized_agents: Dict[str, Agent], config=None):
         """
         Initialize supervisor with references to specialized agents.
@@ -26,8 +35,8 @@ class SupervisorAgent(Agent):
             specialized_agents: Dictionary mapping agent names to agent instances
             config: AgentConfig instance for AWS profile and region settings
         """
-        # Create properly configured Bedrock model with specified profile
-        bedrock_model = create_bedrock_model(config)
+        # Share the Bedrock model (and its client) with every other session
+        bedrock_model = get_bedrock_model(config)
 
         # Create conversation manager for supervisor (smaller window since it just routes)
         conversation_manager = ConversationConfig.create_conversation_manager(
@@ -45,6 +54,14 @@ class SupervisorAgent(Agent):
 
         self.specialized_agents = specialized_agents
 
+        unknown_agents = self.routing_table.agents - specialized_agents.keys()
+        if unknown_agents:
+            logger.warning(f"Routing table targets agents that are not available: {sorted(unknown_agents)}")
+
+        # Agent calls block for the whole Bedrock round trip, so they run on
+        # per-agent thread pools instead of the server's event loop
+        self.agent_executor = get_agent_executor(getattr(config, "agent_pool", None) or AgentPoolConfig())
+
         # Log configuration
         logger.info(
             "SupervisorAgent initialized with BedrockModel (configured profile, us-east-1, Claude 3 Haiku)"
@@ -103,6 +120,19 @@ ALWAYS:
         Returns:
             Response from the specialized agent
         """
+        response, _ = await self.route_query_with_status(query)
+        return response
+
+    async def route_query_with_status(self, query: str):
+        """
+        Route a query to the appropriate specialized agent.
+
+        Args:
+            query: User query to route
+
+        Returns:
+            Tuple of the agent's response and True, or an error message and False
+        """
         logger.info(f"Routing query: {query}")
 
         # Determine which agent to route to
@@ -110,25 +140,47 @@ ALWAYS:
 
         if agent_name not in self.specialized_agents:
             logger.error(f"Agent {agent_name} not found in specialized agents")
-            return f"Error: Unable to route query - {agent_name} not available"
+            return f"Error: Unable to route query - {agent_name} not available", False
 
         # Route to specialized agent
         specialized_agent = self.specialized_agents[agent_name]
         logger.info(f"Routing to {agent_name}")
 
         try:
-            # Use the Strands Agent's direct call method
-            response = specialized_agent(query)
+            # Don't start an agent for a tool call that was already abandoned
+            check_deadline()
+
+            # Use the Strands Agent's direct call method, off the event loop
+            with span("agent", agent=agent_name):
+                response = await self.agent_executor.run(agent_name, specialized_agent, query)
             logger.info(f"Received response from {agent_name}")
-            return response
+            return response, True
 
         except Exception as e:
             logger.error(f"Error from {agent_name}: {str(e)}")
-            return f"Error: {agent_name} encountered an issue: {str(e)}"
+            return f"Error: {agent_name} encountered an issue: {str(e)}", False
+
+    async def record_exchange(self, query: str, response: str):
+        """
+        Add an exchange answered without the agents, e.g. from a cache, to the
+        history of the agent the query routes to.
+
+        Args:
+            query: User query
+            response: Response the user was given
+        """
+        agent_name = self._determine_agent(query)
+        agent = self.specialized_agents.get(agent_name)
+        if agent is None or not hasattr(agent, "record_exchange"):
+            return
+        # On the agent's pool, so it doesn't interleave with a call in progress
+        await self.agent_executor.run(
+            agent_name, agent, query, call=lambda query: agent.record_exchange(query, response)
+        )
 
     def _determine_agent(self, query: str) -> str:
         """
-        Determine which agent should handle the query based on keywords.
+        Determine which agent should handle the query using the routing table.
 
         Args:
             query: User query
@@ -136,20 +188,5 @@ ALWAYS:
         Returns:
             Name of the agent to route to
         """
-        query_lower = query.lower()
-
-        # Photo and memory keywords
-        photo_memory_keywords = [
-            "photo", "photos", "picture", "pictures", "image", "images",
-            "slideshow", "gallery", "album", "memory", "memories", 
-            "remember", "recall", "event", "moment", "tag", "tags",
-            "when", "where", "who", "what happened", "show me",
-            "view", "display", "organize", "search", "find"
-        ]
-
-        # Check for photo/memory related content
-        if any(keyword in query_lower for keyword in photo_memory_keywords):
-            return "PhotoMemoryAgent"
-
-        # Default to PhotoMemoryAgent for all queries (since this is a photo/memory system)
-        return "PhotoMemoryAgent"
+        # Queries that match no route go to DEFAULT_AGENT (PhotoMemoryAgent)
+        return self.routing_table.route(query)
@@ -1,9 +1,175 @@
 """Configuration settings for the voice-based AWS agent."""
 
 import os
-import boto3
-from dataclasses import dataclass
-from strands.models import BedrockModel
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from strands.models import BedrockModel
+
+
+@dataclass
+class StreamPoolConfig:
+    """Configuration for the pre-warmed Nova Sonic stream pool."""
+
+    enabled: bool = True
+    min_size: int = 2  # Streams kept ready at all times
+    max_size: int = 8  # Upper bound the pool grows to under connection bursts
+    idle_timeout: float = 30.0  # Seconds before an unused stream is recycled
+    refill_interval: float = 1.0  # Seconds between refill passes
+    open_timeout: float = 30.0  # Timeout for opening a single stream
+
+
+@dataclass
+class AudioCoalescingConfig:
+    """Configuration for merging queued audio chunks into one audioInput event."""
+
+    enabled: bool = True
+    max_batch_bytes: int = 16000  # PCM bytes per merged event (0.5s at 16kHz/16-bit)
+    max_delay_ms: float = 20.0  # Time to wait for more chunks after the first one
+
+
+@dataclass
+class QueueConfig:
+    """Capacities and overflow policies for the per-session audio queues.
+
+    Policies: "block" (wait for space), "drop_oldest", or "drop_audio"
+    (drop audio but keep control events). A capacity of 0 means unbounded.
+    """
+
+    audio_input_capacity: int = 200
+    audio_input_policy: str = "drop_oldest"
+    output_capacity: int = 500
+    output_policy: str = "drop_audio"
+
+
+@dataclass
+class OutputForwardingConfig:
+    """Configuration for forwarding Bedrock output events to the browser."""
+
+    passthrough: bool = True  # Forward raw event bytes, parsing only toolUse/contentEnd
+    batching: bool = True  # Send batched frames to clients that negotiate them
+    batch_max_delay_ms: float = 5.0  # Time to wait for more events after the first one
+    batch_max_events: int = 64
+
+
+@dataclass
+class ToolExecutionConfig:
+    """Configuration for running Nova Sonic tool uses."""
+
+    speculative: bool = False  # Start tools on toolUse instead of waiting for the TOOL contentEnd
+    timeout: float = 20.0  # Deadline for a tool call, from the start of processing
+    # Tool result Nova Sonic speaks from when a tool call misses its deadline
+    fallback_message: str = "Sorry, that is taking longer than expected. Please try again in a moment."
+
+
+@dataclass
+class AgentPoolConfig:
+    """Configuration for the thread pools that run synchronous agent calls."""
+
+    max_concurrency: int = 8  # Concurrent calls per agent type in this process
+    per_agent: dict = field(default_factory=dict)  # Limits by agent name, e.g. {"PhotoMemoryAgent": 4}
+
+
+@dataclass
+class ResultCacheConfig:
+    """Configuration for caching supervisorAgent results of read-only tools."""
+
+    enabled: bool = True
+    max_entries: int = 256  # Least recently used results are evicted beyond this
+    # Seconds a result stays fresh, by the MCP tool the query resolves to.
+    # Queries for tools not listed here (slideshows, memory writes) always run
+    tool_ttls: dict = field(default_factory=lambda: {"photo_service.get_tags": 60.0})
+
+
+@dataclass
+class SimilarityCacheConfig:
+    """Configuration for reusing supervisorAgent results of near-duplicate queries."""
+
+    enabled: bool = True
+    threshold: float = 0.85  # Cosine similarity of TF-IDF vectors that counts as the same query
+    max_entries: int = 512  # Least recently used queries are evicted beyond this
+    ttl: float = 60.0  # Seconds a result stays fresh
+    dimensions: int = 1024  # Hashed TF-IDF columns per query
+    # Read-only MCP tools whose results may be reused for similar queries
+    tools: tuple = ("photo_service.get_tags",)
+    # Also reuse answers to questions that resolve to no MCP tool. Questions that refer back
+    # to the conversation ("where was that?") are never reused across sessions
+    cache_questions: bool = False
+    min_question_terms: int = 3  # Content words (including the question word) a question needs to be reused
+
+
+@dataclass
+class IntentFastPathConfig:
+    """Configuration for answering simple PhotoMemoryAgent requests without the model."""
+
+    enabled: bool = True
+    # Intents answered directly; the rest, and anything the rules aren't sure of, go to the model
+    intents: tuple = ("get_tags", "start_slideshow", "remember")
+    max_slideshow_tags: int = 3  # Longer tag lists are left to the model
+    min_memory_words: int = 3  # Shorter memories are left to the model
+
+
+@dataclass
+class AdmissionConfig:
+    """Concurrency limits for voice sessions (0 disables a limit)."""
+
+    max_sessions: int = 50  # Concurrent sessions (Bedrock streams) per server process
+    max_sessions_per_client: int = 4  # Active plus waiting sessions per client IP
+    max_queue: int = 20  # Connections allowed to wait for a free slot
+    queue_timeout: float = 10.0  # Seconds a connection may wait before rejection
+
+
+@dataclass
+class SessionResumeConfig:
+    """Configuration for resuming sessions after a WebSocket reconnect."""
+
+    enabled: bool = True
+    grace_period: float = 30.0  # Seconds a detached session is kept alive
+    max_parked: int = 100  # Detached sessions kept at once
+
+
+@dataclass
+class MetricsConfig:
+    """Configuration for the HTTP metrics endpoint."""
+
+    enabled: bool = True
+    port: int = 9090  # In worker mode, worker N serves on port + N
+
+
+@dataclass
+class TracingConfig:
+    """Configuration for per-turn latency tracing."""
+
+    enabled: bool = True
+    sample_rate: float = 1.0  # Fraction of turns exported
+    ring_size: int = 200  # Recent turns kept in memory and served at /traces
+    file_path: str = None  # Optional rotating JSONL file for exported turns
+    max_bytes: int = 10_000_000  # Rotate the JSONL file at this size
+    backup_count: int = 5  # Rotated JSONL files kept
+
+
+@dataclass
+class FakeSonicConfig:
+    """Configuration for the local Nova Sonic stand-in used for load testing."""
+
+    enabled: bool = False
+    open_delay_ms: float = 0.0  # Time to open a stream
+    min_speech_ms: float = 200.0  # Non-silent input needed to count as an utterance
+    end_of_speech_ms: float = 300.0  # Trailing silence that ends an utterance
+    response_delay_ms: float = 200.0  # Between the user transcript and the response
+    tool_use_every: int = 2  # Every Nth turn uses the supervisorAgent tool, 0 for never
+    parallel_tool_uses: int = 1  # toolUses issued at once on tool turns
+    tool_latency_ms: float = 250.0  # Latency of the fake supervisor agent
+    tool_content_end_delay_ms: float = 0.0  # Between a toolUse and its TOOL contentEnd
+    tool_timeout_ms: float = 30000.0  # How long a toolUse waits for its result
+    audio_output_ms: float = 2000.0  # Assistant audio per turn
+    audio_chunk_ms: float = 40.0  # Audio per audioOutput event
+    realtime_output: bool = True  # Pace audio output in real time
+    strict: bool = False  # Fail the stream on event ordering errors, like Nova Sonic
+    user_transcript: str = "Show me photos from the beach"
+    assistant_text: str = "Starting a slideshow of your beach photos."
+    tool_result: str = "Slideshow started successfully: Started"
 
 
 @dataclass
@@ -16,6 +182,20 @@ class AgentConfig:
     temperature: float = 0.0
     max_tokens: int = 2048  # Recommended max tokens for better responses
     request_timeout: int = 300  # Timeout in seconds for API requests
+    stream_pool: StreamPoolConfig = field(default_factory=StreamPoolConfig)
+    audio_coalescing: AudioCoalescingConfig = field(default_factory=AudioCoalescingConfig)
+    queues: QueueConfig = field(default_factory=QueueConfig)
+    output_forwarding: OutputForwardingConfig = field(default_factory=OutputForwardingConfig)
+    tool_execution: ToolExecutionConfig = field(default_factory=ToolExecutionConfig)
+    result_cache: ResultCacheConfig = field(default_factory=ResultCacheConfig)
+    similarity_cache: SimilarityCacheConfig = field(default_factory=SimilarityCacheConfig)
+    agent_pool: AgentPoolConfig = field(default_factory=AgentPoolConfig)
+    intent_fast_path: IntentFastPathConfig = field(default_factory=IntentFastPathConfig)
+    admission: AdmissionConfig = field(default_factory=AdmissionConfig)
+    session_resume: SessionResumeConfig = field(default_factory=SessionResumeConfig)
+    metrics: MetricsConfig = field(default_factory=MetricsConfig)
+    tracing: TracingConfig = field(default_factory=TracingConfig)
+    fake_sonic: FakeSonicConfig = field(default_factory=FakeSonicConfig)
 
     def __post_init__(self):
         """Set default profile_name if not provided."""
@@ -34,7 +214,7 @@ class VoiceConfig:
     timeout_seconds: int = 5  # Silence timeout
 
 
-def create_bedrock_model(config: AgentConfig = None) -> BedrockModel:
+def create_bedrock_model(config: AgentConfig = None) -> "BedrockModel":
     """
     Create a properly configured BedrockModel for Strands agents.
 
@@ -44,6 +224,10 @@ def create_bedrock_model(config: AgentConfig = None) -> BedrockModel:
     Returns:
         BedrockModel configured with the specified profile and region
     """
+    # Imported here so loading the configuration doesn't pull in boto3/Strands
+    import boto3
+    from strands.models import BedrockModel
+
     if config is None:
         config = AgentConfig()
 
@@ -0,0 +1,43 @@
+"""
+Routing Configuration Module
+Declarative table the SupervisorAgent uses to pick a specialized agent for a query.
+"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+
+@dataclass(frozen=True)
+class Route:
+    """
+    Words and patterns that send a query to one specialized agent.
+
+    Keywords and phrases are matched against whole lowercased words, so
+    "tag" does not match "vintage". Patterns are regular expressions searched
+    in the lowercased query with punctuation replaced by single spaces. When
+    several routes match, the highest priority wins and ties go to the route
+    listed first.
+    """
+
+    agent: str
+    keywords: Tuple[str, ...] = ()
+    phrases: Tuple[str, ...] = ()
+    patterns: Tuple[str, ...] = ()
+    priority: int = 0
+
+
+# Agent for queries that match no route
+DEFAULT_AGENT = "PhotoMemoryAgent"
+
+ROUTES = (
+    Route(
+        agent="PhotoMemoryAgent",
+        keywords=(
+            "photo", "photos", "picture", "pictures", "image", "images",
+            "slideshow", "gallery", "album", "memory", "memories",
+            "remember", "recall", "event", "moment", "tag", "tags",
+            "when", "where", "who", "view", "display", "organize", "search", "find",
+        ),
+        phrases=("what happened", "show me"),
+    ),
+)
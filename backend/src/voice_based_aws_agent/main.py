@@ -14,7 +14,24 @@ from pathlib import Path
 current_dir = Path(__file__).parent
 sys.path.insert(0, str(current_dir))
 
-from utils.voice_integration.server import run_server
+from utils.startup_profile import startup_profiler
+
+# Enabled before argument parsing so the imports below are timed too
+startup_profiler.enabled = "--startup-profile" in sys.argv
+
+with startup_profiler.imports_of("utils.voice_integration.server"):
+    from utils.voice_integration.server import run_server
+with startup_profiler.imports_of("utils.voice_integration.workers"):
+    from utils.voice_integration.workers import run_workers
+with startup_profiler.imports_of("config.config"):
+    from config.config import (
+        StreamPoolConfig,
+        AdmissionConfig,
+        MetricsConfig,
+        TracingConfig,
+        FakeSonicConfig,
+        ToolExecutionConfig,
+    )
 
 # Configure logging with different levels for different components
 logging.basicConfig(
@@ -65,6 +82,87 @@ def main():
     parser.add_argument(
         "--port", type=int, default=8080, help="WebSocket server port (default: 8080)"
     )
+    parser.add_argument(
+        "--pool-min",
+        type=int,
+        default=StreamPoolConfig.min_size,
+        help=f"Pre-warmed Nova Sonic streams kept ready (default: {StreamPoolConfig.min_size}, 0 disables the pool)",
+    )
+    parser.add_argument(
+        "--pool-max",
+        type=int,
+        default=StreamPoolConfig.max_size,
+        help=f"Maximum pre-warmed streams under load (default: {StreamPoolConfig.max_size})",
+    )
+    parser.add_argument(
+        "--pool-idle-timeout",
+        type=float,
+        default=StreamPoolConfig.idle_timeout,
+        help=f"Seconds before an unused pooled stream is recycled (default: {StreamPoolConfig.idle_timeout})",
+    )
+    parser.add_argument(
+        "--max-sessions",
+        type=int,
+        default=AdmissionConfig.max_sessions,
+        help=f"Maximum concurrent voice sessions per process (default: {AdmissionConfig.max_sessions}, 0 for unlimited)",
+    )
+    parser.add_argument(
+        "--max-sessions-per-client",
+        type=int,
+        default=AdmissionConfig.max_sessions_per_client,
+        help=f"Maximum concurrent voice sessions per client IP (default: {AdmissionConfig.max_sessions_per_client}, 0 for unlimited)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes sharing the port via SO_REUSEPORT (default: 1). "
+        "Session resume after a reconnect is disabled with more than one worker",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=MetricsConfig.port,
+        help=f"Port of the HTTP /metrics endpoint (default: {MetricsConfig.port}, 0 disables it; worker N uses port + N)",
+    )
+    parser.add_argument(
+        "--trace-sample-rate",
+        type=float,
+        default=TracingConfig.sample_rate,
+        help=f"Fraction of voice turns traced and exported (default: {TracingConfig.sample_rate}, 0 disables tracing)",
+    )
+    parser.add_argument(
+        "--trace-file",
+        default=None,
+        help="Rotating JSONL file for turn traces (default: keep recent turns in memory, served at /traces)",
+    )
+    parser.add_argument(
+        "--fake-sonic",
+        action="store_true",
+        help="Use a local scripted stand-in for Nova Sonic and the agents (load testing without AWS)",
+    )
+    parser.add_argument(
+        "--fake-tool-latency-ms",
+        type=float,
+        default=FakeSonicConfig.tool_latency_ms,
+        help=f"Supervisor tool latency with --fake-sonic (default: {FakeSonicConfig.tool_latency_ms})",
+    )
+    parser.add_argument(
+        "--fake-parallel-tool-uses",
+        type=int,
+        default=FakeSonicConfig.parallel_tool_uses,
+        help=f"Concurrent toolUses per tool turn with --fake-sonic (default: {FakeSonicConfig.parallel_tool_uses})",
+    )
+    parser.add_argument(
+        "--speculative-tools",
+        action="store_true",
+        help="Start tool calls as soon as Nova Sonic's toolUse arrives instead of at the TOOL contentEnd",
+    )
+    parser.add_argument(
+        "--startup-profile",
+        action="store_true",
+        help="Print import and initialization times once the server accepts connections",
+    )
 
     args = parser.parse_args()
 
@@ -78,19 +176,54 @@ def main():
     logger.info(f"AWS Region: {args.region}")
     logger.info(f"Voice: {args.voice}")
     logger.info(f"Server: {args.host}:{args.port}")
+    logger.info(f"Stream pool: min={args.pool_min}, max={args.pool_max}")
+    logger.info(f"Session limits: {args.max_sessions} total, {args.max_sessions_per_client} per client")
+    logger.info(f"Workers: {args.workers}")
+    logger.info(f"Metrics: {f'http://{args.host}:{args.metrics_port}/metrics' if args.metrics_port else 'disabled'}")
     logger.info(f"Frontend: http://localhost:3000")
     logger.info("=" * 60)
 
+    server_kwargs = dict(
+        profile_name=args.profile,
+        region=args.region,
+        host=args.host,
+        port=args.port,
+        stream_pool_config=StreamPoolConfig(
+            enabled=args.pool_min > 0,
+            min_size=args.pool_min,
+            max_size=args.pool_max,
+            idle_timeout=args.pool_idle_timeout,
+        ),
+        admission_config=AdmissionConfig(
+            max_sessions=args.max_sessions,
+            max_sessions_per_client=args.max_sessions_per_client,
+        ),
+        metrics_config=MetricsConfig(
+            enabled=args.metrics_port > 0,
+            port=args.metrics_port,
+        ),
+        tracing_config=TracingConfig(
+            enabled=args.trace_sample_rate > 0,
+            sample_rate=args.trace_sample_rate,
+            file_path=args.trace_file,
+        ),
+        tool_execution_config=ToolExecutionConfig(
+            speculative=args.speculative_tools,
+        ),
+        fake_sonic_config=FakeSonicConfig(
+            enabled=args.fake_sonic,
+            tool_latency_ms=args.fake_tool_latency_ms,
+            parallel_tool_uses=args.fake_parallel_tool_uses,
+        ),
+    )
+
     try:
-        # Run the server
-        asyncio.run(
-            run_server(
-                profile_name=args.profile,
-                region=args.region,
-                host=args.host,
-                port=args.port,
-            )
-        )
+        if args.workers > 1:
+            # Run one server per worker process on the same port
+            run_workers(args.workers, **server_kwargs)
+        else:
+            # Run the server
+            asyncio.run(run_server(**server_kwargs))
     except KeyboardInterrupt:
         logger.info("Voice assistant stopped by user")
     except Exception as e:
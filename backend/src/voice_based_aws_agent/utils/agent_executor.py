@@ -0,0 +1,148 @@
+"""
+Bounded thread pools for synchronous Strands agent calls.
+
+Calling a Strands agent (``agent(query)``) blocks for the whole Bedrock
+and tool round trip. Run on the server's event loop, that froze audio
+forwarding for every connected session. ``AgentExecutor`` runs each call
+on a thread pool owned by the agent type instead. The pool's size is that
+agent's concurrency limit across the process, so one slow agent can't take
+every thread. Calls to the same agent instance are serialized, because an
+agent's conversation state can't take two requests at once. Each call runs
+in a copy of the caller's context, so trace spans and the tool call
+deadline follow it into the thread.
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+import weakref
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from src.voice_based_aws_agent.utils.deadlines import check_deadline
+from src.voice_based_aws_agent.utils.metrics import AGENT_CALLS_IN_FLIGHT, AGENT_CALLS_QUEUED
+
+logger = logging.getLogger("AgentExecutor")
+
+
+class AgentExecutor:
+    """Runs blocking agent calls off the event loop with per-agent limits."""
+
+    def __init__(self, max_concurrency=8, per_agent=None):
+        """
+        Initialize the executor. Pools are created on an agent's first call.
+
+        Args:
+            max_concurrency: Concurrent calls per agent type
+            per_agent: Optional limits by agent name, overriding max_concurrency
+        """
+        self.max_concurrency = max_concurrency
+        self.per_agent = dict(per_agent or {})
+        self._pools = {}
+        self._instance_locks = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.queued = Counter()
+        self.in_flight = Counter()
+        self.completed = Counter()
+
+    @classmethod
+    def from_config(cls, agent_pool_config):
+        """Create an executor from an AgentPoolConfig."""
+        return cls(max_concurrency=agent_pool_config.max_concurrency, per_agent=agent_pool_config.per_agent)
+
+    def _pool(self, agent_name):
+        with self._lock:
+            pool = self._pools.get(agent_name)
+            if pool is None:
+                limit = self.per_agent.get(agent_name, self.max_concurrency)
+                pool = self._pools[agent_name] = ThreadPoolExecutor(
+                    max_workers=limit, thread_name_prefix=f"agent-{agent_name}"
+                )
+                AGENT_CALLS_IN_FLIGHT.set_function(lambda: self.in_flight[agent_name], agent=agent_name)
+                AGENT_CALLS_QUEUED.set_function(lambda: self.queued[agent_name], agent=agent_name)
+                logger.info(f"Agent pool for {agent_name} allows {limit} concurrent calls")
+            return pool
+
+    def _instance_lock(self, agent):
+        with self._lock:
+            lock = self._instance_locks.get(agent)
+            if lock is None:
+                lock = self._instance_locks[agent] = threading.Lock()
+            return lock
+
+    async def run(self, agent_name, agent, query, call=None):
+        """
+        Call ``agent(query)`` on the agent's pool and wait for the response.
+
+        Args:
+            agent_name: Name the concurrency limit applies to
+            agent: Callable agent instance
+            query: Query passed to the agent
+            call: Optional callable run with ``query`` instead of the agent,
+                still serialized with the agent's other calls
+
+        Returns:
+            The agent's response
+        """
+        instance_lock = self._instance_lock(agent)
+
+        def invoke():
+            with self._lock:
+                self.queued[agent_name] -= 1
+                self.in_flight[agent_name] += 1
+            try:
+                with instance_lock:
+                    # The caller may have given up while this call was queued
+                    check_deadline()
+                    return (call or agent)(query)
+            finally:
+                with self._lock:
+                    self.in_flight[agent_name] -= 1
+                    self.completed[agent_name] += 1
+
+        def on_done(future):
+            if future.cancelled():
+                # Dropped before a thread picked it up
+                with self._lock:
+                    self.queued[agent_name] -= 1
+
+        pool = self._pool(agent_name)
+        with self._lock:
+            self.queued[agent_name] += 1
+        future = pool.submit(contextvars.copy_context().run, invoke)
+        future.add_done_callback(on_done)
+        return await asyncio.wrap_future(future)
+
+    def stats(self):
+        """
+        Get queued and in-flight calls per agent.
+
+        Returns:
+            Dictionary of per-agent counts
+        """
+        with self._lock:
+            return {
+                name: {
+                    "limit": self.per_agent.get(name, self.max_concurrency),
+                    "queued": self.queued[name],
+                    "in_flight": self.in_flight[name],
+                    "completed": self.completed[name],
+                }
+                for name in self._pools
+            }
+
+
+_shared_executor = None
+_shared_executor_lock = threading.Lock()
+
+
+def get_agent_executor(agent_pool_config):
+    """Get the process-wide agent executor, creating it on first use."""
+    global _shared_executor
+    with _shared_executor_lock:
+        if _shared_executor is None:
+            _shared_executor = AgentExecutor.from_config(agent_pool_config)
+        return _shared_executor
@@ -1,6 +1,5 @@
 """AWS authentication utilities."""
 
-import boto3
 import sys
 from pathlib import Path
 
@@ -21,6 +20,8 @@ def get_aws_session(profile_name=None, region=None):
     Returns:
         boto3.Session: Authenticated AWS session
     """
+    import boto3  # Imported on first use to keep server start-up fast
+
     config = AgentConfig()
     profile = profile_name or config.profile_name
     region = region or config.region
@@ -0,0 +1,109 @@
+"""
+Deadlines and cancellation for tool calls.
+
+A ``Deadline`` starts when the session manager begins processing a toolUse
+and follows the work through a context variable, like the turn trace: the
+orchestrator, the agents and MCP HTTP calls ask for ``request_timeout()``
+or call ``check_deadline()`` before starting anything slow. When the
+deadline passes, or the session closes or the user interrupts, the
+deadline is cancelled. Threads still working on the turn then stop at their
+next check instead of holding threads and sockets for a turn nobody is
+waiting for.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# Deadline of the tool call the current task or thread is working on
+_current_deadline = contextvars.ContextVar("tool_deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when work continues past its deadline or after cancellation."""
+
+
+class Deadline:
+    """An absolute time limit that can also be cancelled, from any thread."""
+
+    def __init__(self, timeout):
+        """
+        Initialize the deadline.
+
+        Args:
+            timeout: Seconds from now until the deadline
+        """
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+        self.reason = None
+        self._cancelled = threading.Event()
+
+    def remaining(self):
+        """Seconds left, 0 once expired or cancelled."""
+        if self._cancelled.is_set():
+            return 0.0
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def expired(self):
+        return self._cancelled.is_set() or time.monotonic() >= self.expires_at
+
+    def cancel(self, reason):
+        """Cancel the work, e.g. because the session closed."""
+        if not self._cancelled.is_set():
+            self.reason = reason
+            self._cancelled.set()
+
+    def check(self):
+        """Raise DeadlineExceeded if the deadline passed or was cancelled."""
+        if self._cancelled.is_set():
+            raise DeadlineExceeded(f"Tool call cancelled ({self.reason})")
+        if time.monotonic() >= self.expires_at:
+            raise DeadlineExceeded(f"Tool call exceeded its {self.timeout:g}s deadline")
+
+
+def current_deadline():
+    """Get the deadline the caller is working under, or None."""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline):
+    """Make ``deadline`` current for the ``with`` block."""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def check_deadline():
+    """Raise DeadlineExceeded if the current deadline passed or was cancelled."""
+    deadline = _current_deadline.get()
+    if deadline is not None:
+        deadline.check()
+
+
+def request_timeout(default):
+    """
+    Get the timeout for a blocking call made under the current deadline.
+
+    Args:
+        default: Timeout in seconds used without a deadline, and the upper bound
+
+    Returns:
+        float: Seconds the call may take
+
+    Raises:
+        DeadlineExceeded: If no time is left
+    """
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return default
+    deadline.check()
+    return min(default, deadline.remaining())
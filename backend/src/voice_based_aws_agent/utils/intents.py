@@ -0,0 +1,302 @@
+"""
+Rule-based intent fast path for the PhotoMemoryAgent.
+
+"What tags do I have", "show me beach photos from 2019" and "remember that
+..." used to take a full model turn before any MCP tool ran. ``IntentParser``
+recognizes these requests with anchored rules and extracts their slots
+(tags, year and month for slideshows, the memory text). ``IntentFastPath``
+then calls the agent's tool method directly. The rules only accept a whole
+utterance they fully understand: anything vague ("photos from last summer"),
+any question about an old memory and any other phrasing goes to the model.
+
+The time saved is estimated against a moving average of the model calls
+the fast path passed through, and reported per intent.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+
+from src.voice_based_aws_agent.utils.metrics import FAST_PATH_QUERIES, FAST_PATH_SAVED_SECONDS
+from src.voice_based_aws_agent.utils.query_text import normalize_query
+
+logger = logging.getLogger("IntentFastPath")
+
+INTENTS = ("get_tags", "start_slideshow", "remember")
+
+MONTHS = (
+    "january", "february", "march", "april", "may", "june",
+    "july", "august", "september", "october", "november", "december",
+)
+
+_POLITE = r"(?:(?:can|could|would|will) you |i (?:want|would like|d like) to (?:see )?)?"
+_ARTICLE = r"(?: (?:my|the|our|some|all|all of|all the|all my|a))?"
+_MEDIA = r"(?:photos|pictures|pics|images|photographs)"
+_MONTH = "|".join(MONTHS)
+_TIME = (
+    rf"(?: (?:from|in|during|taken in) (?:(?P<month>{_MONTH})(?: of)? )?(?P<year>(?:19|20)\d\d)"
+    rf"| (?:from|in|during) (?P<month_only>{_MONTH}))?"
+)
+_TAG_WORDS = r"(?P<tags>(?: [a-z]+)*?)"
+
+_GET_TAGS = re.compile(
+    rf"{_POLITE}(?:"
+    r"(?:what|which)(?: s| are| is)?(?: all)?(?: of)?(?: my| the)?(?: photo| picture)? tags"
+    r"(?: do i have| have i got| are there| exist| can i use| are available)?"
+    r"|(?:list|show me|show|tell me|get|give me|read)(?: me)?(?: all)?(?: of)?(?: my| the)?(?: photo| picture)? tags"
+    r")"
+)
+_SHOW = rf"{_POLITE}(?:show me|show|play|start|display|put on|open)(?: up)?"
+_SLIDESHOW_PATTERNS = (
+    # "start a slideshow of the kids"
+    re.compile(rf"{_SHOW}(?: a| the| my)? slide ?show(?: of| with| for)?{_ARTICLE}{_TAG_WORDS}(?: {_MEDIA})?{_TIME}"),
+    # "show me beach photos from 2019", "show me photos of the beach"
+    re.compile(
+        rf"{_SHOW}{_ARTICLE}{_TAG_WORDS} {_MEDIA}"
+        rf"(?: (?:of|with|at)(?: my| the| our)?(?P<tags_after>(?: [a-z]+){{1,3}}?))?{_TIME}"
+    ),
+)
+_REMEMBER = re.compile(
+    r"^\s*(?:(?:please|hey|ok|okay)[,\s]+)*(?:(?:can|could|would) you\s+)?(?:please\s+)?"
+    r"(?:remember|note|make a note|save a memory|record a memory)\s+(?:that|this)[\s:,]+"
+    r"(?P<text>.+?)[\s.!]*$",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Words that make a slideshow request relative or vague, left to the model
+_VAGUE_WORDS = frozenset({
+    "last", "this", "next", "ago", "yesterday", "today", "tonight", "recent", "recently", "latest",
+    "new", "newest", "old", "oldest", "week", "month", "year", "best", "favorite", "favourite",
+    "random", "same", "other", "more", "that", "those", "these", "it", "them",
+})
+_TAG_STOP_WORDS = frozenset({"and", "or", "the", "my", "our", "of", "with", "a", "an", "some", "all"})
+# Words that can't be tags. A slideshow request whose tag slot holds one of
+# these ("show me how many photos", "show me photos of me") was misread
+_NON_TAG_WORDS = frozenset({
+    # Pronouns
+    "i", "me", "myself", "you", "your", "yours", "he", "him", "his", "she", "her", "hers",
+    "we", "us", "ours", "they", "their", "theirs", "its", "mine",
+    # Determiners and quantifiers
+    "any", "each", "every", "few", "many", "much", "most", "several", "no", "none",
+    "both", "either", "neither", "only", "just", "also", "even", "very", "really", "such",
+    # Question words
+    "how", "what", "which", "who", "whom", "whose", "when", "where", "why",
+    # Verbs and other function words
+    "is", "are", "was", "were", "be", "do", "does", "did", "have", "has", "had", "can",
+    "not", "to", "for", "from", "in", "on", "at", "by", "about", "than", "there", "here",
+})
+# "Remember that time we..." asks about an old memory rather than storing one
+_RECALL_START = re.compile(r"(?:time|times|day|night|trip|when|what|where|who|how)\b", re.IGNORECASE)
+
+
+class Intent:
+    """A recognized request and its slots."""
+
+    def __init__(self, name, slots=None):
+        self.name = name
+        self.slots = slots or {}
+
+    def __repr__(self):
+        return f"Intent({self.name!r}, {self.slots!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, Intent) and (self.name, self.slots) == (other.name, other.slots)
+
+
+class IntentParser:
+    """Recognizes simple photo and memory requests the agent can answer without the model."""
+
+    def __init__(self, intents=INTENTS, max_slideshow_tags=3, min_memory_words=3):
+        """
+        Initialize the parser.
+
+        Args:
+            intents: Intents to recognize, any of INTENTS
+            max_slideshow_tags: Slideshows asking for more tags are left to the model
+            min_memory_words: Shorter memories are left to the model
+        """
+        unknown = set(intents) - set(INTENTS)
+        if unknown:
+            raise ValueError(f"Unknown intents: {sorted(unknown)}")
+        self.intents = tuple(intents)
+        self.max_slideshow_tags = max_slideshow_tags
+        self.min_memory_words = min_memory_words
+
+    def parse(self, query):
+        """
+        Recognize a query.
+
+        Args:
+            query: User query
+
+        Returns:
+            Intent, or None if the query should go to the model
+        """
+        if "remember" in self.intents:
+            intent = self._parse_remember(query)
+            if intent is not None:
+                return intent
+
+        normalized = normalize_query(query)
+        if "get_tags" in self.intents and _GET_TAGS.fullmatch(normalized):
+            return Intent("get_tags")
+        if "start_slideshow" in self.intents:
+            return self._parse_slideshow(normalized)
+        return None
+
+    def _parse_remember(self, query):
+        found = _REMEMBER.match(query)
+        if found is None:
+            return None
+        text = found.group("text").strip()
+        if text.endswith("?") or _RECALL_START.match(text) or len(text.split()) < self.min_memory_words:
+            # "Remember that trip to Paris?" asks about a memory rather than storing one
+            return None
+        return Intent("remember", {"text": text})
+
+    def _parse_slideshow(self, normalized):
+        for pattern in _SLIDESHOW_PATTERNS:
+            found = pattern.fullmatch(normalized)
+            if found is not None:
+                break
+        else:
+            return None
+
+        slots = found.groupdict()
+        words = f"{slots['tags'] or ''} {slots.get('tags_after') or ''}".split()
+        if any(word in _VAGUE_WORDS or word in _NON_TAG_WORDS or word in MONTHS for word in words):
+            return None
+        tags = [word for word in words if word not in _TAG_STOP_WORDS]
+        if len(tags) > self.max_slideshow_tags:
+            return None
+
+        query = {}
+        if tags:
+            query["tags"] = tags
+        if slots["year"]:
+            query["year"] = int(slots["year"])
+        month = slots["month"] or slots["month_only"]
+        if month:
+            query["month"] = month.capitalize()
+        return Intent("start_slideshow", query)
+
+
+class IntentFastPath:
+    """Answers recognized intents directly and measures the model time saved."""
+
+    def __init__(self, parser=None, enabled=True, smoothing=0.2):
+        """
+        Initialize the fast path.
+
+        Args:
+            parser: IntentParser, defaults to one recognizing every intent
+            enabled: If False every query goes to the model
+            smoothing: Weight of the newest model call in the moving average
+        """
+        self.parser = parser or IntentParser()
+        self.enabled = enabled
+        self.smoothing = smoothing
+        self.model_seconds = None  # Moving average of model call latency
+        self._lock = threading.Lock()
+
+        # Statistics
+        self.queries = Counter()  # intent or "none" -> count
+        self.saved_seconds = Counter()  # intent -> estimated seconds saved
+        self.fast_seconds = Counter()  # intent -> seconds spent answering directly
+
+    @classmethod
+    def from_config(cls, fast_path_config):
+        """Create a fast path from an IntentFastPathConfig."""
+        parser = IntentParser(
+            intents=fast_path_config.intents,
+            max_slideshow_tags=fast_path_config.max_slideshow_tags,
+            min_memory_words=fast_path_config.min_memory_words,
+        )
+        return cls(parser=parser, enabled=fast_path_config.enabled)
+
+    def handle(self, query, answer, fallback):
+        """
+        Answer a query directly if its intent is recognized, or with the model.
+
+        Args:
+            query: User query
+            answer: Callable taking an Intent and returning the response
+            fallback: Callable taking the query and calling the model
+
+        Returns:
+            The response from ``answer`` or ``fallback``
+        """
+        intent = self.parser.parse(query) if self.enabled else None
+        start_time = time.perf_counter()
+        if intent is None:
+            try:
+                return fallback(query)
+            finally:
+                self._record_model(time.perf_counter() - start_time)
+
+        logger.info(f"Answering {intent} without the model")
+        response = answer(intent)
+        self._record_intent(intent.name, time.perf_counter() - start_time)
+        return response
+
+    def _record_model(self, seconds):
+        with self._lock:
+            self.queries["none"] += 1
+            if self.model_seconds is None:
+                self.model_seconds = seconds
+            else:
+                self.model_seconds += self.smoothing * (seconds - self.model_seconds)
+        FAST_PATH_QUERIES.inc(intent="none")
+
+    def _record_intent(self, intent, seconds):
+        with self._lock:
+            self.queries[intent] += 1
+            self.fast_seconds[intent] += seconds
+            saved = None
+            if self.model_seconds is not None:
+                saved = max(0.0, self.model_seconds - seconds)
+                self.saved_seconds[intent] += saved
+        FAST_PATH_QUERIES.inc(intent=intent)
+        if saved is not None:
+            FAST_PATH_SAVED_SECONDS.observe(saved, intent=intent)
+
+    def stats(self):
+        """
+        Get per-intent hit rates and time saved.
+
+        Returns:
+            Dictionary with the model call average and, per intent, the
+            share of queries answered directly and seconds saved
+        """
+        with self._lock:
+            total = sum(self.queries.values())
+            return {
+                "queries": total,
+                "model_calls": self.queries["none"],
+                "model_seconds_avg": round(self.model_seconds, 3) if self.model_seconds is not None else None,
+                "intents": {
+                    intent: {
+                        "hits": self.queries[intent],
+                        "hit_rate": round(self.queries[intent] / total, 3) if total else 0.0,
+                        "avg_seconds": round(self.fast_seconds[intent] / self.queries[intent], 3)
+                        if self.queries[intent] else None,
+                        "saved_seconds": round(self.saved_seconds[intent], 3),
+                    }
+                    for intent in self.parser.intents
+                },
+            }
+
+
+_shared_fast_path = None
+_shared_fast_path_lock = threading.Lock()
+
+
+def get_intent_fast_path(fast_path_config):
+    """Get the process-wide intent fast path, creating it on first use."""
+    global _shared_fast_path
+    with _shared_fast_path_lock:
+        if _shared_fast_path is None:
+            _shared_fast_path = IntentFastPath.from_config(fast_path_config)
+        return _shared_fast_path
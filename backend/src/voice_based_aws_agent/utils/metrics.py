@@ -0,0 +1,425 @@
+"""
+Process-wide metrics for the voice assistant.
+
+Counters, gauges and latency histograms are collected in memory and exported
+in the Prometheus text format by a small HTTP endpoint that runs next to the
+WebSocket server (see ``start_metrics_server``). Recording a value only takes
+a lock and a bucket lookup, so it is cheap enough for per-chunk hot paths.
+"""
+
+import asyncio
+import bisect
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("Metrics")
+
+# Latency buckets in seconds, from 1 ms up to the 30 s tool timeout
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_labels(labelnames, values, extra=None):
+    pairs = list(zip(labelnames, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base class for labelled metrics."""
+
+    type_name = ""
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(labels[name] for name in self.labelnames)
+
+    def header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    """A monotonically increasing count."""
+
+    type_name = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values = {}
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    """A value read from a callback when metrics are collected."""
+
+    type_name = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._functions = {}
+
+    def set_function(self, function, **labels):
+        """Read the gauge from ``function()`` at collection time."""
+        with self._lock:
+            self._functions[self._key(labels)] = function
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            items = sorted(self._functions.items())
+        for key, function in items:
+            try:
+                value = function()
+            except Exception as e:
+                logger.debug(f"Failed to read gauge {self.name}: {e}")
+                continue
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class CallbackCounter(Gauge):
+    """A monotonically increasing count read from a callback."""
+
+    type_name = "counter"
+
+
+class Histogram(_Metric):
+    """Cumulative bucketed observations, as used for latency percentiles."""
+
+    type_name = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a ``with`` block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self, **labels):
+        """
+        Get the observations for one label set.
+
+        Returns:
+            Dictionary with per-bucket counts (non-cumulative), sum and count
+        """
+        with self._lock:
+            series = self._series.get(self._key(labels))
+            if series is None:
+                return {"buckets": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            return {"buckets": list(series[0]), "sum": series[1], "count": series[2]}
+
+    def render(self):
+        lines = self.header()
+        with self._lock:
+            items = sorted((key, (list(s[0]), s[1], s[2])) for key, s in self._series.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, ("le", _format_value(float(bound))))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds metrics by name and renders them for scraping."""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, documentation, labelnames=(), **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.type_name}")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """Get or create a counter."""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=()):
+        """Get or create a callback gauge."""
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def callback_counter(self, name, documentation, labelnames=()):
+        """Get or create a counter read from a callback."""
+        return self._register(CallbackCounter, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        """Get or create a histogram."""
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self):
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Registry for this process
+registry = MetricsRegistry()
+
+# Voice pipeline metrics
+STREAM_INIT_SECONDS = registry.histogram(
+    "voice_stream_init_seconds",
+    "Time to get a ready Nova Sonic stream for a new session",
+    ["source"],
+)
+STREAM_INIT_FAILURES = registry.counter(
+    "voice_stream_init_failures_total",
+    "Nova Sonic streams that failed to initialize",
+)
+AUDIO_INPUT_DELAY_SECONDS = registry.histogram(
+    "voice_audio_input_delay_seconds",
+    "Delay between queueing an audio input chunk and sending it to Bedrock",
+)
+AUDIO_INPUT_CHUNKS = registry.counter(
+    "voice_audio_input_chunks_total",
+    "Audio input chunks sent to Bedrock",
+)
+TOOL_USE_SECONDS = registry.histogram(
+    "voice_tool_use_seconds",
+    "Time from a toolUse event to sending its tool result",
+    ["tool"],
+)
+SPECULATIVE_TOOL_USES = registry.counter(
+    "voice_speculative_tool_uses_total",
+    "Tool uses started on toolUse, by whether their result was committed or discarded",
+    ["outcome"],
+)
+SPECULATIVE_TOOL_SAVED_SECONDS = registry.histogram(
+    "voice_speculative_tool_saved_seconds",
+    "Tool execution time overlapped with the wait for the TOOL contentEnd",
+)
+TOOL_CALLS_ABANDONED = registry.counter(
+    "voice_tool_calls_abandoned_total",
+    "Tool calls cancelled before completing, by reason (timeout, interrupted, superseded or session_closed)",
+    ["reason"],
+)
+SUPERVISOR_SECONDS = registry.histogram(
+    "voice_supervisor_query_seconds",
+    "Supervisor agent query latency",
+    ["outcome"],
+)
+SUPERVISOR_CACHE_REQUESTS = registry.counter(
+    "voice_supervisor_cache_requests_total",
+    "supervisorAgent queries by cache result (hit, miss, coalesced or bypass)",
+    ["result"],
+)
+SUPERVISOR_CACHE_ENTRIES = registry.gauge(
+    "voice_supervisor_cache_entries",
+    "supervisorAgent results held in the cache",
+)
+SIMILARITY_CACHE_REQUESTS = registry.counter(
+    "voice_similarity_cache_requests_total",
+    "supervisorAgent queries by near-duplicate cache result (hit, miss or bypass)",
+    ["result"],
+)
+SIMILARITY_CACHE_ENTRIES = registry.gauge(
+    "voice_similarity_cache_entries",
+    "supervisorAgent queries held in the near-duplicate cache",
+)
+SIMILARITY_CACHE_SCORES = registry.histogram(
+    "voice_similarity_cache_best_score",
+    "Cosine similarity of the closest cached query, for tuning the threshold",
+    buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95, 0.99),
+)
+AGENT_CALLS_IN_FLIGHT = registry.gauge(
+    "voice_agent_calls_in_flight",
+    "Specialized agent calls running on the agent's thread pool",
+    ["agent"],
+)
+AGENT_CALLS_QUEUED = registry.gauge(
+    "voice_agent_calls_queued",
+    "Specialized agent calls waiting for a thread of the agent's pool",
+    ["agent"],
+)
+FAST_PATH_QUERIES = registry.counter(
+    "voice_fast_path_queries_total",
+    "PhotoMemoryAgent queries by the intent answered without the model, 'none' when the model handled them",
+    ["intent"],
+)
+FAST_PATH_SAVED_SECONDS = registry.histogram(
+    "voice_fast_path_saved_seconds",
+    "Estimated model time saved by answering an intent directly",
+    ["intent"],
+)
+MCP_CALL_SECONDS = registry.histogram(
+    "voice_mcp_call_seconds",
+    "MCP Gateway tool call latency",
+    ["tool", "outcome"],
+)
+SESSIONS_TOTAL = registry.counter(
+    "voice_sessions_total",
+    "Voice sessions started",
+)
+CONNECTIONS_TOTAL = registry.counter(
+    "voice_connections_total",
+    "WebSocket connections accepted",
+)
+ACTIVE_CONNECTIONS = registry.gauge(
+    "voice_active_connections",
+    "Open WebSocket connections",
+)
+ACTIVE_SESSIONS = registry.gauge(
+    "voice_active_sessions",
+    "Voice sessions with an active Bedrock stream",
+)
+QUEUE_DEPTH = registry.gauge(
+    "voice_queue_depth",
+    "Items queued across all active sessions",
+    ["queue"],
+)
+QUEUE_DEPTH_MAX = registry.gauge(
+    "voice_queue_depth_max",
+    "Deepest queue of any active session",
+    ["queue"],
+)
+TIME_TO_FIRST_AUDIO_SECONDS = registry.histogram(
+    "voice_turn_time_to_first_audio_seconds",
+    "Time from the end of the user's transcript to the turn's first audio output forwarded to the client",
+)
+
+
+
+def _resident_memory_bytes():
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _cpu_seconds():
+    times = os.times()
+    return times.user + times.system
+
+
+# Process metrics, used to work out memory per session and sessions per core
+registry.gauge(
+    "process_resident_memory_bytes",
+    "Resident memory size in bytes",
+).set_function(_resident_memory_bytes)
+registry.callback_counter(
+    "process_cpu_seconds_total",
+    "Total user and system CPU time spent in seconds",
+).set_function(_cpu_seconds)
+
+# HTTP routes served by the metrics endpoint: path -> (content type, render function)
+_routes = {"/metrics": (CONTENT_TYPE, registry.render)}
+
+
+def register_route(path, content_type, render):
+    """Serve ``render()`` (a str) at ``GET path`` on the metrics endpoint."""
+    _routes[path] = (content_type, render)
+
+
+async def _handle_metrics_request(reader, writer):
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), timeout=5.0)
+        # Skip the request headers
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout=5.0)
+            if not line or line in (b"\r\n", b"\n"):
+                break
+
+        parts = request_line.decode("latin-1").split()
+        path = parts[1].split("?", 1)[0] if len(parts) >= 2 else ""
+        route = _routes.get(path) if len(parts) >= 2 and parts[0] == "GET" else None
+        if route:
+            status, content_type, body = "200 OK", route[0], route[1]().encode("utf-8")
+        else:
+            status, content_type, body = "404 Not Found", "text/plain", b"Not found\n"
+
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body
+        )
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError) as e:
+        logger.debug(f"Metrics request failed: {e}")
+    finally:
+        writer.close()
+
+
+async def start_metrics_server(host, port):
+    """
+    Start the HTTP endpoint serving ``GET /metrics`` and any registered routes.
+
+    Args:
+        host: Host to bind to
+        port: Port to bind to
+
+    Returns:
+        asyncio.Server, close it to stop serving
+    """
+    server = await asyncio.start_server(_handle_metrics_request, host, port)
+    logger.info(f"Metrics endpoint at http://{host}:{port}/metrics")
+    return server
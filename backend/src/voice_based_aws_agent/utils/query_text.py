@@ -0,0 +1,18 @@
+"""
+Normalization of spoken user queries.
+
+Transcribed queries differ in case, punctuation and filler words ("um,
+what tags do I have?"). The result and similarity caches and the intent
+fast path compare queries in this normalized form.
+"""
+
+import re
+
+_FILLER_WORDS = frozenset({"please", "um", "uh", "er", "hey", "ok", "okay", "so", "well"})
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+
+
+def normalize_query(query):
+    """Lowercase, strip punctuation and filler words, and collapse whitespace."""
+    words = _NON_WORD.sub(" ", query.lower()).split()
+    return " ".join(word for word in words if word not in _FILLER_WORDS)
@@ -0,0 +1,208 @@
+"""
+Compiled routing table for the SupervisorAgent.
+
+``SupervisorAgent._determine_agent`` used to scan a keyword list with a
+substring test per keyword, so routing cost grew with every agent and word
+added. ``RoutingTable`` compiles the declarative ``Route`` table once, at
+startup, into dictionaries keyed by text found at the start of a word:
+
+- Keywords and phrases are keyed by their first word. The query is split
+  into words and each word is looked up once.
+- Patterns that start at a word (``\\b`` or ``^``) followed by literal text
+  are keyed by up to the first three characters of that text, and only the
+  patterns found under a word's key are tried at that word.
+
+Routing cost therefore depends on the length of the query, not on the size
+of the table. Patterns without a literal start can't be keyed; they are
+joined into one regular expression searched once per query, whose cost does
+grow with their number, so prefer keywords or patterns like ``\\bphotos? of``.
+
+The matched route with the highest priority wins; ties go to the route
+listed first. Queries that match nothing go to the default agent.
+"""
+
+import logging
+import re
+from collections import defaultdict
+
+logger = logging.getLogger("RoutingTable")
+
+_WORD = re.compile(r"[a-z0-9]+")
+_LEADING_ANCHORS = re.compile(r"(?:\\b|\^)+")
+_LITERAL = re.compile(r"[a-z0-9 ]*")
+_QUANTIFIERS = ("?", "*", "{")
+_PATTERN_KEY_LENGTH = 3
+
+
+def _words(text):
+    return tuple(_WORD.findall(text.lower()))
+
+
+def _has_top_level_alternation(pattern):
+    depth = 0
+    in_class = False
+    escaped = False
+    for char in pattern:
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif in_class:
+            in_class = char != "]"
+        elif char == "[":
+            in_class = True
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return True
+    return False
+
+
+def _word_prefix(pattern):
+    """
+    Get the literal text every match of ``pattern`` starts with, if matches
+    can only start at the beginning of a word.
+
+    Returns:
+        str: The literal text, or "" if the pattern can't be keyed
+    """
+    anchors = _LEADING_ANCHORS.match(pattern)
+    if anchors is None or _has_top_level_alternation(pattern):
+        return ""
+    body = pattern[anchors.end():]
+    prefix = _LITERAL.match(body).group()
+    if body[len(prefix):len(prefix) + 1] in _QUANTIFIERS:
+        # The quantifier makes the last character optional
+        prefix = prefix[:-1]
+    if not prefix[:1].isalnum():
+        return ""
+    return prefix
+
+
+class RoutingTable:
+    """Routes queries to agents using a table compiled for constant-cost lookups."""
+
+    def __init__(self, routes, default_agent):
+        """
+        Compile the routing table.
+
+        Args:
+            routes: Sequence of Route entries
+            default_agent: Agent for queries that match no route
+
+        Raises:
+            ValueError: If a keyword or phrase has no words
+            re.error: If a pattern is not a valid regular expression
+        """
+        self.routes = tuple(routes)
+        self.default_agent = default_agent
+
+        # First word -> [(remaining words, route index)], one entry per keyword or phrase
+        terms = defaultdict(list)
+        # Leading characters -> [(compiled pattern, route index)]
+        keyed_patterns = defaultdict(list)
+        unkeyed_patterns = []  # (route index, pattern)
+
+        for index, route in enumerate(self.routes):
+            for term in (*route.keywords, *route.phrases):
+                words = _words(term)
+                if not words:
+                    raise ValueError(f"Route for {route.agent} has a term without words: {term!r}")
+                terms[words[0]].append((words[1:], index))
+            for pattern in route.patterns:
+                prefix = _word_prefix(pattern)
+                if prefix:
+                    keyed_patterns[prefix[:_PATTERN_KEY_LENGTH]].append((re.compile(pattern), index))
+                else:
+                    unkeyed_patterns.append((index, pattern))
+
+        self._terms = dict(terms)
+        self._keyed_patterns = dict(keyed_patterns)
+        self._key_lengths = sorted({len(key) for key in self._keyed_patterns})
+
+        # Highest priority first, so it wins when several patterns match at one position
+        unkeyed_patterns.sort(key=lambda entry: (-self.routes[entry[0]].priority, entry[0]))
+        self._unkeyed_pattern = None
+        if unkeyed_patterns:
+            self._unkeyed_pattern = re.compile("|".join(
+                f"(?P<r{index}_{position}>{pattern})" for position, (index, pattern) in enumerate(unkeyed_patterns)
+            ))
+
+        logger.info(
+            f"Compiled {len(self.routes)} routes for {len(self.agents)} agents: "
+            f"{sum(map(len, self._terms.values()))} terms, "
+            f"{sum(map(len, self._keyed_patterns.values()))} keyed and {len(unkeyed_patterns)} unkeyed patterns"
+        )
+        if unkeyed_patterns:
+            logger.debug(f"Unkeyed routing patterns: {[pattern for _, pattern in unkeyed_patterns]}")
+
+    @property
+    def agents(self):
+        """Names of the agents the table routes to, including the default."""
+        return {route.agent for route in self.routes} | {self.default_agent}
+
+    def match(self, query):
+        """
+        Find the route for a query.
+
+        Args:
+            query: User query
+
+        Returns:
+            Tuple of the winning Route and the term or pattern text that matched,
+            or None if no route matches
+        """
+        words = _words(query)
+        text = " ".join(words)
+        best = None  # (route index, matched text)
+
+        terms = self._terms
+        keyed_patterns = self._keyed_patterns
+        start = 0
+        for position, word in enumerate(words):
+            candidates = terms.get(word)
+            if candidates is not None:
+                for rest, index in candidates:
+                    if rest and words[position + 1:position + 1 + len(rest)] != rest:
+                        continue
+                    if best is None or self._outranks(index, best[0]):
+                        best = (index, " ".join((word, *rest)))
+
+            if keyed_patterns:
+                for length in self._key_lengths:
+                    for pattern, index in keyed_patterns.get(text[start:start + length], ()):
+                        found = pattern.match(text, start)
+                        if found and (best is None or self._outranks(index, best[0])):
+                            best = (index, found.group())
+            start += len(word) + 1
+
+        if self._unkeyed_pattern is not None:
+            for found in self._unkeyed_pattern.finditer(text):
+                index = int(found.lastgroup[1:].split("_")[0])
+                if best is None or self._outranks(index, best[0]):
+                    best = (index, found.group())
+
+        if best is None:
+            return None
+        return self.routes[best[0]], best[1]
+
+    def _outranks(self, index, other):
+        priority, other_priority = self.routes[index].priority, self.routes[other].priority
+        return priority > other_priority or (priority == other_priority and index < other)
+
+    def route(self, query):
+        """
+        Get the name of the agent that should handle a query.
+
+        Args:
+            query: User query
+
+        Returns:
+            Agent name, the default agent if no route matches
+        """
+        matched = self.match(query)
+        if matched is None:
+            return self.default_agent
+        return matched[0].agent
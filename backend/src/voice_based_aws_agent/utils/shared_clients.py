@@ -0,0 +1,135 @@
+"""
+Process-wide registry of shared model clients and connection pools.
+
+Every voice session builds its own agents, but the heavyweight pieces behind
+them are stateless and thread-safe: a BedrockModel only holds a boto3
+client, and HTTP connections to the MCP Gateway can be pooled. This module
+creates those once per process and hands the same instances to every
+session, so only per-session conversation state is built per connection.
+"""
+
+import logging
+import threading
+import time
+
+from src.voice_based_aws_agent.config.config import AgentConfig, create_bedrock_model
+from src.voice_based_aws_agent.utils.deadlines import request_timeout
+
+logger = logging.getLogger("SharedClients")
+
+# Connection pool size for MCP Gateway and Cognito requests
+HTTP_POOL_SIZE = 32
+# Refresh OAuth tokens this many seconds before they expire
+TOKEN_EXPIRY_MARGIN = 60
+# Upper bound for MCP Gateway and Cognito requests, shortened by the tool call deadline
+HTTP_TIMEOUT = 10.0
+
+_lock = threading.Lock()
+_bedrock_models = {}
+_http_session = None
+_tokens = {}
+
+_stats = {
+    "bedrock_models_created": 0,
+    "bedrock_model_reuses": 0,
+    "tokens_fetched": 0,
+    "token_reuses": 0,
+}
+
+
+def get_bedrock_model(config=None):
+    """
+    Get the shared BedrockModel for a configuration.
+
+    Models are keyed on model id, region and profile, so sessions with the
+    same settings share one boto3 session and Bedrock client.
+
+    Args:
+        config: AgentConfig instance, uses defaults if None
+
+    Returns:
+        BedrockModel shared by all agents with the same settings
+    """
+    if config is None:
+        config = AgentConfig()
+    key = (config.model_id, config.region, config.profile_name)
+
+    with _lock:
+        model = _bedrock_models.get(key)
+        if model is None:
+            logger.info(f"Creating shared BedrockModel for {key}")
+            model = create_bedrock_model(config)
+            _bedrock_models[key] = model
+            _stats["bedrock_models_created"] += 1
+        else:
+            _stats["bedrock_model_reuses"] += 1
+        return model
+
+
+def get_http_session():
+    """
+    Get the shared requests session with a pooled HTTP adapter.
+
+    Returns:
+        requests.Session reused for all MCP Gateway and Cognito calls
+    """
+    global _http_session
+    with _lock:
+        if _http_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+        return _http_session
+
+
+def get_oauth_token(token_url, client_id, client_secret):
+    """
+    Get a client-credentials OAuth token, reusing it until shortly before expiry.
+
+    Args:
+        token_url: Cognito token endpoint
+        client_id: OAuth client id
+        client_secret: OAuth client secret
+
+    Returns:
+        str: Access token
+    """
+    key = (token_url, client_id)
+    now = time.monotonic()
+    with _lock:
+        cached = _tokens.get(key)
+        if cached and cached[1] > now:
+            _stats["token_reuses"] += 1
+            return cached[0]
+
+    resp = get_http_session().post(
+        token_url,
+        data={'grant_type': 'client_credentials', 'client_id': client_id},
+        auth=(client_id, client_secret),
+        timeout=request_timeout(HTTP_TIMEOUT)
+    )
+    resp.raise_for_status()
+    body = resp.json()
+    token = body.get('access_token')
+    expires_in = body.get('expires_in', 3600)
+
+    with _lock:
+        _tokens[key] = (token, now + max(0, expires_in - TOKEN_EXPIRY_MARGIN))
+        _stats["tokens_fetched"] += 1
+    return token
+
+
+def get_shared_client_stats():
+    """
+    Get registry statistics.
+
+    Returns:
+        Dictionary with creation and reuse counts
+    """
+    with _lock:
+        return dict(_stats, bedrock_models=len(_bedrock_models))
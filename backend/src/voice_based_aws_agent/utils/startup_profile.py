@@ -0,0 +1,114 @@
+"""
+Start-up profiling for the voice assistant.
+
+Records how long each import and initialization phase takes between process
+start and the server accepting connections, and prints a breakdown when
+``--startup-profile`` is passed to ``main.py``.
+"""
+
+import importlib
+import logging
+import sys
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger("StartupProfile")
+
+# Heavy modules that are imported on first use rather than at start-up.
+# Warming them in the background keeps them off the first voice turn.
+DEFERRED_IMPORTS = (
+    "boto3",
+    "requests",
+    "aws_sdk_bedrock_runtime.client",
+    "smithy_aws_core.identity.environment",
+    "strands",
+    "strands.models",
+    "src.voice_based_aws_agent.agents.orchestrator",
+)
+
+
+class StartupProfiler:
+    """Collects named import and init phases relative to process start."""
+
+    def __init__(self):
+        self.enabled = False
+        self.started_at = time.perf_counter()
+        self.imports = []
+        self.phases = []
+        self.ready_at = None
+
+    @contextmanager
+    def imports_of(self, name):
+        """Time an import block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.imports.append((name, time.perf_counter() - start))
+
+    @contextmanager
+    def phase(self, name):
+        """Time an initialization phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def record(self, name, seconds):
+        """Record an initialization phase timed by the caller."""
+        self.phases.append((name, seconds))
+
+    def mark_ready(self):
+        """Record that the server is accepting connections and print the report."""
+        if self.ready_at is None:
+            self.ready_at = time.perf_counter()
+            if self.enabled:
+                print(self.report(), file=sys.stderr, flush=True)
+
+    def report(self):
+        """Format the import and init breakdown as a table."""
+        lines = ["", "Start-up profile", "-" * 60]
+        for title, entries in (("Imports", self.imports), ("Initialization", self.phases)):
+            lines.append(f"{title}:")
+            for name, seconds in entries:
+                lines.append(f"  {name:<46} {seconds * 1000:9.1f} ms")
+        if self.ready_at is not None:
+            lines.append("-" * 60)
+            lines.append(f"  {'Process start to accepting connections':<46} "
+                         f"{(self.ready_at - self.started_at) * 1000:9.1f} ms")
+        return "\n".join(lines)
+
+
+def warm_deferred_imports(profiler=None):
+    """
+    Import the deferred modules.
+
+    Intended to run in a worker thread once the server is accepting
+    connections, so the first session doesn't pay for them.
+
+    Args:
+        profiler: Optional StartupProfiler to record per-module timings in
+    """
+    timings = []
+    for module_name in DEFERRED_IMPORTS:
+        if module_name in sys.modules:
+            continue
+        start = time.perf_counter()
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            logger.warning(f"Failed to pre-import {module_name}: {e}")
+            continue
+        timings.append((module_name, time.perf_counter() - start))
+
+    if profiler is not None and profiler.enabled and timings:
+        lines = ["", "Deferred imports (background)", "-" * 60]
+        for name, seconds in timings:
+            lines.append(f"  {name:<46} {seconds * 1000:9.1f} ms")
+        print("\n".join(lines), file=sys.stderr, flush=True)
+    return timings
+
+
+# Profiler for this process, started when the module is first imported
+startup_profiler = StartupProfiler()
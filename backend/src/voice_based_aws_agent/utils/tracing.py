@@ -0,0 +1,229 @@
+"""
+Per-turn latency tracing for voice sessions.
+
+Each voice turn gets a ``TurnTrace`` that links the timestamps of the turn's
+first audio input, Nova Sonic's ``toolUse``, tool processing, the
+orchestrator query, every MCP call and the first audio output forwarded to
+the client. Finished turns are exported as one JSON object per line, either
+to a rotating file or to an in-process ring buffer served at ``/traces`` on
+the metrics endpoint.
+
+Code that runs on behalf of a turn (the orchestrator, agents, MCP calls)
+finds it through a context variable, so it only needs ``span("name")``.
+"""
+
+import contextvars
+import json
+import logging
+import logging.handlers
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+from .metrics import TIME_TO_FIRST_AUDIO_SECONDS, register_route
+
+logger = logging.getLogger("Tracing")
+
+# Turn that the current task or thread is working on
+_current_turn = contextvars.ContextVar("voice_turn", default=None)
+
+# Assistant audio contentEnd stop reasons that finish a turn
+TURN_END_REASONS = {"END_TURN", "INTERRUPTED"}
+
+
+class TurnTrace:
+    """Spans and marks for one voice turn."""
+
+    def __init__(self, tracer, session_id, turn_index, sampled):
+        self.tracer = tracer
+        self.session_id = session_id
+        self.turn_index = turn_index
+        self.sampled = sampled
+        self.trace_id = uuid.uuid4().hex
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self.marks = {}
+        self.spans = []
+        self.finished = False
+
+    def _offset_ms(self, at=None):
+        return round(((time.perf_counter() if at is None else at) - self._origin) * 1000, 2)
+
+    def mark(self, name):
+        """Record the first time ``name`` happened in this turn."""
+        if name not in self.marks:
+            self.marks[name] = self._offset_ms()
+
+    @contextmanager
+    def span(self, name, **attributes):
+        """Record the duration of a ``with`` block as a span of this turn."""
+        if not self.sampled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            attributes["error"] = type(e).__name__
+            raise
+        finally:
+            self.spans.append({
+                "name": name,
+                "start_ms": self._offset_ms(start),
+                "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                "thread": threading.current_thread().name,
+                **attributes,
+            })
+
+    def time_to_first_audio(self):
+        """
+        Milliseconds from the end of the user's transcript to the first audio
+        output, or None.
+
+        The turn itself starts at its first audio input, but the browser
+        streams the microphone continuously, so that includes the user's
+        silence and speaking time. The transcript ends when Nova Sonic
+        detects the end of speech.
+        """
+        if "user_transcript_end" in self.marks and "first_audio_output" in self.marks:
+            return round(self.marks["first_audio_output"] - self.marks["user_transcript_end"], 2)
+        return None
+
+    def finish(self, reason):
+        """Finish the turn and export it if sampled."""
+        if self.finished:
+            return
+        self.finished = True
+        ttfa = self.time_to_first_audio()
+        if ttfa is not None:
+            TIME_TO_FIRST_AUDIO_SECONDS.observe(ttfa / 1000)
+        if self.sampled:
+            self.tracer.export(self.to_dict(reason))
+
+    def to_dict(self, reason=None):
+        """Get the turn as a JSON-serializable dictionary."""
+        return {
+            "trace_id": self.trace_id,
+            "session_id": self.session_id,
+            "turn": self.turn_index,
+            "start_time": round(self.started_at, 3),
+            "duration_ms": self._offset_ms(),
+            "end_reason": reason,
+            "time_to_first_audio_ms": self.time_to_first_audio(),
+            "marks": dict(self.marks),
+            "spans": list(self.spans),
+        }
+
+
+class Tracer:
+    """Samples turns and exports finished ones."""
+
+    def __init__(self, sample_rate=1.0, ring_size=200, file_path=None, max_bytes=10_000_000, backup_count=5):
+        """
+        Initialize the tracer.
+
+        Args:
+            sample_rate: Fraction of turns to export, between 0 and 1
+            ring_size: Number of recent turns kept in memory
+            file_path: Optional JSONL file to append turns to
+            max_bytes: Size at which the JSONL file is rotated
+            backup_count: Number of rotated files kept
+        """
+        self.sample_rate = sample_rate
+        self.recent = deque(maxlen=ring_size)
+        self.exported = 0
+        self._file_logger = None
+
+        if file_path:
+            Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(
+                file_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._file_logger = logging.getLogger(f"TurnTraces.{file_path}")
+            self._file_logger.propagate = False
+            self._file_logger.setLevel(logging.INFO)
+            self._file_logger.addHandler(handler)
+
+    @classmethod
+    def from_config(cls, tracing_config):
+        """Create a tracer from a TracingConfig."""
+        return cls(
+            sample_rate=tracing_config.sample_rate,
+            ring_size=tracing_config.ring_size,
+            file_path=tracing_config.file_path,
+            max_bytes=tracing_config.max_bytes,
+            backup_count=tracing_config.backup_count,
+        )
+
+    def start_turn(self, session_id, turn_index):
+        """Start tracing a turn, deciding whether it is sampled."""
+        sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        return TurnTrace(self, session_id, turn_index, sampled)
+
+    def export(self, record):
+        """Export a finished turn."""
+        self.exported += 1
+        self.recent.append(record)
+        if self._file_logger:
+            self._file_logger.info(json.dumps(record, separators=(",", ":")))
+
+    def render_recent(self):
+        """Render the ring buffer as JSONL, oldest turn first."""
+        return "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in list(self.recent))
+
+
+_tracer = None
+
+
+def configure_tracing(tracing_config):
+    """
+    Set up the process-wide tracer from a TracingConfig.
+
+    Returns:
+        Tracer, or None if tracing is disabled
+    """
+    global _tracer
+    if not tracing_config.enabled or tracing_config.sample_rate <= 0:
+        _tracer = None
+        return None
+    _tracer = Tracer.from_config(tracing_config)
+    register_route("/traces", "application/x-ndjson", _tracer.render_recent)
+    logger.info(f"Turn tracing enabled (sample rate {tracing_config.sample_rate}"
+                f"{', file ' + tracing_config.file_path if tracing_config.file_path else ''})")
+    return _tracer
+
+
+def get_tracer():
+    """Get the process-wide tracer, or None if tracing is disabled."""
+    return _tracer
+
+
+def current_turn():
+    """Get the turn the caller is working on, or None."""
+    return _current_turn.get()
+
+
+def set_current_turn(turn):
+    """Make ``turn`` current for this context. Returns a token for ``reset_current_turn``."""
+    return _current_turn.set(turn)
+
+
+def reset_current_turn(token):
+    """Restore the turn that was current before ``set_current_turn``."""
+    _current_turn.reset(token)
+
+
+@contextmanager
+def span(name, **attributes):
+    """Record a span on the current turn, if there is one."""
+    turn = _current_turn.get()
+    if turn is None:
+        yield
+        return
+    with turn.span(name, **attributes):
+        yield
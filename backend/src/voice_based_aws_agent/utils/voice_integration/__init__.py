@@ -1,15 +1,26 @@
 """
 Voice integration package for Amazon Nova Sonic.
+
+Exports are loaded on first access so importing a submodule (for example
+the server) doesn't pull in every other one.
 """
 
-from .s2s_events import S2sEvent
-from .s2s_session_manager import S2sSessionManager
-from .supervisor_agent_integration import SupervisorAgentIntegration
-from .server import run_server
-
-__all__ = [
-    'S2sEvent',
-    'S2sSessionManager',
-    'SupervisorAgentIntegration',
-    'run_server'
-]
+import importlib
+
+_EXPORTS = {
+    'S2sEvent': '.s2s_events',
+    'S2sSessionManager': '.s2s_session_manager',
+    'BedrockStreamPool': '.stream_pool',
+    'SupervisorAgentIntegration': '.supervisor_agent_integration',
+    'run_server': '.server',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
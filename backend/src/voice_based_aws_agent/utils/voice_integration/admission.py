@@ -0,0 +1,168 @@
+"""
+Admission control for Bedrock voice sessions.
+
+Caps the number of concurrent S2S sessions (and therefore Bedrock
+bidirectional streams) globally and per client IP. Connections over the
+global cap wait in a bounded FIFO queue with a timeout; everything else is
+rejected with a ``sessionRejected`` event the frontend can show.
+"""
+
+import asyncio
+import logging
+from collections import Counter, deque
+
+logger = logging.getLogger("AdmissionController")
+
+REJECT_CLIENT_LIMIT = "client_limit"
+REJECT_QUEUE_FULL = "queue_full"
+REJECT_TIMEOUT = "queue_timeout"
+
+REJECTION_MESSAGES = {
+    REJECT_CLIENT_LIMIT: "Too many active voice sessions from your address. Please close another session and try again.",
+    REJECT_QUEUE_FULL: "The voice assistant is at capacity right now. Please try again in a moment.",
+    REJECT_TIMEOUT: "The voice assistant is busy and no session became available in time. Please try again.",
+}
+
+
+class AdmissionRejected(Exception):
+    """Raised when a session cannot be admitted."""
+
+    def __init__(self, reason):
+        super().__init__(REJECTION_MESSAGES.get(reason, reason))
+        self.reason = reason
+
+
+def rejection_event(reason):
+    """Create the event sent to the frontend when a session is rejected."""
+    return {
+        "event": {
+            "sessionRejected": {
+                "reason": reason,
+                "message": REJECTION_MESSAGES.get(reason, "Session rejected."),
+            }
+        }
+    }
+
+
+class AdmissionController:
+    """Global and per-client concurrency limits with a bounded wait queue."""
+
+    def __init__(self, max_sessions=50, max_sessions_per_client=4, max_queue=20, queue_timeout=10.0):
+        """
+        Initialize the controller.
+
+        Args:
+            max_sessions: Maximum concurrent sessions, 0 for unlimited
+            max_sessions_per_client: Maximum active plus waiting sessions per
+                client, 0 for unlimited
+            max_queue: Maximum connections waiting for a free slot
+            queue_timeout: Seconds a connection may wait for a slot
+        """
+        self.max_sessions = max_sessions
+        self.max_sessions_per_client = max_sessions_per_client
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self.active = 0
+        self._per_client = Counter()
+        self._waiters = deque()
+
+        # Statistics
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = Counter()
+
+    @classmethod
+    def from_config(cls, admission_config):
+        """Create a controller from an AdmissionConfig."""
+        return cls(
+            max_sessions=admission_config.max_sessions,
+            max_sessions_per_client=admission_config.max_sessions_per_client,
+            max_queue=admission_config.max_queue,
+            queue_timeout=admission_config.queue_timeout,
+        )
+
+    async def acquire(self, client_id):
+        """
+        Wait for a session slot.
+
+        Args:
+            client_id: Client identifier (IP address) for per-client limits
+
+        Raises:
+            AdmissionRejected: If the session cannot be admitted
+        """
+        if self.max_sessions_per_client and self._per_client[client_id] >= self.max_sessions_per_client:
+            self._reject(client_id, REJECT_CLIENT_LIMIT, counted=False)
+
+        self._per_client[client_id] += 1
+
+        if not self.max_sessions or (self.active < self.max_sessions and not self._waiters):
+            self.active += 1
+            self.admitted += 1
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            self._reject(client_id, REJECT_QUEUE_FULL)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        try:
+            await asyncio.wait_for(waiter, timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._reject(client_id, REJECT_TIMEOUT)
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just before cancellation, pass it on
+                self.release(client_id)
+            else:
+                self._per_client[client_id] -= 1
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+        # The releasing session handed its slot over to us
+        self.admitted += 1
+
+    def release(self, client_id):
+        """Release a slot taken with ``acquire``."""
+        self._per_client[client_id] -= 1
+        if self._per_client[client_id] <= 0:
+            del self._per_client[client_id]
+
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Hand the slot directly to the next waiter
+                waiter.set_result(True)
+                return
+        self.active -= 1
+
+    def stats(self):
+        """
+        Get admission statistics.
+
+        Returns:
+            Dictionary with occupancy, queue depth and rejection counts
+        """
+        return {
+            "active_sessions": self.active,
+            "max_sessions": self.max_sessions,
+            "queue_depth": len(self._waiters),
+            "max_queue": self.max_queue,
+            "clients": len(self._per_client),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": dict(self.rejected),
+        }
+
+    def _reject(self, client_id, reason, counted=True):
+        if counted:
+            self._per_client[client_id] -= 1
+            if self._per_client[client_id] <= 0:
+                del self._per_client[client_id]
+        self.rejected[reason] += 1
+        logger.warning(f"Rejected session for {client_id}: {reason} ({self.stats()})")
+        raise AdmissionRejected(reason)
@@ -0,0 +1,81 @@
+"""
+Binary WebSocket framing for raw PCM audio input.
+
+Clients that negotiate the ``BINARY_AUDIO_SUBPROTOCOL`` WebSocket subprotocol
+may send audio as binary frames instead of JSON ``audioInput`` events. Control
+events keep using JSON text frames.
+
+Frame layout (network byte order):
+
+    +------+-------------+--------------+-------------+--------------+-----+
+    | type | prompt len  | content len  | prompt name | content name | PCM |
+    | 1 B  | 1 B         | 1 B          | N bytes     | M bytes      | ... |
+    +------+-------------+--------------+-------------+--------------+-----+
+
+The prompt and content names are UTF-8 encoded and the payload is raw 16-bit
+little-endian PCM as produced by the frontend. It is base64-encoded once,
+after coalescing, on its way into ``S2sEvent.audio_input``.
+"""
+
+import struct
+
+# WebSocket subprotocol used to negotiate binary audio framing
+BINARY_AUDIO_SUBPROTOCOL = "nova-s2s.binary-audio.v1"
+
+# Frame type for raw PCM audio input
+FRAME_TYPE_AUDIO_INPUT = 0x01
+
+_HEADER = struct.Struct("!BBB")
+
+
+class AudioFrameError(ValueError):
+    """Raised when a binary audio frame cannot be decoded."""
+
+
+def encode_audio_frame(prompt_name, content_name, pcm_bytes):
+    """
+    Build a binary audio frame.
+
+    Args:
+        prompt_name: Prompt name the audio belongs to
+        content_name: Audio content name
+        pcm_bytes: Raw PCM audio
+
+    Returns:
+        bytes: The encoded frame
+    """
+    prompt = prompt_name.encode("utf-8")
+    content = content_name.encode("utf-8")
+    if len(prompt) > 255 or len(content) > 255:
+        raise AudioFrameError("Prompt and content names must be at most 255 bytes")
+    return _HEADER.pack(FRAME_TYPE_AUDIO_INPUT, len(prompt), len(content)) + prompt + content + bytes(pcm_bytes)
+
+
+def decode_audio_frame(frame):
+    """
+    Parse a binary audio frame.
+
+    Args:
+        frame: Frame bytes received from the WebSocket
+
+    Returns:
+        tuple: (prompt_name, content_name, pcm) where pcm is a memoryview
+            over the raw audio bytes
+    """
+    if len(frame) < _HEADER.size:
+        raise AudioFrameError("Frame shorter than header")
+
+    frame_type, prompt_len, content_len = _HEADER.unpack_from(frame)
+    if frame_type != FRAME_TYPE_AUDIO_INPUT:
+        raise AudioFrameError(f"Unknown frame type: {frame_type}")
+
+    prompt_end = _HEADER.size + prompt_len
+    content_end = prompt_end + content_len
+    if len(frame) < content_end:
+        raise AudioFrameError("Frame truncated inside header")
+
+    view = memoryview(frame)
+    prompt_name = bytes(view[_HEADER.size:prompt_end]).decode("utf-8")
+    content_name = bytes(view[prompt_end:content_end]).decode("utf-8")
+    return prompt_name, content_name, view[content_end:]
+
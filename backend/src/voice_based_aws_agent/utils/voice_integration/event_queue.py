@@ -0,0 +1,222 @@
+"""
+Bounded asyncio queue with backpressure and drop policies.
+
+Used for the per-session audio input and output queues so that a stalled
+Bedrock stream or a slow browser cannot grow memory without limit. The
+queue keeps its items in a deque and signals waiting producers and
+consumers with events, so evicting, requeueing and admitting control
+events over capacity don't depend on ``asyncio.Queue`` internals.
+"""
+
+import asyncio
+import logging
+from collections import deque
+
+logger = logging.getLogger("BoundedEventQueue")
+
+# Wait for space when the queue is full
+POLICY_BLOCK = "block"
+# Evict the oldest item to make room for the new one
+POLICY_DROP_OLDEST = "drop_oldest"
+# Evict (or refuse) audio items, never control events
+POLICY_DROP_AUDIO = "drop_audio"
+
+QUEUE_POLICIES = (POLICY_BLOCK, POLICY_DROP_OLDEST, POLICY_DROP_AUDIO)
+
+
+class BoundedEventQueue:
+    """
+    FIFO queue with a capacity policy and drop/high-water-mark counters.
+
+    ``get()``, ``get_nowait()``, ``put()`` and ``put_nowait()`` behave like
+    their ``asyncio.Queue`` counterparts. ``push()`` is the policy-aware way
+    to enqueue: with the ``block`` policy it waits for space, otherwise it
+    never blocks. ``offer()`` never blocks; under ``block`` it refuses the
+    item when the queue is full.
+    """
+
+    def __init__(self, maxsize=0, policy=POLICY_BLOCK, is_audio=None, name="queue"):
+        """
+        Initialize the queue.
+
+        Args:
+            maxsize: Capacity, 0 for unbounded
+            policy: One of QUEUE_POLICIES
+            is_audio: Callable classifying items as audio (droppable) data
+            name: Name used in logs and stats
+        """
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"Unknown queue policy '{policy}', expected one of {QUEUE_POLICIES}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.name = name
+        self._is_audio = is_audio or (lambda item: True)
+        self._items = deque()
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+
+        # Statistics
+        self.dropped = 0
+        self.dropped_audio = 0
+        self.blocked_puts = 0
+        self.high_water_mark = 0
+
+    def qsize(self):
+        return len(self._items)
+
+    def empty(self):
+        return not self._items
+
+    def full(self):
+        return 0 < self.maxsize <= len(self._items)
+
+    async def get(self):
+        """Remove and return the oldest item, waiting until one is available."""
+        # Items are only taken after the wait, so cancelling a waiting get loses nothing
+        while not self._items:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self.get_nowait()
+
+    def get_nowait(self):
+        """
+        Remove and return the oldest item.
+
+        Raises:
+            asyncio.QueueEmpty: If the queue is empty
+        """
+        if not self._items:
+            raise asyncio.QueueEmpty
+        item = self._items.popleft()
+        self._taken()
+        return item
+
+    async def put(self, item):
+        """Add an item, waiting for space while the queue is full."""
+        while self.full():
+            self._not_full.clear()
+            await self._not_full.wait()
+        self._add(item)
+
+    def put_nowait(self, item):
+        """
+        Add an item without waiting.
+
+        Raises:
+            asyncio.QueueFull: If the queue is full
+        """
+        if self.full():
+            raise asyncio.QueueFull
+        self._add(item)
+
+    async def push(self, item):
+        """
+        Enqueue an item according to the queue policy.
+
+        Returns:
+            bool: True if the item was queued
+        """
+        if self.policy == POLICY_BLOCK:
+            if self.full():
+                self.blocked_puts += 1
+            await self.put(item)
+            return True
+        return self.offer(item)
+
+    def offer(self, item):
+        """
+        Enqueue an item without blocking.
+
+        Returns:
+            bool: True if the item was queued, False if it was dropped
+        """
+        if not self.full():
+            self.put_nowait(item)
+            return True
+
+        if self.policy == POLICY_DROP_OLDEST:
+            self._evict(0)
+            self.put_nowait(item)
+            return True
+
+        if self.policy == POLICY_DROP_AUDIO:
+            index = self._oldest_audio_index()
+            if index is not None:
+                self._evict(index)
+                self.put_nowait(item)
+                return True
+            if self._is_audio(item):
+                self._count_drop(item)
+                return False
+            # Control events are never dropped, even over capacity
+            self._put_over_capacity(item)
+            return True
+
+        # Blocking policy used from a non-blocking context
+        self._count_drop(item)
+        return False
+
+    def requeue(self, items):
+        """
+        Put items taken from the queue back at its front, in their order.
+
+        For items a consumer took but could not deliver. They were admitted
+        once already, so capacity and the drop policy don't apply.
+        """
+        self._items.extendleft(reversed(items))
+        if items:
+            self._added()
+
+    def stats(self):
+        """
+        Get queue statistics.
+
+        Returns:
+            Dictionary with depth, capacity, drop counts and high-water mark
+        """
+        return {
+            "depth": self.qsize(),
+            "capacity": self.maxsize,
+            "policy": self.policy,
+            "dropped": self.dropped,
+            "dropped_audio": self.dropped_audio,
+            "blocked_puts": self.blocked_puts,
+            "high_water_mark": self.high_water_mark,
+        }
+
+    def _oldest_audio_index(self):
+        for index, queued in enumerate(self._items):
+            if self._is_audio(queued):
+                return index
+        return None
+
+    def _evict(self, index):
+        item = self._items[index]
+        del self._items[index]
+        self._taken()
+        self._count_drop(item)
+
+    def _count_drop(self, item):
+        self.dropped += 1
+        if self._is_audio(item):
+            self.dropped_audio += 1
+        if self.dropped == 1 or self.dropped % 100 == 0:
+            logger.warning(f"{self.name} full ({self.maxsize}), dropped {self.dropped} items so far")
+
+    def _add(self, item):
+        self._items.append(item)
+        self._added()
+
+    def _added(self):
+        if len(self._items) > self.high_water_mark:
+            self.high_water_mark = len(self._items)
+        self._not_empty.set()
+
+    def _taken(self):
+        if not self.full():
+            self._not_full.set()
+
+    def _put_over_capacity(self, item):
+        # Control events may exceed the capacity
+        self._add(item)
@@ -0,0 +1,336 @@
+"""
+Local stand-in for the Nova Sonic bidirectional stream.
+
+``FakeNovaSonicClient`` opens ``FakeBidirectionalStream`` objects that
+implement the parts of the Bedrock SDK stream the session manager uses
+(``await_output``, ``input_stream.send`` and ``input_stream.close``). The
+fake validates the order of incoming events and answers every user
+utterance with a scripted turn: a user transcript, optionally one or more
+concurrent ``supervisorAgent`` toolUses that wait for their results,
+assistant text and real-time paced audio.
+
+An utterance is any run of non-silent (non-zero) PCM input; the turn starts
+once ``end_of_speech_ms`` of silence follows it. Together with
+``scripts/load_test.py`` this measures sessions per core, time to first
+audio and memory per session without AWS.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import time
+import uuid
+from types import SimpleNamespace
+
+from .output_events import peek_event_name
+
+logger = logging.getLogger("FakeNovaSonic")
+
+INPUT_BYTES_PER_MS = 32  # 16 kHz, 16-bit mono input audio
+OUTPUT_BYTES_PER_MS = 48  # 24 kHz, 16-bit mono output audio
+
+_CONTENT_KEY = b'"content"'
+_END_OF_STREAM = object()
+
+
+class EventOrderError(Exception):
+    """Raised for input events Nova Sonic would reject."""
+
+
+class _InputValidator:
+    """Tracks session, prompt and content state to validate event order."""
+
+    def __init__(self):
+        self.session_started = False
+        self.session_ended = False
+        self.prompts = set()
+        self.open_contents = {}  # contentName -> (promptName, type, role)
+        self.tool_use_ids = {}  # contentName -> toolUseId of open TOOL contents
+
+    def check(self, name, body):
+        if self.session_ended:
+            raise EventOrderError(f"{name} received after sessionEnd")
+        if name == "sessionStart":
+            if self.session_started:
+                raise EventOrderError("Duplicate sessionStart")
+            self.session_started = True
+            return
+        if not self.session_started:
+            raise EventOrderError(f"{name} received before sessionStart")
+
+        if name == "sessionEnd":
+            self.session_ended = True
+        elif name == "promptStart":
+            if body.get("promptName") in self.prompts:
+                raise EventOrderError(f"Duplicate promptStart for {body.get('promptName')}")
+            self.prompts.add(body.get("promptName"))
+        elif name == "promptEnd":
+            self._require_prompt(name, body)
+            self.prompts.discard(body.get("promptName"))
+        elif name == "contentStart":
+            self._require_prompt(name, body)
+            content_name = body.get("contentName")
+            if content_name in self.open_contents:
+                raise EventOrderError(f"Duplicate contentStart for {content_name}")
+            self.open_contents[content_name] = (body.get("promptName"), body.get("type"), body.get("role"))
+            if body.get("type") == "TOOL":
+                tool_config = body.get("toolResultInputConfiguration") or {}
+                self.tool_use_ids[content_name] = tool_config.get("toolUseId")
+        elif name == "contentEnd":
+            self._require_content(name, body, None)
+            self.open_contents.pop(body.get("contentName"), None)
+            self.tool_use_ids.pop(body.get("contentName"), None)
+        elif name == "textInput":
+            self._require_content(name, body, "TEXT")
+        elif name == "toolResult":
+            self._require_content(name, body, "TOOL")
+        elif name == "audioInput":
+            if body is None:
+                # Fast path: only check that an audio content is open
+                if not any(kind == "AUDIO" for _, kind, _ in self.open_contents.values()):
+                    raise EventOrderError("audioInput without an open AUDIO content")
+            else:
+                self._require_content(name, body, "AUDIO")
+        else:
+            raise EventOrderError(f"Unknown input event {name}")
+
+    def _require_prompt(self, name, body):
+        if body.get("promptName") not in self.prompts:
+            raise EventOrderError(f"{name} for unknown prompt {body.get('promptName')}")
+
+    def _require_content(self, name, body, content_type):
+        self._require_prompt(name, body)
+        content = self.open_contents.get(body.get("contentName"))
+        if content is None:
+            raise EventOrderError(f"{name} for content {body.get('contentName')} that is not open")
+        if content_type and content[1] != content_type:
+            raise EventOrderError(f"{name} sent to a {content[1]} content")
+
+
+class _FakeOutputReceiver:
+    """Mimics the SDK output stream's ``receive()``."""
+
+    def __init__(self, queue):
+        self._queue = queue
+
+    async def receive(self):
+        item = await self._queue.get()
+        if item is _END_OF_STREAM:
+            raise StopAsyncIteration()
+        if isinstance(item, Exception):
+            raise item
+        return SimpleNamespace(value=SimpleNamespace(bytes_=item))
+
+
+class _FakeInputStream:
+    """Mimics the SDK input stream."""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    async def send(self, event):
+        self._stream._receive_input(event.value.bytes_)
+
+    async def close(self):
+        self._stream._close()
+
+
+class FakeBidirectionalStream:
+    """A scripted Nova Sonic bidirectional stream."""
+
+    def __init__(self, config):
+        self.config = config
+        self.input_stream = _FakeInputStream(self)
+        self.violations = []
+        self.turns = 0
+        self.closed = False
+
+        self._output = asyncio.Queue()
+        self._receiver = _FakeOutputReceiver(self._output)
+        self._validator = _InputValidator()
+        self._prompt_name = None
+        self._speech_ms = 0.0
+        self._silence_ms = 0.0
+        self._responding = False
+        self._turn_task = None
+        self._tool_results = {}
+
+    async def await_output(self):
+        return None, self._receiver
+
+    # Input handling
+
+    def _receive_input(self, raw):
+        if self.closed:
+            return
+        name = peek_event_name(raw)
+        body = None
+        try:
+            if name == "audioInput":
+                pcm = self._audio_payload(raw)
+                self._validator.check(name, None)
+                self._on_audio(pcm)
+                return
+
+            body = json.loads(raw)["event"]
+            name = next(iter(body))
+            body = body[name]
+            self._validator.check(name, body)
+        except EventOrderError as e:
+            self._violation(str(e))
+            return
+        except (ValueError, KeyError, StopIteration) as e:
+            self._violation(f"Malformed input event: {e}")
+            return
+
+        if name == "promptStart":
+            self._prompt_name = body.get("promptName")
+        elif name == "toolResult":
+            tool_use_id = self._validator.tool_use_ids.get(body.get("contentName"))
+            waiter = self._tool_results.pop(tool_use_id, None)
+            if waiter is None:
+                self._violation(f"toolResult for unknown toolUseId {tool_use_id}")
+            elif not waiter.done():
+                waiter.set_result(body.get("content"))
+        elif name == "sessionEnd":
+            self._close()
+
+    @staticmethod
+    def _audio_payload(raw):
+        """Decode the PCM of an audioInput event without parsing the JSON."""
+        key = raw.rfind(_CONTENT_KEY)
+        if key >= 0:
+            start = raw.find(b'"', key + len(_CONTENT_KEY))
+            end = raw.find(b'"', start + 1)
+            if start >= 0 and end > start:
+                return base64.b64decode(raw[start + 1:end])
+        return base64.b64decode(json.loads(raw)["event"]["audioInput"]["content"])
+
+    def _on_audio(self, pcm):
+        duration_ms = len(pcm) / INPUT_BYTES_PER_MS
+        if pcm.strip(b"\x00"):
+            self._speech_ms += duration_ms
+            self._silence_ms = 0.0
+            return
+        if self._speech_ms < self.config.min_speech_ms:
+            return
+        self._silence_ms += duration_ms
+        if self._silence_ms >= self.config.end_of_speech_ms and not self._responding:
+            self._speech_ms = 0.0
+            self._silence_ms = 0.0
+            self._responding = True
+            self._turn_task = asyncio.get_running_loop().create_task(self._respond())
+
+    def _violation(self, message):
+        self.violations.append(message)
+        logger.warning(f"Nova Sonic fake: {message}")
+        if self.config.strict:
+            self._output.put_nowait(Exception(f"ValidationException: {message}"))
+            self._close()
+
+    def _close(self):
+        if self.closed:
+            return
+        self.closed = True
+        if self._turn_task and not self._turn_task.done():
+            self._turn_task.cancel()
+        self._output.put_nowait(_END_OF_STREAM)
+
+    # Scripted output
+
+    def _emit(self, name, body):
+        body.setdefault("promptName", self._prompt_name)
+        self._output.put_nowait(json.dumps({"event": {name: body}}).encode("utf-8"))
+
+    def _emit_text(self, role, text, stop_reason="END_TURN"):
+        content_id = str(uuid.uuid4())
+        self._emit("contentStart", {"contentId": content_id, "type": "TEXT", "role": role,
+                                    "additionalModelFields": json.dumps({"generationStage": "FINAL"})})
+        self._emit("textOutput", {"contentId": content_id, "role": role, "content": text})
+        self._emit("contentEnd", {"contentId": content_id, "type": "TEXT", "stopReason": stop_reason})
+
+    async def _respond(self):
+        config = self.config
+        try:
+            self.turns += 1
+            self._emit_text("USER", config.user_transcript)
+            await asyncio.sleep(config.response_delay_ms / 1000)
+
+            if config.tool_use_every and self.turns % config.tool_use_every == 0:
+                await self._tool_uses(max(1, config.parallel_tool_uses))
+
+            self._emit_text("ASSISTANT", config.assistant_text)
+            await self._emit_audio()
+        except asyncio.CancelledError:
+            raise
+        finally:
+            self._responding = False
+
+    async def _tool_uses(self, count):
+        """Emit ``count`` toolUse contents back to back and wait for all their results."""
+        waiters = {}
+        for _ in range(count):
+            tool_use_id = str(uuid.uuid4())
+            content_id = str(uuid.uuid4())
+            waiters[tool_use_id] = self._tool_results[tool_use_id] = asyncio.get_running_loop().create_future()
+
+            self._emit("contentStart", {"contentId": content_id, "type": "TOOL", "role": "TOOL"})
+            self._emit("toolUse", {"contentId": content_id, "role": "TOOL", "toolName": "supervisorAgent",
+                                   "toolUseId": tool_use_id,
+                                   "content": json.dumps({"query": self.config.user_transcript})})
+            if self.config.tool_content_end_delay_ms:
+                await asyncio.sleep(self.config.tool_content_end_delay_ms / 1000)
+            self._emit("contentEnd", {"contentId": content_id, "type": "TOOL", "stopReason": "TOOL_USE"})
+
+        done, pending = await asyncio.wait(waiters.values(), timeout=self.config.tool_timeout_ms / 1000)
+        for tool_use_id, waiter in waiters.items():
+            if waiter in pending:
+                self._tool_results.pop(tool_use_id, None)
+                self._violation(f"No toolResult for toolUseId {tool_use_id}")
+
+    async def _emit_audio(self):
+        config = self.config
+        content_id = str(uuid.uuid4())
+        self._emit("contentStart", {"contentId": content_id, "type": "AUDIO", "role": "ASSISTANT"})
+
+        chunk = base64.b64encode(b"\x00" * int(config.audio_chunk_ms * OUTPUT_BYTES_PER_MS)).decode("ascii")
+        chunks = max(1, int(config.audio_output_ms // config.audio_chunk_ms))
+        started = time.monotonic()
+        for index in range(chunks):
+            self._emit("audioOutput", {"contentId": content_id, "role": "ASSISTANT", "content": chunk})
+            if config.realtime_output:
+                # Nova Sonic generates audio roughly in real time
+                delay = started + (index + 1) * config.audio_chunk_ms / 1000 - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+
+        self._emit("contentEnd", {"contentId": content_id, "type": "AUDIO", "stopReason": "END_TURN"})
+
+
+class FakeNovaSonicClient:
+    """Stands in for BedrockRuntimeClient when running without AWS."""
+
+    def __init__(self, config):
+        self.config = config
+        self.streams_opened = 0
+
+    async def invoke_model_with_bidirectional_stream(self, operation_input=None):
+        if self.config.open_delay_ms:
+            await asyncio.sleep(self.config.open_delay_ms / 1000)
+        self.streams_opened += 1
+        return FakeBidirectionalStream(self.config)
+
+
+class FakeSupervisorAgent:
+    """Stands in for SupervisorAgentIntegration with a fixed latency."""
+
+    def __init__(self, config):
+        self.config = config
+
+    async def query(self, query_text):
+        await asyncio.sleep(self.config.tool_latency_ms / 1000)
+        return self.config.tool_result
+
+    def shutdown(self):
+        pass
@@ -0,0 +1,129 @@
+"""
+Zero-parse passthrough for Bedrock output events.
+
+Most Nova Sonic output events (audioOutput, textOutput, contentStart, ...) are
+only forwarded to the browser. Instead of decoding them with ``json.loads``
+and re-encoding with ``json.dumps``, the event name is found with a cheap
+prefix scan of the raw bytes and the original payload is forwarded as-is.
+Only events the session manager acts on are fully parsed.
+
+Clients that negotiate ``BATCHED_OUTPUT_SUBPROTOCOL`` receive output events
+in batches: one text frame holding a JSON array of events, built from
+whatever was ready in the output queue within a short max-delay window.
+"""
+
+import asyncio
+import json
+from typing import NamedTuple
+
+# WebSocket subprotocol for batched output frames (implies binary audio input)
+BATCHED_OUTPUT_SUBPROTOCOL = "nova-s2s.batched-output.v1"
+
+# Events the session manager needs to inspect
+FULL_PARSE_EVENTS = frozenset({"toolUse", "contentEnd"})
+
+_EVENT_KEY = b'"event"'
+_SCAN_LIMIT = 64
+_SEPARATOR_CHARS = b' \t\r\n:{'
+
+
+class RawOutputEvent(NamedTuple):
+    """An output event kept as the raw bytes received from Bedrock."""
+
+    event_name: str
+    payload: bytes
+    timestamp: int
+
+
+def peek_event_name(raw):
+    """
+    Find the event name of a ``{"event": {"<name>": ...}}`` payload.
+
+    Args:
+        raw: Event bytes received from Bedrock
+
+    Returns:
+        str: The event name, or None if the prefix doesn't match
+    """
+    start = raw.find(_EVENT_KEY, 0, _SCAN_LIMIT)
+    if start < 0:
+        return None
+
+    name_start = raw.find(b'"', start + len(_EVENT_KEY), _SCAN_LIMIT)
+    if name_start < 0 or raw[start + len(_EVENT_KEY):name_start].strip(_SEPARATOR_CHARS):
+        return None
+
+    name_end = raw.find(b'"', name_start + 1, name_start + 1 + _SCAN_LIMIT)
+    if name_end < 0:
+        return None
+    return raw[name_start + 1:name_end].decode("ascii", errors="replace")
+
+
+def serialize_output_event(item):
+    """
+    Serialize an output queue item for the WebSocket.
+
+    Raw events get their timestamp spliced in before the closing brace, so
+    the browser receives the same JSON shape as for parsed events.
+
+    Args:
+        item: RawOutputEvent or a parsed event dictionary
+
+    Returns:
+        str: JSON text frame
+    """
+    if isinstance(item, RawOutputEvent):
+        text = item.payload.decode("utf-8").rstrip()
+        if text.endswith("}"):
+            return f'{text[:-1]},"timestamp":{item.timestamp}}}'
+        return text
+    return json.dumps(item)
+
+
+def serialize_output_batch(items):
+    """
+    Serialize several output queue items into one batched frame.
+
+    Returns:
+        str: JSON array text frame
+    """
+    return "[" + ",".join(serialize_output_event(item) for item in items) + "]"
+
+
+async def drain_output_batch(queue, first, max_events=64, max_delay_ms=5.0):
+    """
+    Collect output items that are ready to be sent together.
+
+    Args:
+        queue: Output queue to drain
+        first: Item already taken from the queue
+        max_events: Maximum events per batch
+        max_delay_ms: How long to wait for more events after the first one
+
+    Returns:
+        list: The batch, starting with ``first``
+    """
+    batch = [first]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_delay_ms / 1000.0
+
+    while len(batch) < max_events:
+        try:
+            batch.append(queue.get_nowait())
+            continue
+        except asyncio.QueueEmpty:
+            pass
+
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+        except asyncio.TimeoutError:
+            break
+        except asyncio.CancelledError:
+            # The caller puts ``first`` back; keep the rest in order behind it
+            queue.requeue(batch[1:])
+            raise
+
+    return batch
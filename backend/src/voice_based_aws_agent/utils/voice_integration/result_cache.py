@@ -0,0 +1,193 @@
+"""
+Result cache for supervisorAgent tool calls.
+
+Voice users repeat themselves ("what tags do I have") and Nova Sonic
+sometimes re-issues the same tool call, but every repeat used to go through
+the orchestrator, Bedrock and the MCP Gateway again. Queries are mapped to
+the MCP tool they resolve to; only read-only tools with a TTL in
+``ResultCacheConfig.tool_ttls`` are cached, so slideshows and memory writes
+always run. Results are kept in an LRU bounded by ``max_entries``, and
+identical concurrent queries share one in-flight computation
+(single-flight).
+
+One cache is shared by every session in the process, so a session can be
+served a result another session's agent computed. Only read-only tools whose
+answer depends on the query alone are cached, and ``SupervisorAgentIntegration``
+adds a cached answer to the receiving session's agent history, as if that
+agent had answered it.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import Counter, OrderedDict
+
+from src.voice_based_aws_agent.utils.metrics import SUPERVISOR_CACHE_ENTRIES, SUPERVISOR_CACHE_REQUESTS
+from src.voice_based_aws_agent.utils.query_text import normalize_query
+
+logger = logging.getLogger("ResultCache")
+
+# MCP tool a query resolves to, checked in order. Tools with side effects come
+# first so a query that mentions both ("show my beach tag") is never cached
+_TOOL_PATTERNS = (
+    ("photo_service.start_slideshow", re.compile(r"\b(slide ?shows?|show|display|play|start|open)\b")),
+    ("memory_service.add_memory", re.compile(r"\b(remember|memor(y|ies)|save|store|add|note|record|log)\b")),
+    ("photo_service.get_tags", re.compile(r"\b(tags?|tagged|categor(y|ies)|labels?)\b")),
+)
+
+def classify_tool(normalized_query):
+    """Get the MCP tool a normalized query resolves to, or None."""
+    for tool, pattern in _TOOL_PATTERNS:
+        if pattern.search(normalized_query):
+            return tool
+    return None
+
+
+class ResultCache:
+    """TTL and LRU bounded cache with single-flight for supervisorAgent results."""
+
+    def __init__(self, max_entries=256, tool_ttls=None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum cached results, least recently used are evicted
+            tool_ttls: Seconds a result stays fresh, by MCP tool. Queries that
+                resolve to any other tool bypass the cache
+        """
+        self.max_entries = max_entries
+        self.tool_ttls = dict(tool_ttls or {})
+        self._entries = OrderedDict()  # (tool, normalized query) -> (result, expires_at)
+        self._inflight = {}  # (tool, normalized query) -> Future
+
+        # Statistics
+        self.requests = Counter()
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_config(cls, cache_config):
+        """Create a cache from a ResultCacheConfig."""
+        return cls(max_entries=cache_config.max_entries, tool_ttls=cache_config.tool_ttls)
+
+    def _count(self, result):
+        self.requests[result] += 1
+        SUPERVISOR_CACHE_REQUESTS.inc(result=result)
+
+    async def get_or_compute(self, query, compute):
+        """
+        Get the cached result for ``query``, or compute it with ``compute()``.
+
+        Exceptions from ``compute`` are not cached; callers that joined the
+        in-flight computation receive the same exception.
+
+        Args:
+            query: The user's query
+            compute: Coroutine function returning a tuple of the result and
+                whether it succeeded. Failed results are returned to waiting
+                callers but not stored
+
+        Returns:
+            Tuple of the cached or computed result and whether it succeeded
+        """
+        normalized = normalize_query(query)
+        tool = classify_tool(normalized)
+        ttl = self.tool_ttls.get(tool)
+        if not ttl:
+            self._count("bypass")
+            return await compute()
+
+        key = (tool, normalized)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[1] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._count("hit")
+                logger.debug(f"Cache hit for {tool}: {normalized!r}")
+                return entry[0], True
+            del self._entries[key]
+            self.expirations += 1
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._count("coalesced")
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The caller computing the result was cancelled, not this one
+                return await self.get_or_compute(query, compute)
+
+        self._count("miss")
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result, ok = await compute()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                future.exception()  # Retrieved here so an unawaited future doesn't log it
+            raise
+        finally:
+            del self._inflight[key]
+
+        if ok:
+            self._store(key, result, ttl)
+        future.set_result((result, ok))
+        return result, ok
+
+    def _store(self, key, result, ttl):
+        self._entries[key] = (result, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every cached result."""
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """
+        Get hit/miss statistics.
+
+        Returns:
+            Dictionary with request counts by result, hit rate and size
+        """
+        cached = self.requests["hit"] + self.requests["coalesced"]
+        cacheable = cached + self.requests["miss"]
+        return {
+            **{result: self.requests[result] for result in ("hit", "miss", "coalesced", "bypass")},
+            "hit_rate": round(cached / cacheable, 3) if cacheable else 0.0,
+            "entries": len(self._entries),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+_shared_cache = None
+
+
+def get_result_cache(cache_config):
+    """
+    Get the process-wide result cache.
+
+    Returns:
+        ResultCache, or None if caching is disabled
+    """
+    global _shared_cache
+    if not cache_config.enabled:
+        return None
+    if _shared_cache is None:
+        _shared_cache = ResultCache.from_config(cache_config)
+        SUPERVISOR_CACHE_ENTRIES.set_function(lambda: len(_shared_cache))
+        logger.info(f"supervisorAgent result cache enabled (TTLs {_shared_cache.tool_ttls}, "
+                    f"max {_shared_cache.max_entries} entries)")
+    return _shared_cache
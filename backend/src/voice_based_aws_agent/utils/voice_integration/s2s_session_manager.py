@@ -7,11 +7,39 @@ import os
 import logging
 from .s2s_events import S2sEvent
 import time
-from aws_sdk_bedrock_runtime.client import BedrockRuntimeClient, InvokeModelWithBidirectionalStreamOperationInput
-from aws_sdk_bedrock_runtime.models import InvokeModelWithBidirectionalStreamInputChunk, BidirectionalInputPayloadPart
-from aws_sdk_bedrock_runtime.config import Config, HTTPAuthSchemeResolver, SigV4AuthScheme
-from smithy_aws_core.identity.environment import EnvironmentCredentialsResolver
+import weakref
+from collections import deque
 from .supervisor_agent_integration import SupervisorAgentIntegration
+from .event_queue import BoundedEventQueue
+from .output_events import FULL_PARSE_EVENTS, RawOutputEvent, peek_event_name
+from src.voice_based_aws_agent.config.config import (
+    AudioCoalescingConfig,
+    QueueConfig,
+    OutputForwardingConfig,
+    ToolExecutionConfig,
+)
+from src.voice_based_aws_agent.utils.metrics import (
+    ACTIVE_SESSIONS,
+    AUDIO_INPUT_CHUNKS,
+    AUDIO_INPUT_DELAY_SECONDS,
+    QUEUE_DEPTH,
+    QUEUE_DEPTH_MAX,
+    SESSIONS_TOTAL,
+    SPECULATIVE_TOOL_SAVED_SECONDS,
+    SPECULATIVE_TOOL_USES,
+    TOOL_CALLS_ABANDONED,
+    STREAM_INIT_FAILURES,
+    STREAM_INIT_SECONDS,
+    TOOL_USE_SECONDS,
+)
+from src.voice_based_aws_agent.utils.deadlines import Deadline, deadline_scope
+from src.voice_based_aws_agent.utils.tracing import (
+    TURN_END_REASONS,
+    get_tracer,
+    reset_current_turn,
+    set_current_turn,
+    span,
+)
 
 # Suppress warnings
 warnings.filterwarnings("ignore")
@@ -28,6 +56,126 @@ def debug_print(message):
     logger.debug(message)
 
 
+# The Bedrock runtime SDK is slow to import, so it is loaded when the first
+# client is created rather than when the server starts
+InvokeModelWithBidirectionalStreamInputChunk = None
+BidirectionalInputPayloadPart = None
+
+
+def _import_input_models():
+    """Import the SDK input event models on first use."""
+    global InvokeModelWithBidirectionalStreamInputChunk, BidirectionalInputPayloadPart
+    from aws_sdk_bedrock_runtime.models import (
+        InvokeModelWithBidirectionalStreamInputChunk,
+        BidirectionalInputPayloadPart,
+    )
+
+
+def create_bedrock_runtime_client(region):
+    """Create a Bedrock runtime client for bidirectional streaming."""
+    from aws_sdk_bedrock_runtime.client import BedrockRuntimeClient
+    from aws_sdk_bedrock_runtime.config import Config, HTTPAuthSchemeResolver, SigV4AuthScheme
+    from smithy_aws_core.identity.environment import EnvironmentCredentialsResolver
+
+    # Use environment credentials resolver which will pick up AWS_PROFILE
+    aws_profile = os.environ.get('AWS_PROFILE', 'default')
+    aws_region = os.environ.get('AWS_DEFAULT_REGION', region)
+    debug_print(f"Using AWS profile: {aws_profile}")
+    debug_print(f"Using AWS region: {aws_region}")
+    debug_print(f"Endpoint: https://bedrock-runtime.{region}.amazonaws.com")
+
+    config = Config(
+        endpoint_uri=f"https://bedrock-runtime.{region}.amazonaws.com",
+        region=region,
+        aws_credentials_identity_resolver=EnvironmentCredentialsResolver(),
+        auth_scheme_resolver=HTTPAuthSchemeResolver(),
+        auth_schemes={"aws.auth#sigv4": SigV4AuthScheme(service="bedrock")}
+    )
+    return BedrockRuntimeClient(config=config)
+
+
+# Bedrock runtime clients shared by all sessions in this process, keyed by region
+_shared_runtime_clients = {}
+_runtime_client_factory = create_bedrock_runtime_client
+
+
+def set_runtime_client_factory(factory):
+    """Replace how runtime clients are created, e.g. with the local Nova Sonic fake."""
+    global _runtime_client_factory
+    _runtime_client_factory = factory
+    _shared_runtime_clients.clear()
+
+
+def get_shared_bedrock_runtime_client(region):
+    """Get the process-wide Bedrock runtime client for a region."""
+    client = _shared_runtime_clients.get(region)
+    if client is None:
+        client = _runtime_client_factory(region)
+        _shared_runtime_clients[region] = client
+    return client
+
+
+async def open_bidirectional_stream(bedrock_client, model_id, timeout=30.0):
+    """Open a Nova Sonic bidirectional stream on the given client."""
+    from aws_sdk_bedrock_runtime.client import InvokeModelWithBidirectionalStreamOperationInput
+
+    return await asyncio.wait_for(
+        bedrock_client.invoke_model_with_bidirectional_stream(
+            InvokeModelWithBidirectionalStreamOperationInput(model_id=model_id)
+        ),
+        timeout=timeout
+    )
+
+
+# Sessions with an active stream in this process, read by the metrics gauges
+_active_sessions = weakref.WeakSet()
+
+
+def _queue_depths(queue_attr):
+    return [getattr(session, queue_attr).qsize() for session in list(_active_sessions)]
+
+
+ACTIVE_SESSIONS.set_function(lambda: len(_active_sessions))
+for _queue_name, _queue_attr in (("audio_input", "audio_input_queue"), ("output", "output_queue")):
+    QUEUE_DEPTH.set_function(lambda attr=_queue_attr: sum(_queue_depths(attr)), queue=_queue_name)
+    QUEUE_DEPTH_MAX.set_function(lambda attr=_queue_attr: max(_queue_depths(attr), default=0), queue=_queue_name)
+
+
+# Tool result for tool calls cancelled because the user interrupted
+INTERRUPTED_TOOL_RESULT = "The user interrupted, so this request was cancelled."
+
+
+def is_audio_output(item):
+    """Check whether an output queue item is an audioOutput event."""
+    if isinstance(item, RawOutputEvent):
+        return item.event_name == 'audioOutput'
+    return isinstance(item, dict) and 'audioOutput' in item.get('event', {})
+
+
+class ToolUse:
+    """A toolUse received from Bedrock whose result has not been sent yet."""
+
+    def __init__(self, tool_use_id, tool_name, content, content_id, turn=None):
+        self.tool_use_id = tool_use_id
+        self.tool_name = tool_name
+        self.content = content
+        self.content_id = content_id
+        self.turn = turn
+        self.started_at = time.perf_counter()
+        self.task = None
+        self.speculative = False
+
+        # Deadline and the processToolUse task, set once processing starts
+        self.deadline = None
+        self.work = None
+
+        # Set at the TOOL contentEnd, once the result may be sent to Bedrock
+        self.prompt_name = None
+        self.committed = asyncio.Event()
+        self.content_ended_at = None
+        self.result_ready_at = None
+
+
 class S2sSessionManager:
     """Simple S2S Session Manager """
     
@@ -35,75 +183,120 @@ class S2sSessionManager:
         """Initialize the stream manager."""
         self.model_id = model_id
         self.region = region
+        self.session_id = uuid.uuid4().hex[:12]
         
         # Audio and output queues
-        self.audio_input_queue = asyncio.Queue()
-        self.output_queue = asyncio.Queue()
+        queue_config = getattr(config, "queues", None) or QueueConfig()
+        self.audio_input_queue = BoundedEventQueue(
+            maxsize=queue_config.audio_input_capacity,
+            policy=queue_config.audio_input_policy,
+            name="audio_input_queue"
+        )
+        self.output_queue = BoundedEventQueue(
+            maxsize=queue_config.output_capacity,
+            policy=queue_config.output_policy,
+            is_audio=is_audio_output,
+            name="output_queue"
+        )
         
         self.response_task = None
+        self.audio_input_task = None
+        self.tool_result_task = None
         self.stream = None
         self.is_active = False
+        self._closed = False  # Set once close() has released the session's resources
         self.bedrock_client = None
         
         # Session information
         self.prompt_name = None  # Will be set from frontend
         self.content_name = None  # Will be set from frontend
         self.audio_content_name = None  # Will be set from frontend
-        self.toolUseContent = ""
-        self.toolUseId = ""
-        self.toolName = ""
+
+        # In-flight tool uses by toolUseId, and toolUseId by the TOOL content
+        # that carried the toolUse. Each runs in its own task so the receive
+        # loop keeps draining Bedrock output; results are sent back in
+        # completion order by a single sender task
+        self.tool_uses = {}
+        self.tool_use_ids_by_content = {}
+        self.tool_result_queue = asyncio.Queue()
+
+        # Speculative tool execution: start on toolUse, commit at contentEnd
+        tool_execution = getattr(config, "tool_execution", None) or ToolExecutionConfig()
+        self.speculative_tools = tool_execution.speculative
+        self.tool_timeout = tool_execution.timeout
+        self.tool_fallback_message = tool_execution.fallback_message
+        
+        # Forward audio/text output events without parsing them
+        output_config = getattr(config, "output_forwarding", None) or OutputForwardingConfig()
+        self.passthrough_output = output_config.passthrough
+
+        # Audio chunk coalescing
+        self.audio_coalescing = getattr(config, "audio_coalescing", None) or AudioCoalescingConfig()
+        self.audio_chunks_received = 0
+        self.audio_events_sent = 0
+
+        # Turn tracing: the turn receiving audio input, and the turns whose
+        # output has not been fully forwarded to the client yet
+        self.turn = None
+        self.turn_count = 0
+        self._output_turns = deque()
         
         # Initialize the Supervisor Agent integration
-        self.supervisor_agent = SupervisorAgentIntegration(config)
+        fake_sonic = getattr(config, "fake_sonic", None)
+        if fake_sonic is not None and fake_sonic.enabled:
+            from .fake_sonic import FakeSupervisorAgent
+            self.supervisor_agent = FakeSupervisorAgent(fake_sonic)
+        else:
+            self.supervisor_agent = SupervisorAgentIntegration(config)
 
     def _initialize_client(self):
         """Initialize the Bedrock client."""
         debug_print("Initializing Bedrock client...")
-        
-        # Use environment credentials resolver which will pick up AWS_PROFILE
-        aws_profile = os.environ.get('AWS_PROFILE', 'default')
-        aws_region = os.environ.get('AWS_DEFAULT_REGION', self.region)
-        debug_print(f"Using AWS profile: {aws_profile}")
-        debug_print(f"Using AWS region: {aws_region}")
-        debug_print(f"Endpoint: https://bedrock-runtime.{self.region}.amazonaws.com")
-        
-        config = Config(
-            endpoint_uri=f"https://bedrock-runtime.{self.region}.amazonaws.com",
-            region=self.region,
-            aws_credentials_identity_resolver=EnvironmentCredentialsResolver(),
-            auth_scheme_resolver=HTTPAuthSchemeResolver(),
-            auth_schemes={"aws.auth#sigv4": SigV4AuthScheme(service="bedrock")}
-        )
-        self.bedrock_client = BedrockRuntimeClient(config=config)
+        self.bedrock_client = get_shared_bedrock_runtime_client(self.region)
         debug_print("Bedrock client initialized successfully")
 
-    async def initialize_stream(self):
-        """Initialize the bidirectional stream with Bedrock."""
+    async def initialize_stream(self, stream_pool=None):
+        """Initialize the bidirectional stream with Bedrock.
+
+        Args:
+            stream_pool: Optional BedrockStreamPool to check a pre-warmed
+                stream out of instead of opening a new one
+        """
         debug_print("Starting stream initialization...")
-        try:
-            if not self.bedrock_client:
-                debug_print("Bedrock client not initialized, initializing now...")
-                self._initialize_client()
-            debug_print("Bedrock client ready")
-        except Exception as ex:
-            self.is_active = False
-            debug_print(f"Failed to initialize Bedrock client: {str(ex)}")
-            print(f"Failed to initialize Bedrock client: {str(ex)}")
-            raise
+        if stream_pool is None:
+            try:
+                if not self.bedrock_client:
+                    debug_print("Bedrock client not initialized, initializing now...")
+                    self._initialize_client()
+                debug_print("Bedrock client ready")
+            except Exception as ex:
+                self.is_active = False
+                debug_print(f"Failed to initialize Bedrock client: {str(ex)}")
+                print(f"Failed to initialize Bedrock client: {str(ex)}")
+                raise
 
         try:
             debug_print(f"Creating bidirectional stream with model: {self.model_id}")
             # Initialize the stream with a timeout
             start_time = time.time()
-            self.stream = await asyncio.wait_for(
-                self.bedrock_client.invoke_model_with_bidirectional_stream(
-                    InvokeModelWithBidirectionalStreamOperationInput(model_id=self.model_id)
-                ), 
-                timeout=30.0  # 30 second timeout
-            )
+            init_started = time.perf_counter()
+            if stream_pool is not None:
+                pooled = await stream_pool.checkout()
+                self.bedrock_client = pooled.client
+                self.stream = pooled.stream
+            else:
+                self.stream = await open_bidirectional_stream(
+                    self.bedrock_client, self.model_id, timeout=30.0  # 30 second timeout
+                )
             end_time = time.time()
+            STREAM_INIT_SECONDS.observe(
+                time.perf_counter() - init_started,
+                source="pool" if stream_pool is not None else "direct"
+            )
             debug_print(f"Bedrock stream created successfully in {end_time - start_time:.2f} seconds")
             self.is_active = True
+            SESSIONS_TOTAL.inc()
+            _active_sessions.add(self)
             
             debug_print("Starting response processor task...")
             # Start listening for responses
@@ -111,7 +304,10 @@ class S2sSessionManager:
 
             debug_print("Starting audio input processor task...")
             # Start processing audio input
-            asyncio.create_task(self._process_audio_input())
+            self.audio_input_task = asyncio.create_task(self._process_audio_input())
+
+            # Start sending tool results
+            self.tool_result_task = asyncio.create_task(self._send_tool_results())
             
             # Wait a bit to ensure everything is set up
             debug_print("Waiting for initialization to complete...")
@@ -126,6 +322,7 @@ class S2sSessionManager:
             raise
         except Exception as e:
             self.is_active = False
+            STREAM_INIT_FAILURES.inc()
             debug_print(f"Failed to initialize stream: {str(e)}")
             debug_print(f"Exception type: {type(e).__name__}")
             print(f"Failed to initialize stream: {str(e)}")
@@ -140,6 +337,8 @@ class S2sSessionManager:
                 return
             
             event_json = json.dumps(event_data)
+            if InvokeModelWithBidirectionalStreamInputChunk is None:
+                _import_input_models()
             event = InvokeModelWithBidirectionalStreamInputChunk(
                 value=BidirectionalInputPayloadPart(bytes_=event_json.encode('utf-8'))
             )
@@ -153,31 +352,53 @@ class S2sSessionManager:
             debug_print(f"Error sending event: {str(e)}")
     
     async def _process_audio_input(self):
-        """Process audio input from the queue and send to Bedrock."""
+        """Process audio input from the queue and send to Bedrock.
+
+        Consecutive chunks for the same prompt/content are merged into a
+        single audioInput event, bounded by the coalescing byte size and
+        latency budget.
+        """
         debug_print("Starting audio input processing loop")
+        pending = None
         while self.is_active:
             try:
                 debug_print("Waiting for audio data from queue...")
                 # Get audio data from the queue
-                data = await self.audio_input_queue.get()
-                debug_print(f"Got audio data from queue: {data.keys() if data else 'None'}")
+                data = pending if pending is not None else await self.audio_input_queue.get()
+                pending = None
                 
                 # Extract data from the queue item
                 prompt_name = data.get('prompt_name')
                 content_name = data.get('content_name')
-                audio_bytes = data.get('audio_bytes')
                 
-                if not audio_bytes or not prompt_name or not content_name:
+                if not prompt_name or not content_name or not self._audio_payload(data):
                     debug_print("Missing required audio data properties")
                     continue
 
-                debug_print(f"Processing audio: prompt={prompt_name}, content={content_name}")
+                batch = [data]
+                if self.audio_coalescing.enabled:
+                    pending = await self._collect_audio_batch(batch, prompt_name, content_name)
+                self.audio_chunks_received += len(batch)
+
+                debug_print(f"Processing audio: prompt={prompt_name}, content={content_name}, chunks={len(batch)}")
                 # Create the audio input event
-                audio_event = S2sEvent.audio_input(prompt_name, content_name, audio_bytes.decode('utf-8') if isinstance(audio_bytes, bytes) else audio_bytes)
+                audio_event = S2sEvent.audio_input(prompt_name, content_name, self._merge_audio(batch))
                 
                 # Send the event
                 debug_print("Sending audio event to Bedrock...")
                 await self.send_raw_event(audio_event)
+                self.audio_events_sent += 1
+
+                # Marks and spans are relative to the turn's first audio input; time to
+                # first audio is measured from the end of the user's transcript instead
+                turn = self.turn or self._start_turn()
+                if turn is not None:
+                    turn.mark("first_audio_input")
+
+                sent_at = time.perf_counter()
+                for item in batch:
+                    AUDIO_INPUT_DELAY_SECONDS.observe(sent_at - item['enqueued_at'])
+                AUDIO_INPUT_CHUNKS.inc(len(batch))
                 debug_print("Audio event sent successfully")
                 
             except asyncio.CancelledError:
@@ -185,17 +406,162 @@ class S2sSessionManager:
                 break
             except Exception as e:
                 debug_print(f"Error processing audio: {e}")
-    
-    def add_audio_chunk(self, prompt_name, content_name, audio_data):
-        """Add an audio chunk to the queue."""
+
+    async def _collect_audio_batch(self, batch, prompt_name, content_name):
+        """
+        Drain queued chunks for the same prompt/content into ``batch``.
+
+        Returns:
+            The first queued item that belongs to a different prompt/content,
+            or None
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.audio_coalescing.max_delay_ms / 1000.0
+        size = self._audio_size(batch[0])
+
+        while size < self.audio_coalescing.max_batch_bytes:
+            try:
+                data = self.audio_input_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    data = await asyncio.wait_for(self.audio_input_queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+
+            if not self._audio_payload(data):
+                continue
+            if data.get('prompt_name') != prompt_name or data.get('content_name') != content_name:
+                return data
+
+            batch.append(data)
+            size += self._audio_size(data)
+
+        return None
+
+    @staticmethod
+    def _audio_payload(data):
+        """Get the base64 or raw PCM payload of a queued audio item."""
+        return data.get('pcm_bytes') or data.get('audio_bytes')
+
+    @staticmethod
+    def _audio_size(data):
+        """Approximate PCM byte size of a queued audio item."""
+        if data.get('pcm_bytes') is not None:
+            return len(data['pcm_bytes'])
+        return len(data.get('audio_bytes') or '') * 3 // 4
+
+    @staticmethod
+    def _merge_audio(batch):
+        """Merge queued audio items into a single base64 string."""
+        parts = []
+        for data in batch:
+            if data.get('pcm_bytes') is not None:
+                parts.append(data['pcm_bytes'])
+            else:
+                audio = data['audio_bytes']
+                parts.append(audio.decode('utf-8') if isinstance(audio, bytes) else audio)
+
+        if all(isinstance(part, str) for part in parts):
+            if len(parts) == 1:
+                return parts[0]
+            # Unpadded base64 strings can be concatenated without re-encoding
+            if not any(part.endswith('=') for part in parts[:-1]):
+                return ''.join(parts)
+
+        pcm = b''.join(part if isinstance(part, bytes) else base64.b64decode(part) for part in parts)
+        return base64.b64encode(pcm).decode('ascii')
+
+    async def add_audio_chunk(self, prompt_name, content_name, audio_data):
+        """Add an audio chunk to the queue.
+
+        Returns:
+            bool: False if the chunk was dropped by the queue policy
+        """
         debug_print(f"Adding audio chunk: prompt={prompt_name}, content={content_name}, data_length={len(audio_data) if audio_data else 0}")
         # The audio_data is already a base64 string from the frontend
-        self.audio_input_queue.put_nowait({
+        accepted = await self.audio_input_queue.push({
             'prompt_name': prompt_name,
             'content_name': content_name,
-            'audio_bytes': audio_data
+            'audio_bytes': audio_data,
+            'enqueued_at': time.perf_counter()
         })
         debug_print(f"Audio queue size now: {self.audio_input_queue.qsize()}")
+        return accepted
+
+    async def add_pcm_chunk(self, prompt_name, content_name, pcm_bytes):
+        """Add a raw PCM audio chunk to the queue (binary WebSocket framing).
+
+        Returns:
+            bool: False if the chunk was dropped by the queue policy
+        """
+        # Base64 encoding happens once per merged event in _process_audio_input
+        return await self.audio_input_queue.push({
+            'prompt_name': prompt_name,
+            'content_name': content_name,
+            'pcm_bytes': bytes(pcm_bytes),
+            'enqueued_at': time.perf_counter()
+        })
+
+    def _start_turn(self):
+        """Start tracing a new turn, if tracing is enabled."""
+        tracer = get_tracer()
+        if tracer is None:
+            return None
+        self.turn_count += 1
+        self.turn = tracer.start_turn(self.session_id, self.turn_count)
+        self._output_turns.append(self.turn)
+        return self.turn
+
+    def _trace_content_end(self, content_end):
+        """Mark transcript and turn boundaries from a contentEnd event."""
+        if content_end.get('type') == 'TEXT':
+            # The user's transcript is the first text content of a turn
+            self.turn.mark("user_transcript_end")
+        elif content_end.get('type') == 'AUDIO' and content_end.get('stopReason') in TURN_END_REASONS:
+            # New audio input now belongs to the next turn
+            self.turn.mark("model_turn_end")
+            self.turn = None
+
+    def on_output_forwarded(self, items):
+        """Update turn traces for output items that were sent to the client."""
+        for item in items:
+            if not self._output_turns:
+                return
+            turn = self._output_turns[0]
+            if "first_audio_output" not in turn.marks and is_audio_output(item):
+                turn.mark("first_audio_output")
+            elif isinstance(item, dict) and 'contentEnd' in item.get('event', {}):
+                content_end = item['event']['contentEnd']
+                if content_end.get('type') == 'AUDIO' and content_end.get('stopReason') in TURN_END_REASONS:
+                    self._output_turns.popleft().finish(content_end['stopReason'])
+
+    def get_queue_stats(self):
+        """
+        Get drop counters and high-water marks for this session's queues.
+
+        Returns:
+            Dictionary with stats for the audio input and output queues
+        """
+        return {
+            "audio_input": self.audio_input_queue.stats(),
+            "output": self.output_queue.stats(),
+        }
+
+    def get_audio_stats(self):
+        """
+        Get audio input statistics for this session.
+
+        Returns:
+            Dictionary with chunk/event counts and the achieved batching factor
+        """
+        return {
+            "chunks_received": self.audio_chunks_received,
+            "events_sent": self.audio_events_sent,
+            "batching_factor": round(self.audio_chunks_received / self.audio_events_sent, 2) if self.audio_events_sent else 0.0,
+        }
     
     async def _process_responses(self):
         """Process incoming responses from Bedrock."""
@@ -205,10 +571,20 @@ class S2sSessionManager:
                 result = await output[1].receive()
                 
                 if result.value and result.value.bytes_:
-                    response_data = result.value.bytes_.decode('utf-8')
+                    raw_data = result.value.bytes_
+                    timestamp = int(time.time() * 1000)  # Milliseconds since epoch
+
+                    # Forward events we don't act on as their original bytes
+                    if self.passthrough_output:
+                        event_name = peek_event_name(raw_data)
+                        if event_name is not None and event_name not in FULL_PARSE_EVENTS:
+                            await self.output_queue.push(RawOutputEvent(event_name, raw_data, timestamp))
+                            continue
+
+                    response_data = raw_data.decode('utf-8')
                     
                     json_data = json.loads(response_data)
-                    json_data["timestamp"] = int(time.time() * 1000)  # Milliseconds since epoch
+                    json_data["timestamp"] = timestamp
                     
                     event_name = None
                     if 'event' in json_data:
@@ -216,42 +592,25 @@ class S2sSessionManager:
                         
                         # Handle tool use detection
                         if event_name == 'toolUse':
-                            self.toolUseContent = json_data['event']['toolUse']
-                            self.toolName = json_data['event']['toolUse']['toolName']
-                            self.toolUseId = json_data['event']['toolUse']['toolUseId']
-                            debug_print(f"Tool use detected: {self.toolName}, ID: {self.toolUseId}")
+                            self._add_tool_use(json_data['event']['toolUse'])
 
-                        # Process tool use when content ends
+                        # Run the tool when its content ends, without blocking this loop
                         elif event_name == 'contentEnd' and json_data['event'][event_name].get('type') == 'TOOL':
-                            prompt_name = json_data['event']['contentEnd'].get("promptName")
-                            debug_print("Processing tool use and sending result")
-                            toolResult = await self.processToolUse(self.toolName, self.toolUseContent)
-                                
-                            # Send tool start event
-                            toolContent = str(uuid.uuid4())
-                            tool_start_event = S2sEvent.content_start_tool(prompt_name, toolContent, self.toolUseId)
-                            await self.send_raw_event(tool_start_event)
-                            
-                            # Send tool result event
-                            if isinstance(toolResult, dict):
-                                content_json_string = json.dumps(toolResult)
-                            else:
-                                content_json_string = toolResult
-
-                            tool_result_event = S2sEvent.text_input_tool(prompt_name, toolContent, content_json_string)
-                            print("Tool result", tool_result_event)
-                            await self.send_raw_event(tool_result_event)
-
-                            # Send tool content end event
-                            tool_content_end_event = S2sEvent.content_end(prompt_name, toolContent)
-                            await self.send_raw_event(tool_content_end_event)
+                            self._start_tool_use(json_data['event']['contentEnd'])
+
+                        elif event_name == 'contentEnd' and json_data['event'][event_name].get('stopReason') == 'INTERRUPTED':
+                            # The user barged in, so stop work nobody is waiting for
+                            self._interrupt_tool_uses()
+
+                        if event_name == 'contentEnd' and self.turn is not None:
+                            self._trace_content_end(json_data['event']['contentEnd'])
                     
                     # Put the response in the output queue for forwarding to the frontend
-                    await self.output_queue.put(json_data)
+                    await self.output_queue.push(json_data)
 
             except json.JSONDecodeError as ex:
                 print(ex)
-                await self.output_queue.put({"raw_data": response_data})
+                await self.output_queue.push({"raw_data": response_data})
             except StopAsyncIteration as ex:
                 # Stream has ended
                 print(ex)
@@ -265,9 +624,180 @@ class S2sSessionManager:
                     print(f"Error receiving response: {e}")
                 break
 
-        self.is_active = False
+        # No more output is coming for the turn in progress
+        if self.turn is not None:
+            self.turn.finish("stream_ended")
+            self.turn = None
         self.close()
 
+    def _add_tool_use(self, tool_use_event):
+        """Record a toolUse event in the in-flight table."""
+        tool_use = ToolUse(
+            tool_use_event['toolUseId'],
+            tool_use_event['toolName'],
+            tool_use_event,
+            tool_use_event.get('contentId'),
+            self.turn,
+        )
+        superseded = self.tool_uses.get(self.tool_use_ids_by_content.get(tool_use.content_id))
+        if superseded is not None:
+            self._discard_tool_use(superseded, "superseded")
+
+        self.tool_uses[tool_use.tool_use_id] = tool_use
+        if tool_use.content_id:
+            self.tool_use_ids_by_content[tool_use.content_id] = tool_use.tool_use_id
+        if self.turn is not None:
+            self.turn.mark("tool_use")
+        debug_print(f"Tool use detected: {tool_use.tool_name}, ID: {tool_use.tool_use_id}")
+
+        if self.speculative_tools:
+            debug_print(f"Speculatively starting tool use {tool_use.tool_name}, ID: {tool_use.tool_use_id}")
+            tool_use.speculative = True
+            tool_use.task = asyncio.create_task(self._run_tool_use(tool_use))
+
+    def _start_tool_use(self, content_end):
+        """Start the tool use whose TOOL content just ended."""
+        tool_use_id = self.tool_use_ids_by_content.pop(content_end.get('contentId'), None)
+        tool_use = self.tool_uses.get(tool_use_id)
+        if tool_use is None:
+            # Without a contentId match, take the oldest tool use not committed yet
+            tool_use = next((t for t in self.tool_uses.values() if not t.committed.is_set()), None)
+        if tool_use is None or tool_use.committed.is_set():
+            debug_print(f"No pending tool use for TOOL content {content_end.get('contentId')}")
+            return
+
+        if tool_use.speculative and content_end.get('stopReason') == 'INTERRUPTED':
+            # The model abandoned the tool call, so the speculative result is not wanted
+            self._discard_tool_use(tool_use, "interrupted")
+            return
+
+        tool_use.prompt_name = content_end.get("promptName")
+        tool_use.content_ended_at = time.perf_counter()
+        if tool_use.turn is not None:
+            tool_use.turn.mark("tool_content_end")
+        if tool_use.task is None:
+            debug_print(f"Starting tool use {tool_use.tool_name}, ID: {tool_use.tool_use_id}, "
+                        f"in flight: {len(self.tool_uses)}")
+            tool_use.task = asyncio.create_task(self._run_tool_use(tool_use))
+        else:
+            SPECULATIVE_TOOL_USES.inc(outcome="committed")
+            debug_print(f"Committing speculative tool use {tool_use.tool_name}, ID: {tool_use.tool_use_id}")
+        tool_use.committed.set()
+
+    def _discard_tool_use(self, tool_use, reason):
+        """Cancel an uncommitted tool use and drop it from the in-flight table."""
+        debug_print(f"Discarding tool use {tool_use.tool_name}, ID: {tool_use.tool_use_id} ({reason})")
+        self.tool_uses.pop(tool_use.tool_use_id, None)
+        if self.tool_use_ids_by_content.get(tool_use.content_id) == tool_use.tool_use_id:
+            del self.tool_use_ids_by_content[tool_use.content_id]
+        self._cancel_tool_use(tool_use, reason)
+        if tool_use.speculative:
+            SPECULATIVE_TOOL_USES.inc(outcome="discarded")
+
+    def _cancel_tool_use(self, tool_use, reason):
+        """Cancel a tool use's task, recording why on its deadline first."""
+        if tool_use.deadline is not None:
+            tool_use.deadline.cancel(reason)
+        if tool_use.task is not None and not tool_use.task.done():
+            tool_use.task.cancel()
+
+    async def _run_tool_use(self, tool_use):
+        """Run one tool use and queue its result for the tool result sender once committed."""
+        tool_use.deadline = Deadline(self.tool_timeout)
+        turn_token = set_current_turn(tool_use.turn)
+        try:
+            with deadline_scope(tool_use.deadline), \
+                    span("processToolUse", tool=tool_use.tool_name, tool_use_id=tool_use.tool_use_id,
+                         speculative=tool_use.speculative):
+                tool_result = await self._process_tool_use_with_deadline(tool_use)
+            tool_use.result_ready_at = time.perf_counter()
+            await tool_use.committed.wait()
+        except asyncio.CancelledError:
+            self.tool_uses.pop(tool_use.tool_use_id, None)
+            raise
+        finally:
+            reset_current_turn(turn_token)
+
+        if tool_use.speculative:
+            # Work done before the contentEnd no longer delays the result
+            overlap_end = min(tool_use.content_ended_at, tool_use.result_ready_at)
+            SPECULATIVE_TOOL_SAVED_SECONDS.observe(overlap_end - tool_use.started_at)
+        await self.tool_result_queue.put((tool_use.prompt_name, tool_use, tool_result))
+
+    async def _process_tool_use_with_deadline(self, tool_use):
+        """
+        Run processToolUse until it finishes, its deadline passes or it is cancelled.
+
+        Returns:
+            The tool result, or a short fallback result if the call was abandoned
+        """
+        deadline = tool_use.deadline
+        # The task copies this context, so the deadline follows the work into the agents
+        tool_use.work = asyncio.ensure_future(self.processToolUse(tool_use.tool_name, tool_use.content))
+        try:
+            await asyncio.wait({tool_use.work}, timeout=deadline.remaining())
+        except asyncio.CancelledError:
+            # Whoever cancelled the task has set the reason; this only covers other cancellations
+            deadline.cancel("cancelled")
+            if not tool_use.work.done():
+                tool_use.work.cancel()
+                TOOL_CALLS_ABANDONED.inc(reason=deadline.reason)
+            raise
+
+        if tool_use.work.done() and not tool_use.work.cancelled():
+            return tool_use.work.result()
+
+        tool_use.work.cancel()
+        deadline.cancel("timeout")  # Keeps the reason if it was already cancelled
+        TOOL_CALLS_ABANDONED.inc(reason=deadline.reason)
+        logger.warning(f"Abandoned tool use {tool_use.tool_name}, ID: {tool_use.tool_use_id} ({deadline.reason})")
+        if deadline.reason == "interrupted":
+            return {"result": INTERRUPTED_TOOL_RESULT}
+        return {"result": self.tool_fallback_message}
+
+    def _interrupt_tool_uses(self):
+        """Cancel the work of every in-flight tool use after the user interrupted."""
+        for tool_use in list(self.tool_uses.values()):
+            if tool_use.deadline is not None and tool_use.work is not None and not tool_use.work.done():
+                tool_use.deadline.cancel("interrupted")
+                tool_use.work.cancel()
+
+    async def _send_tool_results(self):
+        """Send queued tool results to Bedrock, one tool result content at a time."""
+        while self.is_active:
+            try:
+                prompt_name, tool_use, tool_result = await self.tool_result_queue.get()
+                self.tool_uses.pop(tool_use.tool_use_id, None)
+
+                # Send tool start event
+                toolContent = str(uuid.uuid4())
+                tool_start_event = S2sEvent.content_start_tool(prompt_name, toolContent, tool_use.tool_use_id)
+                await self.send_raw_event(tool_start_event)
+
+                # Send tool result event
+                if isinstance(tool_result, dict):
+                    content_json_string = json.dumps(tool_result)
+                else:
+                    content_json_string = tool_result
+
+                tool_result_event = S2sEvent.text_input_tool(prompt_name, toolContent, content_json_string)
+                print("Tool result", tool_result_event)
+                await self.send_raw_event(tool_result_event)
+
+                # Send tool content end event
+                tool_content_end_event = S2sEvent.content_end(prompt_name, toolContent)
+                await self.send_raw_event(tool_content_end_event)
+
+                if tool_use.turn is not None:
+                    tool_use.turn.mark("tool_result_sent")
+                TOOL_USE_SECONDS.observe(time.perf_counter() - tool_use.started_at, tool=tool_use.tool_name)
+
+            except asyncio.CancelledError:
+                debug_print("Tool result sender cancelled")
+                break
+            except Exception as e:
+                debug_print(f"Error sending tool result: {e}")
+
     async def processToolUse(self, toolName, toolUseContent):
         """Process tool use with Supervisor Agent - simplified version"""
         print(f"Tool Use Content: {toolUseContent}")
@@ -319,15 +849,38 @@ class S2sSessionManager:
             return {"result": f"Sorry, I encountered an error: {str(ex)}"}
     
     def close(self):
-        """Close the stream properly."""
-        if not self.is_active:
-            return
-            
+        """Close the stream properly. Safe to call more than once."""
         self.is_active = False
+        self._release()
+
+    def _release(self):
+        """Release the session's stream, tasks and traces, once."""
+        # Guarded by its own flag: is_active is also cleared when the stream ends
+        if self._closed:
+            return
+        self._closed = True
+        _active_sessions.discard(self)
+        while self._output_turns:
+            self._output_turns.popleft().finish("session_closed")
+        self.turn = None
+        logger.info(f"Session audio input stats: {self.get_audio_stats()}")
+        logger.info(f"Session queue stats: {self.get_queue_stats()}")
         
         if self.stream:
             # Don't await here to avoid blocking
             asyncio.create_task(self.stream.input_stream.close())
         
-        if self.response_task and not self.response_task.done():
+        # close() may be called from the response task itself when the stream ends
+        if self.response_task and not self.response_task.done() and self.response_task is not asyncio.current_task():
             self.response_task.cancel()
+
+        # Otherwise it waits on the audio input queue forever and keeps the session alive
+        if self.audio_input_task and not self.audio_input_task.done():
+            self.audio_input_task.cancel()
+
+        for tool_use in list(self.tool_uses.values()):
+            self._cancel_tool_use(tool_use, "session_closed")
+        self.tool_uses.clear()
+        self.tool_use_ids_by_content.clear()
+        if self.tool_result_task and not self.tool_result_task.done():
+            self.tool_result_task.cancel()
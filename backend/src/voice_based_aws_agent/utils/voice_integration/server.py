@@ -9,15 +9,38 @@ import json
 import logging
 import warnings
 import sys
+import time
 from pathlib import Path
+from urllib.parse import parse_qs, urlparse
 
 # Add the project root to Python path
 project_root = Path(__file__).parent.parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from .s2s_session_manager import S2sSessionManager
+from .s2s_session_manager import S2sSessionManager, set_runtime_client_factory
+from .stream_pool import BedrockStreamPool
+from .admission import AdmissionController, AdmissionRejected, rejection_event
+from .session_registry import (
+    ParkedSession,
+    SessionRegistry,
+    new_resume_token,
+    resumable_event,
+    resume_failed_event,
+    resumed_event,
+)
+from .output_events import (
+    BATCHED_OUTPUT_SUBPROTOCOL,
+    drain_output_batch,
+    serialize_output_batch,
+    serialize_output_event,
+)
+from .audio_frames import BINARY_AUDIO_SUBPROTOCOL, AudioFrameError, decode_audio_frame
 from src.voice_based_aws_agent.utils.aws_auth import get_aws_session
 from src.voice_based_aws_agent.config.config import AgentConfig
+from src.voice_based_aws_agent.utils.shared_clients import get_shared_client_stats
+from src.voice_based_aws_agent.utils.metrics import ACTIVE_CONNECTIONS, CONNECTIONS_TOTAL, start_metrics_server
+from src.voice_based_aws_agent.utils.tracing import configure_tracing
+from ..startup_profile import startup_profiler, warm_deferred_imports
 
 # Configure logging - reduce WebSocket verbosity while keeping agent logs
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -38,15 +61,95 @@ tool_logger.setLevel(logging.INFO)
 # Suppress warnings
 warnings.filterwarnings("ignore")
 
-async def websocket_handler(websocket, path, config):
+# Connection statistics for this server process
+server_stats = {
+    "active_connections": 0,
+    "total_connections": 0,
+}
+
+ACTIVE_CONNECTIONS.set_function(lambda: server_stats["active_connections"])
+
+
+def get_server_stats(stream_pool=None, admission=None, session_registry=None):
+    """
+    Get statistics for this server process.
+
+    Args:
+        stream_pool: Optional BedrockStreamPool to include pool stats from
+        admission: Optional AdmissionController to include occupancy from
+        session_registry: Optional SessionRegistry to include parked sessions from
+
+    Returns:
+        Dictionary with connection counts and, if available, pool,
+        admission and resumption stats
+    """
+    stats = dict(server_stats)
+    if stream_pool:
+        pool_stats = stream_pool.stats()
+        stats["pool_hits"] = pool_stats["hits"]
+        stats["pool_misses"] = pool_stats["misses"]
+        stats["pool_idle"] = pool_stats["idle"]
+    if admission:
+        admission_stats = admission.stats()
+        stats["active_sessions"] = admission_stats["active_sessions"]
+        stats["admission_queue_depth"] = admission_stats["queue_depth"]
+        stats["admission_rejected"] = sum(admission_stats["rejected"].values())
+    if session_registry:
+        registry_stats = session_registry.stats()
+        stats["parked_sessions"] = registry_stats["parked"]
+        stats["resumed_sessions"] = registry_stats["resumed"]
+    shared_stats = get_shared_client_stats()
+    stats["shared_bedrock_models"] = shared_stats["bedrock_models"]
+    stats["shared_bedrock_model_reuses"] = shared_stats["bedrock_model_reuses"]
+    return stats
+
+async def websocket_handler(websocket, path, config, stream_pool=None, admission=None, session_registry=None):
     """Handle WebSocket connections - simplified version"""
     stream_manager = None
     forward_task = None
+    admitted = False
+    resume_token = None
+    client_ip = websocket.remote_address[0] if websocket.remote_address else "unknown"
+    # The batched output protocol also uses binary audio input frames
+    binary_audio = websocket.subprotocol in (BINARY_AUDIO_SUBPROTOCOL, BATCHED_OUTPUT_SUBPROTOCOL)
     
-    logger.info(f"New WebSocket connection from {websocket.remote_address}")
+    logger.info(f"New WebSocket connection from {websocket.remote_address} (binary audio: {binary_audio})")
+    server_stats["active_connections"] += 1
+    server_stats["total_connections"] += 1
+    CONNECTIONS_TOTAL.inc()
     
     try:
+        # Reattach to a parked session if the client presents a resume token
+        requested_token = parse_qs(urlparse(path or "").query).get("resume", [None])[0]
+        if requested_token and session_registry:
+            parked = session_registry.reattach(requested_token)
+            if parked:
+                stream_manager = parked.stream_manager
+                admitted = parked.admitted
+                client_ip = parked.client_ip
+                resume_token = requested_token
+                await websocket.send(json.dumps(resumed_event()))
+                forward_task = asyncio.create_task(forward_responses(websocket, stream_manager, config))
+            else:
+                await websocket.send(json.dumps(resume_failed_event()))
+
         async for message in websocket:
+            # Binary frames carry raw PCM audio input when negotiated
+            if isinstance(message, bytes):
+                if not binary_audio:
+                    logger.warning("Received binary frame without negotiating binary audio framing")
+                    continue
+                if stream_manager is None:
+                    logger.warning("Received binary audio frame but stream_manager is None")
+                    continue
+                try:
+                    prompt_name, content_name, pcm = decode_audio_frame(message)
+                except AudioFrameError as e:
+                    logger.error(f"Invalid binary audio frame: {e}")
+                    continue
+                await stream_manager.add_pcm_chunk(prompt_name, content_name, pcm)
+                continue
+
             logger.debug(f"Received WebSocket message: {message[:100]}...")  # Log first 100 chars at debug level
             try:
                 data = json.loads(message)
@@ -59,6 +162,16 @@ async def websocket_handler(websocket, path, config):
                     event_type = list(data['event'].keys())[0]
                     logger.debug(f"Event type received: {event_type}")
                     
+                    # Wait for a session slot before opening a Bedrock stream
+                    if admission and not admitted:
+                        try:
+                            await admission.acquire(client_ip)
+                            admitted = True
+                        except AdmissionRejected as e:
+                            await websocket.send(json.dumps(rejection_event(e.reason)))
+                            await websocket.close(code=1013, reason="Session rejected")
+                            break
+
                     # Initialize stream manager only once per WebSocket connection
                     if stream_manager is None:
                         logger.info("Initializing simple stream manager")
@@ -71,12 +184,21 @@ async def websocket_handler(websocket, path, config):
                             
                             # Initialize the Bedrock stream
                             logger.info("Initializing Bedrock stream...")
-                            await stream_manager.initialize_stream()
+                            await stream_manager.initialize_stream(stream_pool=stream_pool)
                             logger.info("Bedrock stream initialized successfully")
+                            if stream_pool:
+                                logger.info(f"Stream pool stats: {stream_pool.stats()}")
+                            if admission:
+                                logger.info(f"Admission stats: {admission.stats()}")
                             
+                            # Let the client reattach to this session if the connection drops
+                            if session_registry:
+                                resume_token = new_resume_token()
+                                await websocket.send(json.dumps(resumable_event(resume_token, session_registry.grace_period)))
+
                             # Start a task to forward responses from Bedrock to the WebSocket
                             logger.debug("Starting response forwarding task...")
-                            forward_task = asyncio.create_task(forward_responses(websocket, stream_manager))
+                            forward_task = asyncio.create_task(forward_responses(websocket, stream_manager, config))
                             logger.info("Stream manager fully initialized")
                         except Exception as e:
                             logger.error(f"Failed to initialize stream manager: {e}")
@@ -105,7 +227,7 @@ async def websocket_handler(websocket, path, config):
                             
                             logger.debug(f"Audio data: prompt={prompt_name}, content={content_name}, data_length={len(audio_base64) if audio_base64 else 0}")
                             # Add to the audio queue
-                            stream_manager.add_audio_chunk(prompt_name, content_name, audio_base64)
+                            await stream_manager.add_audio_chunk(prompt_name, content_name, audio_base64)
                         else:
                             logger.warning("Received audioInput but stream_manager is None")
                     else:
@@ -131,23 +253,62 @@ async def websocket_handler(websocket, path, config):
     finally:
         # Clean up
         logger.info("Cleaning up WebSocket connection")
-        if stream_manager:
-            stream_manager.close()
         if forward_task and not forward_task.done():
             forward_task.cancel()
+
+        # Park a still-active session so a reconnect can resume it
+        parked = False
+        if stream_manager and stream_manager.is_active and resume_token and session_registry:
+            parked = session_registry.park(resume_token, ParkedSession(
+                stream_manager=stream_manager,
+                client_ip=client_ip,
+                admitted=admitted,
+                on_expire=lambda session: admission.release(session.client_ip) if session.admitted else None
+            ))
+
+        if not parked:
+            if stream_manager:
+                stream_manager.close()
+            if admitted:
+                admission.release(client_ip)
+        server_stats["active_connections"] -= 1
         logger.info("WebSocket connection cleanup complete")
 
-async def forward_responses(websocket, stream_manager):
+async def forward_responses(websocket, stream_manager, config=None):
     """Forward responses from Bedrock to the WebSocket - simplified version"""
+    output_config = getattr(config, "output_forwarding", None)
+    batched = (
+        output_config is not None
+        and output_config.batching
+        and websocket.subprotocol == BATCHED_OUTPUT_SUBPROTOCOL
+    )
+    # Items taken from the queue but not sent yet. They go back to the front of
+    # the queue if forwarding stops, so a resumed session doesn't lose them
+    unsent = ()
     try:
         while stream_manager.is_active:
             # Get next response from the output queue
             response = await stream_manager.output_queue.get()
+            unsent = (response,)
             
             # Send to WebSocket
             try:
-                event = json.dumps(response)
+                if batched:
+                    # Send everything that is ready as one frame
+                    batch = await drain_output_batch(
+                        stream_manager.output_queue,
+                        response,
+                        max_events=output_config.batch_max_events,
+                        max_delay_ms=output_config.batch_max_delay_ms
+                    )
+                    unsent = batch
+                    event = serialize_output_batch(batch)
+                else:
+                    batch = (response,)
+                    event = serialize_output_event(response)
                 await websocket.send(event)
+                unsent = ()
+                stream_manager.on_output_forwarded(batch)
             except websockets.exceptions.ConnectionClosed:
                 logger.info("WebSocket connection closed during response forwarding")
                 break
@@ -160,40 +321,123 @@ async def forward_responses(websocket, stream_manager):
     except Exception as e:
         logger.error(f"Error forwarding responses: {e}")
     finally:
+        if unsent:
+            stream_manager.output_queue.requeue(unsent)
         logger.info("Response forwarding stopped")
 
-async def main(host, port, config):
+async def report_stats(stats_reporter, stats_interval, stream_pool=None, admission=None, session_registry=None):
+    """Periodically pass this process's stats to a reporter callback."""
+    while True:
+        await asyncio.sleep(stats_interval)
+        try:
+            stats_reporter(get_server_stats(stream_pool, admission, session_registry))
+        except Exception as e:
+            logger.error(f"Error reporting server stats: {e}")
+
+async def main(host, port, config, reuse_port=False, stats_reporter=None, stats_interval=10.0):
     """Main function to run the WebSocket server"""
+    stream_pool = None
+    stats_task = None
+    warm_task = None
+    metrics_server = None
+    admission = AdmissionController.from_config(config.admission)
+    session_registry = SessionRegistry.from_config(config.session_resume) if config.session_resume.enabled else None
     try:
+        configure_tracing(config.tracing)
+
+        # Before anything opens a stream, so the pool pre-warms fake streams too
+        if config.fake_sonic.enabled:
+            from .fake_sonic import FakeNovaSonicClient
+            logger.warning("Using the local Nova Sonic fake, no Bedrock calls will be made")
+            set_runtime_client_factory(lambda region: FakeNovaSonicClient(config.fake_sonic))
+
+        # Pre-warm Nova Sonic streams so new connections only need a checkout
+        if config.stream_pool.enabled and config.stream_pool.min_size > 0:
+            stream_pool = BedrockStreamPool.from_config(
+                config.stream_pool,
+                model_id='amazon.nova-sonic-v1:0',
+                region='us-east-1'
+            )
+            with startup_profiler.phase("stream pool start"):
+                await stream_pool.start()
+
+        # Serve metrics next to the WebSocket server
+        if config.metrics.enabled:
+            metrics_server = await start_metrics_server(host, config.metrics.port)
+
         # Start WebSocket server
+        bind_started = time.perf_counter()
         async with websockets.serve(
-            lambda ws, path: websocket_handler(ws, path, config),
+            lambda ws, path: websocket_handler(ws, path, config, stream_pool, admission, session_registry),
             host,
-            port
+            port,
+            subprotocols=[BATCHED_OUTPUT_SUBPROTOCOL, BINARY_AUDIO_SUBPROTOCOL],
+            reuse_port=reuse_port
         ):
             logger.info(f"Simple WebSocket server started at {host}:{port}")
+            startup_profiler.record("websocket bind", time.perf_counter() - bind_started)
+            startup_profiler.mark_ready()
+
+            # Load the SDK and agent modules now that connections are accepted
+            warm_task = asyncio.create_task(
+                asyncio.to_thread(warm_deferred_imports, startup_profiler)
+            )
+            if stats_reporter:
+                stats_task = asyncio.create_task(
+                    report_stats(stats_reporter, stats_interval, stream_pool, admission, session_registry)
+                )
             
             # Keep the server running forever
             await asyncio.Future()
     except Exception as e:
         logger.error(f"Failed to start WebSocket server: {e}")
+    finally:
+        if stats_task:
+            stats_task.cancel()
+        if warm_task:
+            warm_task.cancel()
+        if metrics_server:
+            metrics_server.close()
+        if session_registry:
+            session_registry.close_all()
+        if stream_pool:
+            await stream_pool.stop()
 
-async def run_server(profile_name=None, region=None, host="localhost", port=80):
+async def run_server(profile_name=None, region=None, host="localhost", port=80, stream_pool_config=None,
+                     admission_config=None, metrics_config=None, tracing_config=None, fake_sonic_config=None,
+                     tool_execution_config=None, session_resume_config=None, reuse_port=False, stats_reporter=None, stats_interval=10.0):
     """Run the simple WebSocket server"""
     # Create agent configuration
     config = AgentConfig(
         profile_name=profile_name,
         region=region or "us-east-1"
     )
+    if stream_pool_config is not None:
+        config.stream_pool = stream_pool_config
+    if admission_config is not None:
+        config.admission = admission_config
+    if metrics_config is not None:
+        config.metrics = metrics_config
+    if tracing_config is not None:
+        config.tracing = tracing_config
+    if fake_sonic_config is not None:
+        config.fake_sonic = fake_sonic_config
+    if tool_execution_config is not None:
+        config.tool_execution = tool_execution_config
+    if session_resume_config is not None:
+        config.session_resume = session_resume_config
     
     # Ensure AWS credentials are available
-    session = get_aws_session(config.profile_name)
-    if not session:
-        logger.error("Failed to get AWS session. Check your credentials.")
-        return
+    if not config.fake_sonic.enabled:
+        with startup_profiler.phase("AWS credential check"):
+            session = get_aws_session(config.profile_name)
+        if not session:
+            logger.error("Failed to get AWS session. Check your credentials.")
+            return
     
     try:
-        await main(host, port, config)
+        await main(host, port, config, reuse_port=reuse_port,
+                   stats_reporter=stats_reporter, stats_interval=stats_interval)
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
     except Exception as e:
@@ -0,0 +1,155 @@
+"""
+Resumable voice sessions.
+
+When a browser's WebSocket drops, its S2sSessionManager (Bedrock stream,
+agents, queues and conversation state) is parked here for a grace period
+instead of being closed. A reconnect that presents the session's resume
+token reattaches to it, which costs a lookup instead of a full bootstrap.
+
+Parked sessions live in the memory of one server process. A reconnect in
+multi-worker mode would usually land on another worker, so ``run_workers``
+turns session resume off.
+"""
+
+import asyncio
+import logging
+import secrets
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger("SessionRegistry")
+
+
+def new_resume_token():
+    """Create an unguessable session resume token."""
+    return secrets.token_urlsafe(32)
+
+
+def resumable_event(token, grace_period):
+    """Create the event telling the frontend how to resume this session."""
+    return {"event": {"sessionResumable": {"token": token, "gracePeriodSeconds": grace_period}}}
+
+
+def resumed_event():
+    """Create the event confirming a session was reattached."""
+    return {"event": {"sessionResumed": {}}}
+
+
+def resume_failed_event():
+    """Create the event telling the frontend to start a fresh session."""
+    return {"event": {"sessionResumeFailed": {"message": "Previous session expired. Starting a new session."}}}
+
+
+@dataclass
+class ParkedSession:
+    """A detached session waiting to be reattached."""
+
+    stream_manager: Any
+    client_ip: str
+    admitted: bool
+    on_expire: Optional[Callable[["ParkedSession"], None]] = None
+    parked_at: float = field(default_factory=time.monotonic)
+    expiry_task: Optional[asyncio.Task] = None
+
+
+class SessionRegistry:
+    """Keeps detached sessions alive for a grace period."""
+
+    def __init__(self, grace_period=30.0, max_parked=100):
+        """
+        Initialize the registry.
+
+        Args:
+            grace_period: Seconds a detached session is kept before closing
+            max_parked: Maximum number of detached sessions kept at once
+        """
+        self.grace_period = grace_period
+        self.max_parked = max_parked
+        self._parked = {}
+
+        # Statistics
+        self.parked_total = 0
+        self.resumed = 0
+        self.expired = 0
+        self.resume_misses = 0
+
+    @classmethod
+    def from_config(cls, resume_config):
+        """Create a registry from a SessionResumeConfig."""
+        return cls(grace_period=resume_config.grace_period, max_parked=resume_config.max_parked)
+
+    def park(self, token, parked):
+        """
+        Park a detached session under its resume token.
+
+        Returns:
+            bool: False if the registry is full and the session was not parked
+        """
+        if len(self._parked) >= self.max_parked:
+            logger.warning("Session registry full, not parking session")
+            return False
+
+        parked.expiry_task = asyncio.create_task(self._expire_after(token, self.grace_period))
+        self._parked[token] = parked
+        self.parked_total += 1
+        logger.info(f"Parked session for {parked.client_ip} ({len(self._parked)} parked)")
+        return True
+
+    def reattach(self, token):
+        """
+        Take a parked session out of the registry.
+
+        Returns:
+            ParkedSession or None if the token is unknown or expired
+        """
+        parked = self._parked.pop(token, None)
+        if parked is None or not parked.stream_manager.is_active:
+            self.resume_misses += 1
+            if parked is not None:
+                self._expire(parked)
+            return None
+
+        if parked.expiry_task and not parked.expiry_task.done():
+            parked.expiry_task.cancel()
+        self.resumed += 1
+        logger.info(f"Resumed session for {parked.client_ip} after {time.monotonic() - parked.parked_at:.1f}s")
+        return parked
+
+    def close_all(self):
+        """Close every parked session."""
+        for token in list(self._parked):
+            parked = self._parked.pop(token)
+            if parked.expiry_task and not parked.expiry_task.done():
+                parked.expiry_task.cancel()
+            self._expire(parked)
+
+    def stats(self):
+        """
+        Get registry statistics.
+
+        Returns:
+            Dictionary with parked, resumed and expired session counts
+        """
+        return {
+            "parked": len(self._parked),
+            "parked_total": self.parked_total,
+            "resumed": self.resumed,
+            "expired": self.expired,
+            "resume_misses": self.resume_misses,
+        }
+
+    async def _expire_after(self, token, delay):
+        await asyncio.sleep(delay)
+        parked = self._parked.pop(token, None)
+        if parked is not None:
+            logger.info(f"Parked session for {parked.client_ip} expired")
+            self._expire(parked)
+
+    def _expire(self, parked):
+        self.expired += 1
+        try:
+            parked.stream_manager.close()
+        finally:
+            if parked.on_expire:
+                parked.on_expire(parked)
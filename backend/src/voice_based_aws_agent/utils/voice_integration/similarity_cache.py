@@ -0,0 +1,292 @@
+"""
+Near-duplicate query cache for supervisorAgent results.
+
+Nova Sonic passes on the user's own wording, so the same question arrives as
+"how many beach pics do I have" one time and "how many pictures of the beach
+do I have" the next, and the exact-match ``ResultCache`` misses.
+``SimilarityCache`` keeps a TF-IDF vector per recently answered query in one
+NumPy matrix. A lookup vectorizes the new query and scores it against every
+cached query with a single matrix-vector product. The best match is reused
+if its cosine similarity reaches the threshold and it resolves to the same
+MCP tool.
+
+Queries are reduced to content words first: fillers and stop words are
+dropped, plurals folded and synonyms ("pics", "pictures", "images")
+mapped to one term. Words are hashed into a fixed number of columns, so the
+matrix never grows. A row's IDF weights are those of the cache when the row
+was stored; rows are short-lived, so they are not reweighted later.
+
+Only read-only requests whose text alone determines the answer are cached:
+queries resolving to a tool listed in ``SimilarityCacheConfig.tools`` and,
+if ``cache_questions`` is set, questions that resolve to no tool. Questions
+that refer back to the conversation ("where was that?", "what about that
+one?") or have too few content words are never cached, because another
+session's answer to them would be wrong. Entries expire after a TTL and the
+least recently used are evicted.
+
+Like the result cache, one similarity cache is shared by every session in
+the process, and it is only used from the server's event loop. A session
+served an answer another session computed never ran its own agent, so
+``SupervisorAgentIntegration`` adds the exchange to that agent's history
+to keep follow-up questions in context.
+"""
+
+import logging
+import math
+import re
+import time
+import zlib
+from collections import Counter, OrderedDict
+
+import numpy as np
+
+from src.voice_based_aws_agent.utils.metrics import (
+    SIMILARITY_CACHE_ENTRIES,
+    SIMILARITY_CACHE_REQUESTS,
+    SIMILARITY_CACHE_SCORES,
+)
+from src.voice_based_aws_agent.utils.query_text import normalize_query
+from .result_cache import classify_tool
+
+logger = logging.getLogger("SimilarityCache")
+
+_STOP_WORDS = frozenset({
+    "a", "an", "the", "my", "me", "our", "us", "i", "we", "you", "your", "it", "its", "this", "that",
+    "these", "those", "of", "to", "for", "in", "on", "at", "with", "from", "about", "and", "or",
+    "is", "are", "was", "were", "be", "been", "am", "do", "does", "did", "have", "has", "had", "got",
+    "can", "could", "would", "will", "should", "some", "all", "any", "there", "up",
+    "show", "tell", "give", "list", "get", "see", "let", "want", "like", "need", "know",
+})
+_SYNONYMS = {
+    **dict.fromkeys(
+        ("pic", "picture", "photo", "image", "photograph", "snap", "snapshot", "shot"), "photo"
+    ),
+    **dict.fromkeys(("tag", "label", "category", "categorie"), "tag"),
+    **dict.fromkeys(("kid", "child", "children"), "kid"),
+    "which": "what",
+    "vacation": "holiday",
+}
+# Words that refer back to the conversation, so the query alone doesn't determine the answer
+_DEICTIC_WORDS = frozenset({
+    "that", "this", "it", "its", "there", "then", "them", "they", "those", "these",
+    "one", "ones", "he", "him", "his", "she", "her", "same", "else", "other", "again",
+})
+# Queries that resolve to no MCP tool are only cached when they are questions
+_QUESTION = re.compile(
+    r"(?:who|whom|whose|what|when|where|which|why|how|did|do|does|was|were|is|are|have|has)\b"
+)
+
+
+def query_terms(normalized_query):
+    """Content words of a normalized query, with plurals folded and synonyms merged."""
+    terms = []
+    for word in normalized_query.split():
+        if word in _STOP_WORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        terms.append(_SYNONYMS.get(word, word))
+    return terms
+
+
+class SimilarityCache:
+    """LRU and TTL bounded cache that reuses results of near-duplicate queries."""
+
+    def __init__(self, threshold=0.85, max_entries=512, ttl=60.0, dimensions=1024,
+                 tools=("photo_service.get_tags",), cache_questions=False, min_question_terms=3):
+        """
+        Initialize the cache.
+
+        Args:
+            threshold: Minimum cosine similarity to reuse a cached result
+            max_entries: Maximum cached queries, least recently used are evicted
+            ttl: Seconds a result stays fresh
+            dimensions: Hashed TF-IDF columns per query
+            tools: MCP tools whose queries are read-only and may be cached
+            cache_questions: Also cache questions that resolve to no MCP tool
+            min_question_terms: Content words such a question needs to be cached
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.dimensions = dimensions
+        self.tools = frozenset(tools)
+        self.cache_questions = cache_questions
+        self.min_question_terms = min_question_terms
+
+        # One L2-normalized TF-IDF row per slot, unused slots are all zeros
+        self._matrix = np.zeros((max_entries, dimensions), dtype=np.float32)
+        self._entries = [None] * max_entries  # slot -> (query, tool, result, expires_at, columns)
+        self._lru = OrderedDict()  # Occupied slots, least recently used first
+        self._free = list(range(max_entries - 1, -1, -1))
+        self._rows = 0  # Slots below this may be occupied, the product skips the rest
+
+        # Document frequency of each column over the cached queries
+        self._document_frequency = np.zeros(dimensions, dtype=np.int32)
+
+        # Statistics
+        self.requests = Counter()
+        self.evictions = 0
+        self.expirations = 0
+
+    @classmethod
+    def from_config(cls, cache_config):
+        """Create a cache from a SimilarityCacheConfig."""
+        return cls(
+            threshold=cache_config.threshold,
+            max_entries=cache_config.max_entries,
+            ttl=cache_config.ttl,
+            dimensions=cache_config.dimensions,
+            tools=cache_config.tools,
+            cache_questions=cache_config.cache_questions,
+            min_question_terms=cache_config.min_question_terms,
+        )
+
+    def _count(self, result):
+        self.requests[result] += 1
+        SIMILARITY_CACHE_REQUESTS.inc(result=result)
+
+    def _cacheable(self, normalized, tool, terms):
+        if tool is not None:
+            return tool in self.tools
+        if not self.cache_questions or _QUESTION.match(normalized) is None:
+            return False
+        # "Where was that?" depends on the conversation, not just the words
+        if any(word in _DEICTIC_WORDS for word in normalized.split()):
+            return False
+        return len(terms) >= self.min_question_terms
+
+    def _columns(self, terms):
+        """Term counts by hashed column."""
+        return Counter(zlib.crc32(term.encode("utf-8")) % self.dimensions for term in terms)
+
+    def _vector(self, columns):
+        """L2-normalized TF-IDF vector with smoothed IDF over the cached queries."""
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        documents = len(self._lru)
+        for column, count in columns.items():
+            idf = math.log((1 + documents) / (1 + self._document_frequency[column])) + 1
+            vector[column] = count * idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    async def get_or_compute(self, query, compute):
+        """
+        Get the result of a cached near-duplicate of ``query``, or compute it.
+
+        Args:
+            query: The user's query
+            compute: Coroutine function returning a tuple of the result and
+                whether it succeeded. Failed results are not stored
+
+        Returns:
+            Tuple of the cached or computed result and whether it succeeded
+        """
+        normalized = normalize_query(query)
+        tool = classify_tool(normalized)
+        terms = query_terms(normalized)
+        if not terms or not self._cacheable(normalized, tool, terms):
+            self._count("bypass")
+            return await compute()
+
+        columns = self._columns(terms)
+        vector = self._vector(columns)
+        cached = self._lookup(vector, tool, query)
+        if cached is not None:
+            return cached, True
+
+        result, ok = await compute()
+        if ok:
+            self._store(query, tool, result, columns)
+        return result, ok
+
+    def _lookup(self, vector, tool, query):
+        if not self._lru:
+            self._count("miss")
+            return None
+
+        scores = self._matrix[:self._rows] @ vector
+        slot = int(np.argmax(scores))
+        score = float(scores[slot])
+        SIMILARITY_CACHE_SCORES.observe(score)
+        entry = self._entries[slot]
+        if entry is None or score < self.threshold or entry[1] != tool:
+            self._count("miss")
+            return None
+        if entry[3] <= time.monotonic():
+            self._remove(slot)
+            self.expirations += 1
+            self._count("miss")
+            return None
+
+        self._lru.move_to_end(slot)
+        self._count("hit")
+        logger.info(f"Reusing the result for {entry[0]!r} for {query!r} (similarity {score:.2f})")
+        return entry[2]
+
+    def _store(self, query, tool, result, columns):
+        if not self._free:
+            self._remove(next(iter(self._lru)))
+            self.evictions += 1
+        slot = self._free.pop()
+        self._rows = max(self._rows, slot + 1)
+
+        for column in columns:
+            self._document_frequency[column] += 1
+        self._lru[slot] = None
+        self._matrix[slot] = self._vector(columns)
+        self._entries[slot] = (query, tool, result, time.monotonic() + self.ttl, tuple(columns))
+
+    def _remove(self, slot):
+        entry = self._entries[slot]
+        for column in entry[4]:
+            self._document_frequency[column] -= 1
+        self._matrix[slot] = 0.0
+        self._entries[slot] = None
+        del self._lru[slot]
+        self._free.append(slot)
+
+    def clear(self):
+        """Drop every cached result."""
+        for slot in list(self._lru):
+            self._remove(slot)
+
+    def __len__(self):
+        return len(self._lru)
+
+    def stats(self):
+        """
+        Get hit/miss statistics.
+
+        Returns:
+            Dictionary with request counts by result, hit rate and size
+        """
+        lookups = self.requests["hit"] + self.requests["miss"]
+        return {
+            **{result: self.requests[result] for result in ("hit", "miss", "bypass")},
+            "hit_rate": round(self.requests["hit"] / lookups, 3) if lookups else 0.0,
+            "entries": len(self._lru),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+_shared_cache = None
+
+
+def get_similarity_cache(cache_config):
+    """
+    Get the process-wide similarity cache.
+
+    Returns:
+        SimilarityCache, or None if it is disabled
+    """
+    global _shared_cache
+    if not cache_config.enabled:
+        return None
+    if _shared_cache is None:
+        _shared_cache = SimilarityCache.from_config(cache_config)
+        SIMILARITY_CACHE_ENTRIES.set_function(lambda: len(_shared_cache))
+        logger.info(f"supervisorAgent similarity cache enabled (threshold {_shared_cache.threshold}, "
+                    f"max {_shared_cache.max_entries} entries)")
+    return _shared_cache
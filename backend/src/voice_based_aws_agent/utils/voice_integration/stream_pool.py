@@ -0,0 +1,232 @@
+"""
+Pre-warmed pool of Nova Sonic bidirectional streams.
+
+Opening a bidirectional stream can take several seconds, so the pool keeps a
+number of initialized streams ready and hands them out to new WebSocket
+connections. A background task tops the pool up and recycles streams that
+have been idle for too long.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from .s2s_session_manager import get_shared_bedrock_runtime_client, open_bidirectional_stream
+
+logger = logging.getLogger("BedrockStreamPool")
+
+# Number of recent checkout latencies kept for percentile reporting
+LATENCY_SAMPLE_SIZE = 512
+
+
+@dataclass
+class PooledStream:
+    """A bidirectional stream together with the client that opened it."""
+
+    client: Any
+    stream: Any
+    created_at: float
+
+
+class BedrockStreamPool:
+    """
+    Keeps initialized Nova Sonic streams ready for checkout.
+
+    The pool holds at least ``min_size`` idle streams. Every checkout that
+    finds the pool empty (a miss) raises the target size by one, up to
+    ``max_size``; every stream that expires unused lowers it again.
+    """
+
+    def __init__(self, model_id='amazon.nova-sonic-v1:0', region='us-east-1',
+                 min_size=2, max_size=8, idle_timeout=30.0, refill_interval=1.0,
+                 open_timeout=30.0):
+        """Initialize the pool. Call ``start()`` to begin pre-warming."""
+        self.model_id = model_id
+        self.region = region
+        self.min_size = max(0, min_size)
+        self.max_size = max(self.min_size, max_size)
+        self.idle_timeout = idle_timeout
+        self.refill_interval = refill_interval
+        self.open_timeout = open_timeout
+
+        self._client = None
+        self._idle = deque()
+        self._opening = 0
+        self._target = self.min_size
+        self._refill_task = None
+        self._tasks = set()  # Background stream opens and closes, kept referenced until done
+        self._wakeup = asyncio.Event()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.open_failures = 0
+        self._checkout_latencies = deque(maxlen=LATENCY_SAMPLE_SIZE)
+
+    @classmethod
+    def from_config(cls, pool_config, model_id='amazon.nova-sonic-v1:0', region='us-east-1'):
+        """Create a pool from a StreamPoolConfig."""
+        return cls(
+            model_id=model_id,
+            region=region,
+            min_size=pool_config.min_size,
+            max_size=pool_config.max_size,
+            idle_timeout=pool_config.idle_timeout,
+            refill_interval=pool_config.refill_interval,
+            open_timeout=pool_config.open_timeout,
+        )
+
+    async def start(self):
+        """Start the background refill task."""
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.create_task(self._refill_loop())
+            logger.info(f"Stream pool started (min={self.min_size}, max={self.max_size})")
+
+    async def stop(self):
+        """Stop refilling, cancel background stream opens and closes, and close all idle streams."""
+        if self._refill_task and not self._refill_task.done():
+            self._refill_task.cancel()
+            try:
+                await self._refill_task
+            except asyncio.CancelledError:
+                pass
+        self._refill_task = None
+
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        while self._idle:
+            await self._close(self._idle.popleft())
+        logger.info(f"Stream pool stopped: {self.stats()}")
+
+    async def checkout(self):
+        """
+        Take a ready stream out of the pool, opening one if none is available.
+
+        Returns:
+            PooledStream: The stream and the client that owns it
+        """
+        start_time = time.perf_counter()
+        now = time.monotonic()
+
+        pooled = None
+        while self._idle:
+            candidate = self._idle.popleft()
+            if now - candidate.created_at < self.idle_timeout:
+                pooled = candidate
+                break
+            self.expired += 1
+            self._spawn(self._close(candidate))
+
+        if pooled is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            self._target = min(self._target + 1, self.max_size)
+            pooled = await self._open()
+
+        self._checkout_latencies.append(time.perf_counter() - start_time)
+        # Replace what was just taken
+        self._wakeup.set()
+        return pooled
+
+    def stats(self):
+        """
+        Get pool statistics.
+
+        Returns:
+            Dictionary with pool size, hit/miss counts and checkout latency
+        """
+        latencies = sorted(self._checkout_latencies)
+        total = self.hits + self.misses
+
+        def percentile(fraction):
+            if not latencies:
+                return 0.0
+            index = min(len(latencies) - 1, int(fraction * len(latencies)))
+            return round(latencies[index] * 1000, 2)
+
+        return {
+            "idle": len(self._idle),
+            "opening": self._opening,
+            "target_size": self._target,
+            "min_size": self.min_size,
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "expired": self.expired,
+            "open_failures": self.open_failures,
+            "checkout_latency_ms": {
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+            },
+        }
+
+    def _spawn(self, coroutine):
+        """Run a background task, keeping a reference so it isn't garbage collected."""
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _open(self):
+        """Open a new stream on the process-wide client."""
+        if self._client is None:
+            self._client = get_shared_bedrock_runtime_client(self.region)
+        stream = await open_bidirectional_stream(self._client, self.model_id, timeout=self.open_timeout)
+        return PooledStream(client=self._client, stream=stream, created_at=time.monotonic())
+
+    async def _close(self, pooled):
+        """Close an unused stream, ignoring errors."""
+        try:
+            await pooled.stream.input_stream.close()
+        except Exception as e:
+            logger.debug(f"Error closing pooled stream: {e}")
+
+    def _expire_idle(self):
+        """Recycle streams that have been idle longer than the timeout."""
+        now = time.monotonic()
+        while self._idle and now - self._idle[0].created_at >= self.idle_timeout:
+            self.expired += 1
+            self._target = max(self._target - 1, self.min_size)
+            self._spawn(self._close(self._idle.popleft()))
+
+    async def _fill_one(self):
+        """Open one stream and add it to the idle set."""
+        try:
+            pooled = await self._open()
+            self._idle.append(pooled)
+        except Exception as e:
+            self.open_failures += 1
+            logger.warning(f"Failed to pre-warm Nova Sonic stream: {e}")
+        finally:
+            self._opening -= 1
+
+    async def _refill_loop(self):
+        """Keep the pool topped up to its target size."""
+        try:
+            while True:
+                self._expire_idle()
+
+                missing = self._target - len(self._idle) - self._opening
+                for _ in range(max(0, missing)):
+                    self._opening += 1
+                    self._spawn(self._fill_one())
+
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.refill_interval)
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            logger.debug("Stream pool refill task cancelled")
+            raise
@@ -2,16 +2,23 @@
 Integration for the AWS Strands Supervisor Agent.
 """
 
+import asyncio
 import json
 import logging
 import sys
 import os
+import time
 from pathlib import Path
 
 # Add the project root to Python path
 project_root = Path(__file__).parent.parent.parent.parent.parent
 sys.path.insert(0, str(project_root))
 
+from src.voice_based_aws_agent.config.config import ResultCacheConfig, SimilarityCacheConfig
+from src.voice_based_aws_agent.utils.metrics import SUPERVISOR_SECONDS
+from .result_cache import get_result_cache
+from .similarity_cache import get_similarity_cache
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -25,21 +32,32 @@ class SupervisorAgentIntegration:
     """
 
     def __init__(self, config=None):
-        """Initialize the integration with AWS Strands orchestrator."""
+        """Initialize the integration.
+
+        The orchestrator and its agents are built on the first query, so
+        opening a voice session doesn't import Strands or create agents.
+        """
         self.config = config
         self.orchestrator = None
-
+        self._orchestrator_failed = False
+        self._orchestrator_lock = asyncio.Lock()
+        self.result_cache = get_result_cache(getattr(config, "result_cache", None) or ResultCacheConfig())
+        self.similarity_cache = get_similarity_cache(
+            getattr(config, "similarity_cache", None) or SimilarityCacheConfig()
+        )
+
+    def _build_orchestrator(self):
+        """Create the AWS Strands orchestrator, or None if it fails."""
         try:
             # Import and initialize the orchestrator
             from src.voice_based_aws_agent.agents.orchestrator import AgentOrchestrator
-            from src.voice_based_aws_agent.config.config import AgentConfig
             from src.voice_based_aws_agent.config.tool_config import (
                 setup_tool_environment,
             )
             from tools.supervisor_tool import set_orchestrator
-            import os
 
             # Set AWS profile if provided in config
+            config = self.config
             if config and hasattr(config, "profile_name") and config.profile_name:
                 os.environ["AWS_PROFILE"] = config.profile_name
                 logger.info(f"Set AWS_PROFILE to: {config.profile_name}")
@@ -48,17 +66,27 @@ class SupervisorAgentIntegration:
             setup_tool_environment()
 
             # Initialize the orchestrator with config
-            self.orchestrator = AgentOrchestrator(config)
+            orchestrator = AgentOrchestrator(config)
 
             # Set the orchestrator for the supervisor tool
-            set_orchestrator(self.orchestrator)
+            set_orchestrator(orchestrator)
 
             logger.info("AWS Strands orchestrator initialized successfully")
+            return orchestrator
 
         except Exception as e:
             logger.error(f"Failed to initialize AWS Strands orchestrator: {e}")
             logger.info("Falling back to placeholder mode")
-            self.orchestrator = None
+            return None
+
+    async def _get_orchestrator(self):
+        """Build the orchestrator on first use, off the event loop."""
+        if self.orchestrator is None and not self._orchestrator_failed:
+            async with self._orchestrator_lock:
+                if self.orchestrator is None and not self._orchestrator_failed:
+                    self.orchestrator = await asyncio.to_thread(self._build_orchestrator)
+                    self._orchestrator_failed = self.orchestrator is None
+        return self.orchestrator
 
     async def query(self, query_text):
         """
@@ -90,28 +118,28 @@ class SupervisorAgentIntegration:
                 actual_query = query_text.get("query", str(query_text))
 
             # If orchestrator is available, use it
-            if self.orchestrator:
+            orchestrator = await self._get_orchestrator()
+            if orchestrator:
                 try:
-                    response = await self.orchestrator.process_query(actual_query)
-                    logger.info(
-                        "Query processed successfully by AWS Strands orchestrator"
-                    )
-
-                    # Ensure response is a string and limit length for voice
-                    if hasattr(response, "content"):
-                        response_text = response.content
-                    elif isinstance(response, dict):
-                        response_text = response.get("content", str(response))
+                    computed = False
+
+                    async def compute():
+                        nonlocal computed
+                        computed = True
+                        return await self._process_with_orchestrator(orchestrator, actual_query)
+
+                    lookup = compute
+                    if self.similarity_cache is not None:
+                        # Exact repeats are served by the result cache first
+                        lookup = lambda: self.similarity_cache.get_or_compute(actual_query, compute)
+                    if self.result_cache is not None:
+                        response, _ = await self.result_cache.get_or_compute(actual_query, lookup)
                     else:
-                        response_text = str(response)
+                        response, _ = await lookup()
 
-                    # Limit response length for voice
-                    if len(response_text) > 800:
-                        response_text = (
-                            response_text[:800] + "... (truncated for voice)"
-                        )
-
-                    return response_text
+                    if not computed:
+                        await self._record_cached_exchange(orchestrator, actual_query, response)
+                    return response
 
                 except Exception as e:
                     logger.error(f"Error processing query with orchestrator: {e}")
@@ -131,6 +159,48 @@ class SupervisorAgentIntegration:
             logger.error(f"Error in supervisor agent integration: {e}")
             return f"Sorry, I encountered an error processing your request: {str(e)}"
 
+    async def _record_cached_exchange(self, orchestrator, query, response):
+        """Add a cached answer, possibly computed for another session, to this session's agent history."""
+        try:
+            await orchestrator.record_exchange(query, response)
+        except Exception as e:
+            logger.warning(f"Failed to record cached answer in the conversation history: {e}")
+
+    async def _process_with_orchestrator(self, orchestrator, query):
+        """
+        Run a query through the orchestrator and shape the response for voice.
+
+        Returns:
+            Tuple of the response text and whether an agent answered the query
+        """
+        start_time = time.perf_counter()
+        try:
+            response, ok = await orchestrator.process_query_with_status(query)
+        except Exception:
+            SUPERVISOR_SECONDS.observe(time.perf_counter() - start_time, outcome="error")
+            raise
+        SUPERVISOR_SECONDS.observe(time.perf_counter() - start_time, outcome="ok" if ok else "error")
+        if ok:
+            logger.info(
+                "Query processed successfully by AWS Strands orchestrator"
+            )
+
+        # Ensure response is a string and limit length for voice
+        if hasattr(response, "content"):
+            response_text = response.content
+        elif isinstance(response, dict):
+            response_text = response.get("content", str(response))
+        else:
+            response_text = str(response)
+
+        # Limit response length for voice
+        if len(response_text) > 800:
+            response_text = (
+                response_text[:800] + "... (truncated for voice)"
+            )
+
+        return response_text, ok
+
     def shutdown(self):
         """Shutdown the integration."""
         if self.orchestrator and hasattr(self.orchestrator, "shutdown"):
@@ -0,0 +1,216 @@
+"""
+Multi-process worker mode for the WebSocket server.
+
+The parent process forks N shared-nothing workers that each run their own
+asyncio loop and WebSocket server on the same port via SO_REUSEPORT, so the
+kernel spreads new connections across all cores. The parent restarts workers
+that exit unexpectedly and aggregates the stats they report.
+
+Session resume is turned off in this mode: parked sessions live in one
+worker's memory, and the kernel sends a reconnect to any worker.
+"""
+
+import asyncio
+import dataclasses
+import logging
+import multiprocessing
+import queue
+import signal
+import socket
+import time
+from pathlib import Path
+
+from src.voice_based_aws_agent.config.config import SessionResumeConfig
+
+logger = logging.getLogger("WorkerSupervisor")
+
+# Seconds between worker stats reports
+STATS_INTERVAL = 10.0
+# Restart backoff bounds in seconds
+MIN_RESTART_DELAY = 1.0
+MAX_RESTART_DELAY = 30.0
+# A worker that stays up this long resets its restart backoff
+STABLE_RUNTIME = 60.0
+
+
+def _raise_keyboard_interrupt(signum, frame):
+    """Turn SIGTERM into a KeyboardInterrupt so the worker shuts down cleanly."""
+    raise KeyboardInterrupt()
+
+
+def _worker_main(worker_id, server_kwargs, stats_queue):
+    """Entry point of a worker process."""
+    from .server import run_server
+
+    # The parent handles Ctrl+C and stops workers with SIGTERM
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+
+    def report(stats):
+        try:
+            stats_queue.put_nowait({"worker_id": worker_id, "time": time.time(), "stats": stats})
+        except queue.Full:
+            pass
+
+    # Each worker serves its own metrics on a separate port
+    metrics_config = server_kwargs.get("metrics_config")
+    if metrics_config is not None and metrics_config.enabled:
+        server_kwargs = dict(server_kwargs, metrics_config=dataclasses.replace(
+            metrics_config, port=metrics_config.port + worker_id
+        ))
+
+    # Rotating trace files can't be shared between processes
+    tracing_config = server_kwargs.get("tracing_config")
+    if tracing_config is not None and tracing_config.file_path:
+        path = Path(tracing_config.file_path)
+        server_kwargs = dict(server_kwargs, tracing_config=dataclasses.replace(
+            tracing_config, file_path=str(path.with_name(f"{path.stem}.worker{worker_id}{path.suffix}"))
+        ))
+
+    try:
+        asyncio.run(run_server(
+            reuse_port=True,
+            stats_reporter=report,
+            stats_interval=STATS_INTERVAL,
+            **server_kwargs
+        ))
+    except KeyboardInterrupt:
+        pass
+
+
+class WorkerSupervisor:
+    """Starts, supervises and restarts WebSocket server worker processes."""
+
+    def __init__(self, workers, server_kwargs):
+        """
+        Initialize the supervisor.
+
+        Args:
+            workers: Number of worker processes
+            server_kwargs: Keyword arguments passed to run_server in each worker
+        """
+        self.worker_count = workers
+        self.server_kwargs = server_kwargs
+        self.stats_queue = multiprocessing.Queue(maxsize=1000)
+        self.processes = {}
+        self.started_at = {}
+        self.restart_delay = {}
+        self.restarts = 0
+        self.worker_stats = {}
+        self._stopping = False
+
+    def _start_worker(self, worker_id):
+        process = multiprocessing.Process(
+            target=_worker_main,
+            args=(worker_id, self.server_kwargs, self.stats_queue),
+            name=f"voice-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        self.processes[worker_id] = process
+        self.started_at[worker_id] = time.monotonic()
+        logger.info(f"Started worker {worker_id} (pid {process.pid})")
+
+    def _collect_stats(self):
+        while True:
+            try:
+                report = self.stats_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.worker_stats[report["worker_id"]] = report
+
+    def aggregate_stats(self):
+        """
+        Aggregate the latest stats reported by each worker.
+
+        Returns:
+            Dictionary with totals across workers and the per-worker stats
+        """
+        self._collect_stats()
+        totals = {}
+        for report in self.worker_stats.values():
+            for key, value in report["stats"].items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    totals[key] = totals.get(key, 0) + value
+
+        return {
+            "workers": self.worker_count,
+            "alive": sum(1 for process in self.processes.values() if process.is_alive()),
+            "restarts": self.restarts,
+            "totals": totals,
+            "per_worker": {worker_id: report["stats"] for worker_id, report in self.worker_stats.items()},
+        }
+
+    def _supervise_once(self):
+        now = time.monotonic()
+        for worker_id, process in list(self.processes.items()):
+            if process.is_alive():
+                continue
+
+            uptime = now - self.started_at[worker_id]
+            if uptime >= STABLE_RUNTIME:
+                self.restart_delay[worker_id] = MIN_RESTART_DELAY
+            delay = self.restart_delay.get(worker_id, MIN_RESTART_DELAY)
+
+            if uptime < delay:
+                continue  # Wait out the backoff before restarting
+
+            logger.warning(f"Worker {worker_id} (pid {process.pid}) exited with code {process.exitcode}, restarting")
+            self.restart_delay[worker_id] = min(delay * 2, MAX_RESTART_DELAY)
+            self.worker_stats.pop(worker_id, None)
+            self.restarts += 1
+            self._start_worker(worker_id)
+
+    def stop(self, *_):
+        """Stop all workers."""
+        if self._stopping:
+            return
+        self._stopping = True
+        logger.info("Stopping workers...")
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes.values():
+            process.join(timeout=10)
+            if process.is_alive():
+                process.kill()
+
+    def run(self):
+        """Start the workers and supervise them until interrupted."""
+        signal.signal(signal.SIGTERM, self.stop)
+        for worker_id in range(self.worker_count):
+            self._start_worker(worker_id)
+
+        last_report = time.monotonic()
+        try:
+            while not self._stopping:
+                time.sleep(1.0)
+                self._supervise_once()
+                if time.monotonic() - last_report >= STATS_INTERVAL:
+                    logger.info(f"Worker stats: {self.aggregate_stats()}")
+                    last_report = time.monotonic()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+
+def run_workers(workers, **server_kwargs):
+    """
+    Run the WebSocket server in ``workers`` processes sharing one port.
+
+    Args:
+        workers: Number of worker processes
+        **server_kwargs: Keyword arguments for run_server
+    """
+    if not hasattr(socket, "SO_REUSEPORT"):
+        raise RuntimeError("Multi-process worker mode requires SO_REUSEPORT support")
+
+    # A reconnect would rarely reach the worker holding its parked session
+    resume_config = server_kwargs.get("session_resume_config") or SessionResumeConfig()
+    if resume_config.enabled:
+        logger.warning("Session resume is disabled in multi-worker mode; reconnecting clients start new sessions")
+        server_kwargs = dict(server_kwargs, session_resume_config=dataclasses.replace(resume_config, enabled=False))
+
+    logger.info(f"Starting {workers} worker processes on port {server_kwargs.get('port')}")
+    WorkerSupervisor(workers, server_kwargs).run()
@@ -0,0 +1,11 @@
+"""
+Shared test setup.
+
+The backend is imported as ``src.voice_based_aws_agent``, the way ``main.py``
+runs it, so the backend directory goes on the import path.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,130 @@
+import asyncio
+
+import pytest
+
+from src.voice_based_aws_agent.utils.voice_integration.admission import (
+    REJECT_CLIENT_LIMIT,
+    REJECT_QUEUE_FULL,
+    REJECT_TIMEOUT,
+    AdmissionController,
+    AdmissionRejected,
+)
+
+
+def test_admits_up_to_max_sessions():
+    async def run():
+        controller = AdmissionController(max_sessions=2, max_sessions_per_client=0)
+        await controller.acquire("a")
+        await controller.acquire("b")
+        stats = controller.stats()
+        assert stats["active_sessions"] == 2
+        assert stats["admitted"] == 2
+        assert stats["queue_depth"] == 0
+
+    asyncio.run(run())
+
+
+def test_per_client_limit_counts_waiting_sessions():
+    async def run():
+        controller = AdmissionController(max_sessions=1, max_sessions_per_client=2, queue_timeout=5)
+        await controller.acquire("a")
+        waiting = asyncio.create_task(controller.acquire("a"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("a")
+        assert rejected.value.reason == REJECT_CLIENT_LIMIT
+
+        # Other clients are not affected by the limit
+        other = asyncio.create_task(controller.acquire("b"))
+        await asyncio.sleep(0)
+        assert controller.stats()["queue_depth"] == 2
+
+        waiting.cancel()
+        other.cancel()
+        await asyncio.gather(waiting, other, return_exceptions=True)
+
+    asyncio.run(run())
+
+
+def test_release_hands_slot_to_waiters_in_fifo_order():
+    async def run():
+        controller = AdmissionController(max_sessions=1, max_sessions_per_client=0, queue_timeout=5)
+        await controller.acquire("first")
+        admitted = []
+
+        async def wait(client_id):
+            await controller.acquire(client_id)
+            admitted.append(client_id)
+
+        waiters = [asyncio.create_task(wait(client_id)) for client_id in ("second", "third")]
+        await asyncio.sleep(0)
+        assert controller.stats()["queued"] == 2
+
+        controller.release("first")
+        await asyncio.wait_for(waiters[0], timeout=1)
+        assert admitted == ["second"]
+        assert not waiters[1].done()
+        # The slot was handed over, not freed
+        assert controller.stats()["active_sessions"] == 1
+
+        controller.release("second")
+        await asyncio.wait_for(waiters[1], timeout=1)
+        assert admitted == ["second", "third"]
+
+        controller.release("third")
+        assert controller.stats()["active_sessions"] == 0
+
+    asyncio.run(run())
+
+
+def test_rejects_when_queue_is_full():
+    async def run():
+        controller = AdmissionController(max_sessions=1, max_sessions_per_client=0, max_queue=1, queue_timeout=5)
+        await controller.acquire("a")
+        waiting = asyncio.create_task(controller.acquire("b"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("c")
+        assert rejected.value.reason == REJECT_QUEUE_FULL
+        assert controller.stats()["rejected"] == {REJECT_QUEUE_FULL: 1}
+
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+
+    asyncio.run(run())
+
+
+def test_rejects_after_queue_timeout():
+    async def run():
+        controller = AdmissionController(max_sessions=1, max_sessions_per_client=1, queue_timeout=0.01)
+        await controller.acquire("a")
+
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.acquire("b")
+        assert rejected.value.reason == REJECT_TIMEOUT
+
+        stats = controller.stats()
+        assert stats["queue_depth"] == 0
+        # The timed out client holds no slot, so it can try again
+        assert stats["clients"] == 1
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_is_skipped_on_release():
+    async def run():
+        controller = AdmissionController(max_sessions=1, max_sessions_per_client=0, queue_timeout=5)
+        await controller.acquire("a")
+        cancelled = asyncio.create_task(controller.acquire("b"))
+        waiting = asyncio.create_task(controller.acquire("c"))
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        controller.release("a")
+        await asyncio.wait_for(waiting, timeout=1)
+        assert controller.stats()["active_sessions"] == 1
+
+    asyncio.run(run())
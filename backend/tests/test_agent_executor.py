@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+
+from src.voice_based_aws_agent.utils.agent_executor import AgentExecutor
+
+
+class SlowAgent:
+    """Agent that records how many of its calls run at once."""
+
+    def __init__(self, seconds=0.05):
+        self.seconds = seconds
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, query):
+        with self._lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.seconds)
+        with self._lock:
+            self.running -= 1
+        return f"answer to {query}"
+
+
+def test_runs_off_the_event_loop():
+    async def run():
+        executor = AgentExecutor(max_concurrency=2)
+        loop_thread = threading.get_ident()
+        return await executor.run("Agent", lambda query: threading.get_ident() != loop_thread, "q")
+
+    assert asyncio.run(run())
+
+
+def test_calls_to_one_instance_are_serialized():
+    async def run():
+        executor = AgentExecutor(max_concurrency=4)
+        agent = SlowAgent()
+        responses = await asyncio.gather(*(executor.run("Agent", agent, f"q{i}") for i in range(3)))
+        assert responses == ["answer to q0", "answer to q1", "answer to q2"]
+        assert agent.max_running == 1
+
+    asyncio.run(run())
+
+
+def test_saturated_pool_queues_calls():
+    async def run():
+        executor = AgentExecutor(max_concurrency=4, per_agent={"Agent": 2})
+        agents = [SlowAgent() for _ in range(4)]
+        calls = asyncio.gather(*(executor.run("Agent", agent, "q") for agent in agents))
+        await asyncio.sleep(0.02)
+
+        stats = executor.stats()["Agent"]
+        assert stats["limit"] == 2
+        assert stats["in_flight"] == 2
+        assert stats["queued"] == 2
+
+        await calls
+        stats = executor.stats()["Agent"]
+        assert (stats["in_flight"], stats["queued"], stats["completed"]) == (0, 0, 4)
+
+    asyncio.run(run())
+
+
+def test_other_agents_are_not_blocked_by_a_saturated_pool():
+    async def run():
+        executor = AgentExecutor(max_concurrency=1)
+        slow = asyncio.ensure_future(executor.run("Slow", SlowAgent(seconds=0.5), "q"))
+        await asyncio.sleep(0.01)
+        started = time.perf_counter()
+        assert await executor.run("Fast", SlowAgent(seconds=0), "q") == "answer to q"
+        assert time.perf_counter() - started < 0.4
+        await slow
+
+    asyncio.run(run())
@@ -0,0 +1,43 @@
+import pytest
+
+from src.voice_based_aws_agent.utils.voice_integration.audio_frames import (
+    FRAME_TYPE_AUDIO_INPUT,
+    AudioFrameError,
+    decode_audio_frame,
+    encode_audio_frame,
+)
+
+
+def test_round_trip():
+    pcm = bytes(range(256)) * 4
+    frame = encode_audio_frame("prompt-1", "audio-é", pcm)
+    prompt, content, audio = decode_audio_frame(frame)
+    assert (prompt, content) == ("prompt-1", "audio-é")
+    assert isinstance(audio, memoryview)
+    assert audio.tobytes() == pcm
+
+
+def test_empty_payload():
+    assert decode_audio_frame(encode_audio_frame("p", "c", b""))[2].tobytes() == b""
+
+
+def test_decodes_bytearray_and_memoryview():
+    frame = encode_audio_frame("p", "c", b"\x01\x02")
+    for buffer in (bytearray(frame), memoryview(frame)):
+        assert decode_audio_frame(buffer)[2].tobytes() == b"\x01\x02"
+
+
+def test_rejects_long_names():
+    with pytest.raises(AudioFrameError):
+        encode_audio_frame("p" * 256, "c", b"")
+
+
+@pytest.mark.parametrize("frame", [
+    b"",
+    bytes([FRAME_TYPE_AUDIO_INPUT, 0]),
+    bytes([0x02, 1, 1]) + b"pc",
+    bytes([FRAME_TYPE_AUDIO_INPUT, 5, 5]) + b"prompt",
+])
+def test_rejects_malformed_frames(frame):
+    with pytest.raises(AudioFrameError):
+        decode_audio_frame(frame)
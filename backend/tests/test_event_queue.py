@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+from src.voice_based_aws_agent.utils.voice_integration.event_queue import BoundedEventQueue
+
+
+def is_audio(item):
+    return item.startswith("audio")
+
+
+def test_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        BoundedEventQueue(maxsize=1, policy="drop_newest")
+
+
+def test_fifo_order_and_nowait_errors():
+    async def run():
+        queue = BoundedEventQueue(maxsize=2)
+        queue.put_nowait("a")
+        queue.put_nowait("b")
+        with pytest.raises(asyncio.QueueFull):
+            queue.put_nowait("c")
+        assert [queue.get_nowait(), await queue.get()] == ["a", "b"]
+        with pytest.raises(asyncio.QueueEmpty):
+            queue.get_nowait()
+
+    asyncio.run(run())
+
+
+def test_block_policy_offer_refuses_when_full():
+    async def run():
+        queue = BoundedEventQueue(maxsize=1)
+        assert queue.offer("a")
+        assert not queue.offer("b")
+        assert queue.stats()["dropped"] == 1
+        assert queue.get_nowait() == "a"
+
+    asyncio.run(run())
+
+
+def test_block_policy_push_waits_for_space():
+    async def run():
+        queue = BoundedEventQueue(maxsize=1)
+        await queue.push("a")
+        push = asyncio.create_task(queue.push("b"))
+        await asyncio.sleep(0)
+        assert not push.done()
+        assert queue.stats()["blocked_puts"] == 1
+
+        assert queue.get_nowait() == "a"
+        assert await asyncio.wait_for(push, timeout=1)
+        assert queue.get_nowait() == "b"
+
+    asyncio.run(run())
+
+
+def test_drop_oldest_evicts_head():
+    async def run():
+        queue = BoundedEventQueue(maxsize=2, policy="drop_oldest")
+        for item in ("a", "b", "c"):
+            assert await queue.push(item)
+        assert [queue.get_nowait(), queue.get_nowait()] == ["b", "c"]
+        assert queue.stats()["dropped"] == 1
+
+    asyncio.run(run())
+
+
+def test_drop_audio_evicts_oldest_audio_and_keeps_control_events():
+    async def run():
+        queue = BoundedEventQueue(maxsize=2, policy="drop_audio", is_audio=is_audio)
+        assert queue.offer("control-1")
+        assert queue.offer("audio-1")
+        # Full: the oldest audio item makes room
+        assert queue.offer("control-2")
+
+        # Full of control events: audio is refused, control is admitted over capacity
+        assert not queue.offer("audio-2")
+        assert queue.offer("control-3")
+        assert [queue.get_nowait() for _ in range(queue.qsize())] == ["control-1", "control-2", "control-3"]
+
+        stats = queue.stats()
+        assert stats["dropped"] == 2
+        assert stats["dropped_audio"] == 2
+        assert stats["high_water_mark"] == 3
+
+    asyncio.run(run())
+
+
+def test_requeue_puts_items_back_at_front_in_order():
+    async def run():
+        queue = BoundedEventQueue(maxsize=2)
+        queue.put_nowait("c")
+        queue.put_nowait("d")
+        # Requeued items were admitted once already, so capacity doesn't apply
+        queue.requeue(["a", "b"])
+        assert [queue.get_nowait() for _ in range(4)] == ["a", "b", "c", "d"]
+
+    asyncio.run(run())
+
+
+def test_requeue_wakes_waiting_getter():
+    async def run():
+        queue = BoundedEventQueue(maxsize=2)
+        getter = asyncio.create_task(queue.get())
+        await asyncio.sleep(0)
+        assert not getter.done()
+
+        queue.requeue(["a"])
+        assert await asyncio.wait_for(getter, timeout=1) == "a"
+
+    asyncio.run(run())
+
+
+def test_cancelled_get_loses_nothing():
+    async def run():
+        queue = BoundedEventQueue()
+        getter = asyncio.create_task(queue.get())
+        await asyncio.sleep(0)
+        getter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await getter
+
+        queue.put_nowait("a")
+        assert await asyncio.wait_for(queue.get(), timeout=1) == "a"
+
+    asyncio.run(run())
@@ -0,0 +1,44 @@
+import pytest
+
+from src.voice_based_aws_agent.utils.intents import Intent, IntentParser
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("show me photos", Intent("start_slideshow")),
+    ("What tags do I have?", Intent("get_tags")),
+    ("list my tags", Intent("get_tags")),
+    ("show me beach photos from 2019", Intent("start_slideshow", {"tags": ["beach"], "year": 2019})),
+    ("show me photos of the beach", Intent("start_slideshow", {"tags": ["beach"]})),
+    ("show me photos from march 2020", Intent("start_slideshow", {"year": 2020, "month": "March"})),
+    ("start a slideshow of the kids from july", Intent("start_slideshow", {"tags": ["kids"], "month": "July"})),
+    ("Remember that my sister's birthday is in May.", Intent("remember", {"text": "my sister's birthday is in May"})),
+])
+def test_recognizes_simple_requests(query, expected):
+    assert IntentParser().parse(query) == expected
+
+
+@pytest.mark.parametrize("query", [
+    # Relative dates are left to the model
+    "show me dog pictures from last summer",
+    # Not a tag
+    "show me how many photos",
+    # More tags than max_slideshow_tags
+    "play dog and cat and bird and fish photos",
+    # Asks about a memory rather than storing one
+    "Remember that trip to Paris?",
+    "remember that",
+    "how many photos do I have",
+])
+def test_falls_through_to_the_model(query):
+    assert IntentParser().parse(query) is None
+
+
+def test_only_enabled_intents_are_recognized():
+    parser = IntentParser(intents=("get_tags",))
+    assert parser.parse("what tags do I have") == Intent("get_tags")
+    assert parser.parse("show me photos") is None
+
+
+def test_rejects_unknown_intents():
+    with pytest.raises(ValueError):
+        IntentParser(intents=("get_tags", "delete_photos"))
@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+import pytest
+
+from src.voice_based_aws_agent.utils.voice_integration.event_queue import BoundedEventQueue
+from src.voice_based_aws_agent.utils.voice_integration.output_events import (
+    RawOutputEvent,
+    drain_output_batch,
+    peek_event_name,
+    serialize_output_batch,
+    serialize_output_event,
+)
+
+
+@pytest.mark.parametrize("raw, name", [
+    (b'{"event":{"audioOutput":{"content":"AAAA"}}}', "audioOutput"),
+    (b'{ "event" : { "textOutput" : {"content": "hi"}}}', "textOutput"),
+    (b'{"event":\n{"contentEnd":{}}}', "contentEnd"),
+    (b'{"other":{"audioOutput":{}}}', None),
+    (b'{"event":1,"x":{"audioOutput":{}}}', None),
+    (b'{"event":{"' + b"a" * 100, None),
+    (b"", None),
+])
+def test_peek_event_name(raw, name):
+    assert peek_event_name(raw) == name
+
+
+def test_serialize_raw_event_splices_timestamp():
+    payload = b'{"event":{"textOutput":{"content":"hi"}}}\n'
+    frame = serialize_output_event(RawOutputEvent("textOutput", payload, 123))
+    assert json.loads(frame) == {"event": {"textOutput": {"content": "hi"}}, "timestamp": 123}
+
+
+def test_serialize_parsed_event():
+    event = {"event": {"toolUse": {"toolName": "supervisorAgent"}}, "timestamp": 5}
+    assert json.loads(serialize_output_event(event)) == event
+
+
+def test_serialize_batch():
+    items = [RawOutputEvent("textOutput", b'{"event":{"textOutput":{}}}', 1), {"event": {"contentEnd": {}}}]
+    assert json.loads(serialize_output_batch(items)) == [
+        {"event": {"textOutput": {}}, "timestamp": 1},
+        {"event": {"contentEnd": {}}},
+    ]
+
+
+def test_drain_takes_ready_items_up_to_max_events():
+    async def run():
+        queue = BoundedEventQueue()
+        for item in ("b", "c", "d"):
+            queue.put_nowait(item)
+        assert await drain_output_batch(queue, "a", max_events=3, max_delay_ms=0) == ["a", "b", "c"]
+        assert queue.get_nowait() == "d"
+
+    asyncio.run(run())
+
+
+def test_drain_waits_for_late_items_until_the_deadline():
+    async def run():
+        queue = BoundedEventQueue()
+        asyncio.get_running_loop().call_later(0.001, queue.put_nowait, "b")
+        assert await drain_output_batch(queue, "a", max_delay_ms=50) == ["a", "b"]
+
+    asyncio.run(run())
+
+
+def test_cancelled_drain_requeues_the_rest_of_the_batch():
+    async def run():
+        queue = BoundedEventQueue()
+        queue.put_nowait("b")
+        drain = asyncio.create_task(drain_output_batch(queue, "a", max_delay_ms=1000))
+        await asyncio.sleep(0.01)
+        queue_was_empty = queue.empty()
+
+        drain.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await drain
+        assert queue_was_empty
+        assert queue.get_nowait() == "b"
+
+    asyncio.run(run())
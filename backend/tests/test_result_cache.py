@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from src.voice_based_aws_agent.utils.voice_integration.result_cache import ResultCache, classify_tool
+
+TAGS = "photo_service.get_tags"
+
+
+def make_cache(**kwargs):
+    return ResultCache(tool_ttls={TAGS: 60}, **kwargs)
+
+
+class Compute:
+    """Counting compute function that can be held until released."""
+
+    def __init__(self, result="beach, kids", ok=True, hold=False):
+        self.result = result
+        self.ok = ok
+        self.calls = 0
+        self.release = asyncio.Event()
+        if not hold:
+            self.release.set()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        return self.result, self.ok
+
+
+@pytest.mark.parametrize("query, tool", [
+    ("what tags do I have", TAGS),
+    ("show my beach tag", "photo_service.start_slideshow"),
+    ("remember the tag names", "memory_service.add_memory"),
+    ("how are you", None),
+])
+def test_classify_tool(query, tool):
+    assert classify_tool(query) == tool
+
+
+def test_hit_after_successful_miss():
+    async def run():
+        cache = make_cache()
+        compute = Compute()
+        assert await cache.get_or_compute("What tags do I have?", compute) == ("beach, kids", True)
+        assert await cache.get_or_compute("what tags do i have", compute) == ("beach, kids", True)
+        assert compute.calls == 1
+        assert cache.stats()["hit"] == 1
+
+    asyncio.run(run())
+
+
+def test_failed_results_are_not_cached():
+    async def run():
+        cache = make_cache()
+        compute = Compute(result="Sorry, something went wrong", ok=False)
+        assert await cache.get_or_compute("what tags do I have", compute) == ("Sorry, something went wrong", False)
+        assert len(cache) == 0
+        await cache.get_or_compute("what tags do I have", compute)
+        assert compute.calls == 2
+
+    asyncio.run(run())
+
+
+def test_uncached_tools_bypass():
+    async def run():
+        cache = make_cache()
+        compute = Compute()
+        await cache.get_or_compute("show me beach photos", compute)
+        await cache.get_or_compute("show me beach photos", compute)
+        assert compute.calls == 2
+        assert cache.stats()["bypass"] == 2
+
+    asyncio.run(run())
+
+
+def test_single_flight_shares_one_computation():
+    async def run():
+        cache = make_cache()
+        compute = Compute(hold=True)
+        callers = [asyncio.create_task(cache.get_or_compute("what tags do I have", compute)) for _ in range(3)]
+        await asyncio.sleep(0)
+        compute.release.set()
+
+        assert await asyncio.gather(*callers) == [("beach, kids", True)] * 3
+        assert compute.calls == 1
+        assert cache.stats()["coalesced"] == 2
+
+    asyncio.run(run())
+
+
+def test_waiters_receive_the_computing_callers_exception():
+    async def run():
+        cache = make_cache()
+        release = asyncio.Event()
+
+        async def failing():
+            await release.wait()
+            raise RuntimeError("gateway down")
+
+        callers = [asyncio.create_task(cache.get_or_compute("what tags do I have", failing)) for _ in range(2)]
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(*callers, return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert len(cache) == 0
+
+    asyncio.run(run())
+
+
+def test_waiter_retries_when_the_computing_caller_is_cancelled():
+    async def run():
+        cache = make_cache()
+        first = Compute(hold=True)
+        second = Compute(result="kids")
+        computing = asyncio.create_task(cache.get_or_compute("what tags do I have", first))
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(cache.get_or_compute("what tags do I have", second))
+        await asyncio.sleep(0)
+
+        computing.cancel()
+        assert await asyncio.wait_for(waiting, timeout=1) == ("kids", True)
+        assert second.calls == 1
+        with pytest.raises(asyncio.CancelledError):
+            await computing
+
+    asyncio.run(run())
+
+
+def test_least_recently_used_is_evicted():
+    async def run():
+        cache = make_cache(max_entries=2)
+        for query in ("what tags do I have", "list my tags", "which tags exist"):
+            await cache.get_or_compute(query, Compute(result=query))
+        assert len(cache) == 2
+        assert cache.stats()["evictions"] == 1
+
+        compute = Compute()
+        await cache.get_or_compute("what tags do I have", compute)
+        assert compute.calls == 1
+
+    asyncio.run(run())
@@ -0,0 +1,60 @@
+import pytest
+
+from src.voice_based_aws_agent.config.routing_config import DEFAULT_AGENT, ROUTES, Route
+from src.voice_based_aws_agent.utils.routing_table import RoutingTable
+
+
+def test_keywords_match_whole_words():
+    table = RoutingTable([Route("TagAgent", keywords=("tag",))], "Default")
+    assert table.match("add a tag") == (table.routes[0], "tag")
+    assert table.match("vintage cars") is None
+    assert table.route("vintage cars") == "Default"
+
+
+def test_phrases_match_consecutive_words():
+    table = RoutingTable([Route("History", phrases=("what happened",))], "Default")
+    assert table.match("What happened, last week?")[1] == "what happened"
+    assert table.match("what then happened") is None
+
+
+@pytest.mark.parametrize("pattern", [r"\bphotos? of", r"of the (beach|lake)"])
+def test_keyed_and_unkeyed_patterns(pattern):
+    table = RoutingTable([Route("Photos", patterns=(pattern,))], "Default")
+    assert table.route("show me photos of the beach") == "Photos"
+    assert table.route("show me the beach") == "Default"
+
+
+def test_highest_priority_wins():
+    table = RoutingTable([
+        Route("Photos", keywords=("photos",)),
+        Route("Memories", keywords=("remember",), priority=1),
+    ], "Default")
+    assert table.route("do you remember those photos") == "Memories"
+
+
+def test_ties_go_to_the_route_listed_first():
+    table = RoutingTable([
+        Route("First", keywords=("beach",)),
+        Route("Second", patterns=(r"\bphotos",)),
+    ], "Default")
+    assert table.route("photos of the beach") == "First"
+
+
+def test_priority_applies_between_unkeyed_patterns():
+    table = RoutingTable([
+        Route("Low", patterns=(r"(a|b)c",)),
+        Route("High", patterns=(r"(x|y)z",), priority=2),
+    ], "Default")
+    assert table.route("ac xz") == "High"
+
+
+def test_rejects_terms_without_words():
+    with pytest.raises(ValueError):
+        RoutingTable([Route("Empty", keywords=("--",))], "Default")
+
+
+def test_default_routes():
+    table = RoutingTable(ROUTES, DEFAULT_AGENT)
+    assert table.match("show me my photos")[0].agent == "PhotoMemoryAgent"
+    assert table.route("hello") == DEFAULT_AGENT
+    assert table.agents == {"PhotoMemoryAgent"}
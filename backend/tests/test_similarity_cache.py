@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+
+from src.voice_based_aws_agent.utils.query_text import normalize_query
+from src.voice_based_aws_agent.utils.voice_integration.similarity_cache import SimilarityCache, query_terms
+
+
+class Compute:
+    """Counting compute function."""
+
+    def __init__(self, result="12 beach photos", ok=True):
+        self.result = result
+        self.ok = ok
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return self.result, self.ok
+
+
+def ask(cache, *queries, compute=None):
+    """Ask the queries in order and return the compute function."""
+    compute = compute or Compute()
+
+    async def run():
+        for query in queries:
+            await cache.get_or_compute(query, compute)
+
+    asyncio.run(run())
+    return compute
+
+
+def test_query_terms_fold_plurals_and_synonyms():
+    assert query_terms(normalize_query("how many beach pics do I have")) == ["how", "many", "beach", "photo"]
+    assert query_terms(normalize_query("how many pictures of the beach do I have")) == ["how", "many", "photo", "beach"]
+
+
+def test_rephrased_question_is_a_hit():
+    cache = SimilarityCache(cache_questions=True)
+    compute = ask(cache, "how many beach pics do I have", "how many pictures of the beach do I have")
+    assert compute.calls == 1
+    assert cache.stats()["hit"] == 1
+
+
+# "how many beach photos do I have" and "... from 2019 ..." score about 0.82
+@pytest.mark.parametrize("threshold, calls", [(0.75, 1), (0.9, 2)])
+def test_threshold(threshold, calls):
+    cache = SimilarityCache(threshold=threshold, cache_questions=True)
+    compute = ask(cache, "how many beach photos do I have", "how many beach photos from 2019 do I have")
+    assert compute.calls == calls
+
+
+def test_different_content_words_miss():
+    cache = SimilarityCache(cache_questions=True)
+    compute = ask(cache, "how many beach photos do I have", "how many dog photos do I have")
+    assert compute.calls == 2
+
+
+def test_tool_queries_reuse_only_listed_tools():
+    cache = SimilarityCache()
+    assert ask(cache, "what tags do I have", "which labels do i have").calls == 1
+
+    cache = SimilarityCache(tools=())
+    assert ask(cache, "what tags do I have", "which labels do i have").calls == 2
+    assert cache.stats()["bypass"] == 2
+
+
+@pytest.mark.parametrize("query", [
+    # Refers back to the conversation
+    "where was that beach photo taken",
+    # Too few content words
+    "where is paris",
+    # Not a question
+    "tell me about my beach photos",
+])
+def test_uncacheable_questions_bypass(query):
+    cache = SimilarityCache(cache_questions=True)
+    assert ask(cache, query, query).calls == 2
+    assert cache.stats()["bypass"] == 2
+
+
+def test_questions_bypass_unless_enabled():
+    cache = SimilarityCache()
+    assert ask(cache, "how many beach photos do I have", "how many beach photos do I have").calls == 2
+
+
+def test_failed_results_are_not_cached():
+    cache = SimilarityCache(cache_questions=True)
+    compute = ask(cache, "how many beach photos do I have", "how many beach photos do I have",
+                  compute=Compute(ok=False))
+    assert compute.calls == 2
+    assert len(cache) == 0
+
+
+def test_least_recently_used_is_evicted():
+    cache = SimilarityCache(max_entries=2, cache_questions=True)
+    ask(cache, "how many beach photos do I have", "how many dog photos do I have", "how many kid photos do I have")
+    assert len(cache) == 2
+    assert cache.stats()["evictions"] == 1
+    assert ask(cache, "how many beach photos do I have").calls == 1
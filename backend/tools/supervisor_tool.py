@@ -1,14 +1,26 @@
 """
 Supervisor Tool for Voice Agent Integration
 Provides the interface between Nova Sonic and the multi-agent system.
+
+Voice sessions don't call this tool: they query the orchestrator directly
+through ``SupervisorAgentIntegration``, and the blocking agent calls there
+run on the bounded ``AgentExecutor`` pools. The tool is for Strands agents
+that call the supervisor synchronously. Their queries run on one
+long-lived event loop thread shared by every call, instead of a new thread
+and event loop per call.
 """
 
 import asyncio
+import concurrent.futures
 import logging
+import threading
 from typing import Annotated
 from pydantic import Field
 from strands import tool
 
+from src.voice_based_aws_agent.config.config import ToolExecutionConfig
+from src.voice_based_aws_agent.utils.deadlines import DeadlineExceeded, request_timeout
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -17,6 +29,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger("supervisor_tool")
 
+# Event loop running the queries of every call of the tool in this process
+_loop = None
+_loop_lock = threading.Lock()
+
+def _get_loop():
+    """Get the tool's event loop, starting its thread on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="supervisor-tool-loop", daemon=True).start()
+        return _loop
+
 # Global orchestrator instance
 _orchestrator = None
 
@@ -35,6 +60,11 @@ def get_orchestrator():
         _orchestrator = AgentOrchestrator()
     return _orchestrator
 
+def get_tool_execution_config():
+    """Get the tool call timeout and fallback message from the orchestrator's config."""
+    config = getattr(get_orchestrator(), "config", None)
+    return getattr(config, "tool_execution", None) or ToolExecutionConfig()
+
 async def process_query_async(query: str) -> str:
     """
     Process a query through the multi-agent system asynchronously.
@@ -70,34 +100,22 @@ def process_user_query(
     try:
         logger.info(f"Processing query: {query}")
         
-        # Handle async execution in sync context
+        # Longest the tool waits for the agents, shortened by the tool call deadline
+        tool_execution = get_tool_execution_config()
+        try:
+            timeout = request_timeout(tool_execution.timeout)
+        except DeadlineExceeded as e:
+            logger.warning(f"Not starting query: {e}")
+            return tool_execution.fallback_message
+
+        # The coroutine runs in a copy of this context, so the deadline and trace follow the query
+        future = asyncio.run_coroutine_threadsafe(process_query_async(query), _get_loop())
         try:
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # If we're already in an event loop, create a new thread
-                import concurrent.futures
-                import threading
-                
-                def run_in_thread():
-                    new_loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(new_loop)
-                    try:
-                        return new_loop.run_until_complete(process_query_async(query))
-                    finally:
-                        new_loop.close()
-                
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(run_in_thread)
-                    return future.result(timeout=30)  # 30 second timeout
-            else:
-                # No event loop running, we can use asyncio.run
-                return asyncio.run(process_query_async(query))
-                
-        except RuntimeError as e:
-            if "no running event loop" in str(e):
-                return asyncio.run(process_query_async(query))
-            else:
-                raise
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            logger.warning(f"Query timed out after {timeout:.1f}s")
+            return tool_execution.fallback_message
             
     except Exception as e:
         error_msg = f"Error in supervisorAgent tool: {str(e)}"
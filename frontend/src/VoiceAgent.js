@@ -15,6 +15,8 @@ import {
 import S2sEvent from './helper/s2sEvents';
 import EventDisplay from './components/EventDisplay';
 import { base64ToFloat32Array } from './helper/audioHelper';
+import { BINARY_AUDIO_SUBPROTOCOL, encodeAudioFrame } from './helper/audioFrames';
+import { BATCHED_OUTPUT_SUBPROTOCOL, unpackOutputFrame } from './helper/outputBatch';
 import AudioPlayer from './helper/audioPlayer';
 
 class VoiceAgent extends React.Component {
@@ -52,6 +54,8 @@ class VoiceAgent extends React.Component {
         this.audioBufferSize = 0;
         
         this.socket = null;
+        this.resumeToken = null; // Lets a dropped connection reattach to its backend session
+        this.resuming = false;
         this.mediaRecorder = null;
         this.chatMessagesEndRef = React.createRef();
         this.stateRef = React.createRef();
@@ -93,6 +97,12 @@ class VoiceAgent extends React.Component {
         }
     }
 
+    sendAudioFrame(pcmBytes) {
+        if (this.socket && this.socket.readyState === WebSocket.OPEN) {
+            this.socket.send(encodeAudioFrame(this.state.promptName, this.state.audioContentName, pcmBytes));
+        }
+    }
+
     cancelAudio() {
         this.audioPlayer.bargeIn();
         this.setState({ isPlaying: false });
@@ -205,6 +215,60 @@ class VoiceAgent extends React.Component {
                 }
                 break;
                 
+            case "sessionResumable":
+                this.resumeToken = message.event.sessionResumable.token;
+                break;
+
+            case "sessionResumed":
+                console.log("Session resumed");
+                this.resuming = false;
+                this.setState({ status: "connected", alert: null });
+                break;
+
+            case "sessionResumeFailed":
+                console.warn("Session resume failed:", message.event.sessionResumeFailed.message);
+                this.resumeToken = null;
+                this.resuming = false;
+
+                // Drop the fresh connection without sending session events on it
+                if (this.socket) {
+                    this.socket.onclose = null;
+                    this.socket.close();
+                    this.socket = null;
+                }
+                this.setState({
+                    alert: {
+                        type: "warning",
+                        message: "Connection lost and the previous session expired. Please restart your conversation.",
+                        dismissible: true,
+                        showRestart: true
+                    }
+                });
+
+                if (this.state.sessionStarted) {
+                    this.endSession();
+                    this.setState({ sessionStarted: false });
+                }
+                break;
+
+            case "sessionRejected":
+                console.warn("Session rejected:", message.event.sessionRejected.reason);
+                // The server is at capacity; show why and let the user retry
+                this.setState({
+                    alert: {
+                        type: "warning",
+                        message: message.event.sessionRejected.message,
+                        dismissible: true,
+                        showRestart: true
+                    }
+                });
+
+                if (this.state.sessionStarted) {
+                    this.endSession();
+                    this.setState({ sessionStarted: false });
+                }
+                break;
+
             case "streamStatus":
                 const status = message.event.streamStatus.status;
                 const statusMessage = message.event.streamStatus.message;
@@ -306,7 +370,8 @@ class VoiceAgent extends React.Component {
                 audioContentName: audioContentName
             });
 
-            this.socket = new WebSocket(this.state.websocketUrl);
+            // Negotiate batched output and binary audio framing; JSON audioInput is used if the server selects neither
+            this.socket = new WebSocket(this.state.websocketUrl, [BATCHED_OUTPUT_SUBPROTOCOL, BINARY_AUDIO_SUBPROTOCOL]);
             
             this.socket.onopen = () => {
                 console.log("WebSocket connected!");
@@ -357,67 +422,99 @@ class VoiceAgent extends React.Component {
                 this.sendEvent(S2sEvent.contentStartAudio(promptName, audioContentName));
             };
 
-            // Handle incoming messages
-            this.socket.onmessage = (message) => {
-                const event = JSON.parse(message.data);
+            this.attachSocketHandlers();
+        }
+    }
+
+    attachSocketHandlers() {
+        // Handle incoming messages
+        this.socket.onmessage = (message) => {
+            for (const event of unpackOutputFrame(message.data)) {
                 this.handleIncomingMessage(event);
-            };
+            }
+        };
+
+        // Handle errors
+        this.socket.onerror = (error) => {
+            console.error("WebSocket Error: ", error);
+            // Let onclose try to resume the session first
+            if (this.resumeToken && !this.resuming) {
+                return;
+            }
+            this.setState({
+                status: "disconnected",
+                alert: {
+                    type: "error",
+                    message: "WebSocket connection error. Please restart your conversation.",
+                    dismissible: true,
+                    showRestart: true
+                }
+            });
+            
+            // End session on WebSocket error
+            if (this.state.sessionStarted) {
+                this.endSession();
+                this.setState({ sessionStarted: false });
+            }
+        };
+
+        // Handle connection close
+        this.socket.onclose = (event) => {
+            console.log("WebSocket Disconnected", event.code, event.reason);
+            this.setState({status: "disconnected"});
 
-            // Handle errors
-            this.socket.onerror = (error) => {
-                console.error("WebSocket Error: ", error);
+            // Try once to reattach to the backend session after an unexpected drop
+            const unexpected = event.code !== 1000 && event.code !== 1013;
+            if (unexpected && this.state.sessionStarted && this.resumeToken && !this.resuming) {
+                this.resumeWebSocket();
+                return;
+            }
+            this.resuming = false;
+            
+            // Show appropriate message based on close code
+            if (event.code === 1005) {
+                // No status code - likely a connection drop
+                this.setState({
+                    alert: {
+                        type: "warning",
+                        message: "Connection lost unexpectedly. Please restart your conversation.",
+                        dismissible: true,
+                        showRestart: true
+                    }
+                });
+            } else if (event.code === 1013) {
+                // Session rejected by admission control - the sessionRejected alert is already shown
+            } else if (event.code !== 1000) {
+                // Abnormal closure
                 this.setState({
-                    status: "disconnected",
                     alert: {
                         type: "error",
-                        message: "WebSocket connection error. Please restart your conversation.",
+                        message: `Connection closed unexpectedly (${event.code}). Please restart your conversation.`,
                         dismissible: true,
                         showRestart: true
                     }
                 });
-                
-                // End session on WebSocket error
-                if (this.state.sessionStarted) {
-                    this.endSession();
-                    this.setState({ sessionStarted: false });
-                }
-            };
+            }
+            
+            // End session on WebSocket close
+            if (this.state.sessionStarted) {
+                this.endSession();
+                this.setState({ sessionStarted: false });
+            }
+        };
+    }
 
-            // Handle connection close
-            this.socket.onclose = (event) => {
-                console.log("WebSocket Disconnected", event.code, event.reason);
-                this.setState({status: "disconnected"});
-                
-                // Show appropriate message based on close code
-                if (event.code === 1005) {
-                    // No status code - likely a connection drop
-                    this.setState({
-                        alert: {
-                            type: "warning",
-                            message: "Connection lost unexpectedly. Please restart your conversation.",
-                            dismissible: true,
-                            showRestart: true
-                        }
-                    });
-                } else if (event.code !== 1000) {
-                    // Abnormal closure
-                    this.setState({
-                        alert: {
-                            type: "error",
-                            message: `Connection closed unexpectedly (${event.code}). Please restart your conversation.`,
-                            dismissible: true,
-                            showRestart: true
-                        }
-                    });
-                }
-                
-                // End session on WebSocket close
-                if (this.state.sessionStarted) {
-                    this.endSession();
-                    this.setState({ sessionStarted: false });
-                }
-            };
-        }
+    resumeWebSocket() {
+        console.log("Reconnecting to resume session...");
+        this.resuming = true;
+        const url = new URL(this.state.websocketUrl);
+        url.searchParams.set("resume", this.resumeToken);
+
+        this.socket = new WebSocket(url.toString(), [BATCHED_OUTPUT_SUBPROTOCOL, BINARY_AUDIO_SUBPROTOCOL]);
+        this.socket.onopen = () => {
+            console.log("WebSocket reconnected, waiting for session resume");
+        };
+        this.attachSocketHandlers();
     }
 
     async startMicrophone() {
@@ -467,13 +564,26 @@ class VoiceAgent extends React.Component {
                         }
                     }
 
-                    // Convert to base64
+                    // Convert to 16-bit PCM
                     const pcmData = new Int16Array(outputData.length);
                     for (let i = 0; i < outputData.length; i++) {
                         pcmData[i] = Math.max(-32768, Math.min(32767, outputData[i] * 32768));
                     }
+                    const pcmBytes = new Uint8Array(pcmData.buffer);
+
+                    // Send raw PCM in a binary frame when negotiated
+                    const protocol = this.socket ? this.socket.protocol : "";
+                    if (protocol === BINARY_AUDIO_SUBPROTOCOL || protocol === BATCHED_OUTPUT_SUBPROTOCOL) {
+                        if (pcmBytes.length > this.MAX_AUDIO_CHUNK_SIZE) {
+                            console.warn(`Input audio chunk size (${pcmBytes.length}) exceeds maximum allowed (${this.MAX_AUDIO_CHUNK_SIZE}). Skipping chunk.`);
+                            return;
+                        }
+                        this.sendAudioFrame(pcmBytes);
+                        return;
+                    }
 
-                    const base64Data = btoa(String.fromCharCode(...new Uint8Array(pcmData.buffer)));
+                    // Convert to base64
+                    const base64Data = btoa(String.fromCharCode(...pcmBytes));
 
                     // Validate input audio chunk size for security
                     if (base64Data.length > this.MAX_AUDIO_CHUNK_SIZE) {
@@ -524,6 +634,8 @@ class VoiceAgent extends React.Component {
 
         // Clean up socket reference
         this.socket = null;
+        this.resumeToken = null;
+        this.resuming = false;
         
         // Reset audio buffer size for security
         this.audioBufferSize = 0;
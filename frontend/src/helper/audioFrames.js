@@ -0,0 +1,28 @@
+// Binary WebSocket framing for raw PCM audio input.
+// Must match backend utils/voice_integration/audio_frames.py
+const BINARY_AUDIO_SUBPROTOCOL = "nova-s2s.binary-audio.v1";
+const FRAME_TYPE_AUDIO_INPUT = 0x01;
+
+const textEncoder = new TextEncoder();
+
+// Header: type (1 byte), prompt name length (1 byte), content name length (1 byte),
+// followed by the UTF-8 prompt name, content name and the raw PCM bytes
+function encodeAudioFrame(promptName, contentName, pcmBytes) {
+    const prompt = textEncoder.encode(promptName);
+    const content = textEncoder.encode(contentName);
+    if (prompt.length > 255 || content.length > 255) {
+        throw new Error("Prompt and content names must be at most 255 bytes");
+    }
+
+    const headerSize = 3 + prompt.length + content.length;
+    const frame = new Uint8Array(headerSize + pcmBytes.length);
+    frame[0] = FRAME_TYPE_AUDIO_INPUT;
+    frame[1] = prompt.length;
+    frame[2] = content.length;
+    frame.set(prompt, 3);
+    frame.set(content, 3 + prompt.length);
+    frame.set(pcmBytes, headerSize);
+    return frame;
+}
+
+export { BINARY_AUDIO_SUBPROTOCOL, encodeAudioFrame };
@@ -0,0 +1,12 @@
+// Batched output frames from the backend.
+// Must match backend utils/voice_integration/output_events.py
+// Negotiating this subprotocol also enables binary audio input frames.
+const BATCHED_OUTPUT_SUBPROTOCOL = "nova-s2s.batched-output.v1";
+
+// A frame holds either a single event object or a JSON array of events
+function unpackOutputFrame(data) {
+    const parsed = JSON.parse(data);
+    return Array.isArray(parsed) ? parsed : [parsed];
+}
+
+export { BATCHED_OUTPUT_SUBPROTOCOL, unpackOutputFrame };
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the code that runs per audio frame or per event.
+
+Measures ops/sec and peak memory allocated per operation for each hot path
+and compares them with the stored baseline in ``benchmark_baseline.json``.
+Exits with status 1 if any benchmark is slower than its baseline by more
+than the threshold, so per-chunk overhead can't creep back in unnoticed.
+
+    python scripts/benchmark_hot_paths.py                    # compare with baseline
+    python scripts/benchmark_hot_paths.py --threshold 10     # fail on >10% slowdown
+    python scripts/benchmark_hot_paths.py --update-baseline  # record a new baseline
+    python scripts/benchmark_hot_paths.py -k serialize       # run matching benchmarks
+
+Baselines are machine specific: record them on the machine you compare on.
+"""
+
+import argparse
+import base64
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from src.voice_based_aws_agent.config.routing_config import DEFAULT_AGENT, ROUTES, Route  # noqa: E402
+from src.voice_based_aws_agent.utils.intents import IntentParser  # noqa: E402
+from src.voice_based_aws_agent.utils.routing_table import RoutingTable  # noqa: E402
+from src.voice_based_aws_agent.utils.voice_integration.audio_frames import (  # noqa: E402
+    decode_audio_frame,
+    encode_audio_frame,
+)
+from src.voice_based_aws_agent.utils.voice_integration.event_queue import BoundedEventQueue  # noqa: E402
+from src.voice_based_aws_agent.utils.voice_integration.output_events import (  # noqa: E402
+    FULL_PARSE_EVENTS,
+    RawOutputEvent,
+    peek_event_name,
+    serialize_output_batch,
+    serialize_output_event,
+)
+from src.voice_based_aws_agent.utils.voice_integration.s2s_events import S2sEvent  # noqa: E402
+
+BASELINE_PATH = Path(__file__).resolve().parent / "benchmark_baseline.json"
+DEFAULT_THRESHOLD = 15.0  # Percent slowdown that counts as a regression
+
+PROMPT_NAME = "8f9a1c52-3a57-4c1e-9d0e-2f4b1c6e7a10"
+CONTENT_NAME = "0b7e6d2c-5f1a-4c8b-a3e9-7d6c5b4a3f21"
+PCM_CHUNK = bytes(range(256)) * 4  # 1024 bytes, 32 ms of 16 kHz audio
+AUDIO_BASE64 = base64.b64encode(PCM_CHUNK).decode("ascii")
+OUTPUT_AUDIO_BASE64 = base64.b64encode(bytes(1920)).decode("ascii")  # 40 ms of 24 kHz audio
+
+AUDIO_INPUT_MESSAGE = json.dumps(S2sEvent.audio_input(PROMPT_NAME, CONTENT_NAME, AUDIO_BASE64))
+AUDIO_INPUT_FRAME = encode_audio_frame(PROMPT_NAME, CONTENT_NAME, PCM_CHUNK)
+AUDIO_OUTPUT_RAW = json.dumps({"event": {"audioOutput": {
+    "content": OUTPUT_AUDIO_BASE64, "contentId": CONTENT_NAME, "promptName": PROMPT_NAME,
+    "role": "ASSISTANT", "sessionId": PROMPT_NAME}}}).encode("utf-8")
+CONTENT_END_RAW = json.dumps({"event": {"contentEnd": {
+    "contentId": CONTENT_NAME, "promptName": PROMPT_NAME, "stopReason": "PARTIAL_TURN",
+    "type": "AUDIO", "sessionId": PROMPT_NAME}}}).encode("utf-8")
+OUTPUT_BATCH = [RawOutputEvent("audioOutput", AUDIO_OUTPUT_RAW, 1700000000000)] * 16
+
+ROUTING_QUERIES = [
+    "Show me photos from the beach last summer",
+    "Remember that Sam visited on Saturday for the barbecue",
+    "What tags do I have",
+    "Start a slideshow of the kids",
+    "How is the weather today",
+]
+
+LARGE_ROUTING_TABLE_RULES = 5000
+
+
+def synthetic_word(index):
+    """A distinct made-up word for ``index``, so synthetic rules don't share prefixes."""
+    letters = ""
+    while True:
+        index, remainder = divmod(index, 26)
+        letters += "abcdefghijklmnopqrstuvwxyz"[remainder]
+        if not index:
+            return letters + "q"
+
+
+def large_routing_table(rules):
+    """
+    A synthetic table of ``rules`` routes over 50 agents. Each has three
+    keywords and a phrase, every 10th a keyed pattern and every 1000th a
+    pattern without a literal start.
+    """
+    routes = []
+    for index in range(rules):
+        word = synthetic_word(index)
+        patterns = ()
+        if index % 10 == 0:
+            patterns += (rf"\b{word}x?s? \d+",)
+        if index % 1000 == 0:
+            patterns += (rf"\d+ {word}y",)
+        routes.append(Route(
+            agent=f"Agent{index % 50}",
+            keywords=(f"{word}a", f"{word}b", f"{word}c"),
+            phrases=(f"{word}d {word}e",),
+            patterns=patterns,
+            priority=index % 5,
+        ))
+    return RoutingTable([*routes, *ROUTES], default_agent=DEFAULT_AGENT)
+
+
+# Queries the intent fast path must leave to the model, checked before timing intent_parse
+INTENT_FALLBACK_QUERIES = [
+    "show me how many photos",
+    "show me your photos",
+    "show me photos of me",
+    "show me only beach photos",
+    "show me photos from last summer",
+    "remember that trip to Paris?",
+    "how is the weather today",
+]
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register a benchmark. The function returns the zero-argument operation to time."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+@benchmark("audio_input_event_dumps")
+def _audio_input_event_dumps():
+    """S2sEvent.audio_input plus json.dumps, as done for every audio event sent to Bedrock."""
+    return lambda: json.dumps(S2sEvent.audio_input(PROMPT_NAME, CONTENT_NAME, AUDIO_BASE64))
+
+
+@benchmark("handler_parse_json_audio")
+def _handler_parse_json_audio():
+    """websocket_handler parsing of a JSON audioInput text frame."""
+    def op():
+        data = json.loads(AUDIO_INPUT_MESSAGE)
+        if 'body' in data:
+            data = json.loads(data["body"])
+        event_type = list(data['event'].keys())[0]
+        audio = data['event'][event_type]
+        return audio['promptName'], audio['contentName'], audio['content']
+    return op
+
+
+@benchmark("handler_decode_binary_audio")
+def _handler_decode_binary_audio():
+    """websocket_handler decoding of a binary audio frame."""
+    return lambda: decode_audio_frame(AUDIO_INPUT_FRAME)
+
+
+@benchmark("merge_audio_batch")
+def _merge_audio_batch():
+    """Coalescing 4 binary audio chunks into one base64 audioInput payload."""
+    from src.voice_based_aws_agent.utils.voice_integration.s2s_session_manager import S2sSessionManager
+    batch = [{'prompt_name': PROMPT_NAME, 'content_name': CONTENT_NAME, 'pcm_bytes': PCM_CHUNK}] * 4
+    return lambda: S2sSessionManager._merge_audio(batch)
+
+
+@benchmark("process_responses_passthrough")
+def _process_responses_passthrough():
+    """_process_responses handling of an audioOutput event (peek, no parse)."""
+    def op():
+        event_name = peek_event_name(AUDIO_OUTPUT_RAW)
+        if event_name is not None and event_name not in FULL_PARSE_EVENTS:
+            return RawOutputEvent(event_name, AUDIO_OUTPUT_RAW, 1700000000000)
+    return op
+
+
+@benchmark("process_responses_full_parse")
+def _process_responses_full_parse():
+    """_process_responses handling of a contentEnd event (full parse)."""
+    def op():
+        json_data = json.loads(CONTENT_END_RAW.decode('utf-8'))
+        json_data["timestamp"] = 1700000000000
+        return list(json_data["event"].keys())[0]
+    return op
+
+
+@benchmark("forward_serialize_event")
+def _forward_serialize_event():
+    """forward_responses serialization of one raw audioOutput event."""
+    item = OUTPUT_BATCH[0]
+    return lambda: serialize_output_event(item)
+
+
+@benchmark("forward_serialize_batch16")
+def _forward_serialize_batch16():
+    """forward_responses serialization of a batch of 16 raw audioOutput events."""
+    return lambda: serialize_output_batch(OUTPUT_BATCH)
+
+
+@benchmark("output_queue_push_get")
+def _output_queue_push_get():
+    """BoundedEventQueue offer and get_nowait of one output event."""
+    queue = BoundedEventQueue(maxsize=500, policy="drop_audio", name="benchmark")
+    item = OUTPUT_BATCH[0]
+
+    def op():
+        queue.offer(item)
+        return queue.get_nowait()
+    return op
+
+
+@benchmark("supervisor_determine_agent")
+def _supervisor_determine_agent():
+    """SupervisorAgent._determine_agent keyword routing."""
+    from src.voice_based_aws_agent.agents.supervisor_agent import SupervisorAgent
+    supervisor = SupervisorAgent.__new__(SupervisorAgent)
+    queries = ROUTING_QUERIES
+
+    def op():
+        for query in queries:
+            supervisor._determine_agent(query)
+    return op
+
+
+@benchmark("routing_table_default")
+def _routing_table_default():
+    """RoutingTable.route with the default routing table."""
+    table = RoutingTable(ROUTES, default_agent=DEFAULT_AGENT)
+    queries = ROUTING_QUERIES
+
+    def op():
+        for query in queries:
+            table.route(query)
+    return op
+
+
+@benchmark("intent_parse")
+def _intent_parse():
+    """IntentParser.parse, run on every PhotoMemoryAgent query before the model."""
+    parser = IntentParser()
+    misread = {query: parser.parse(query) for query in INTENT_FALLBACK_QUERIES}
+    misread = {query: intent for query, intent in misread.items() if intent is not None}
+    if misread:
+        raise AssertionError(f"Intent fast path misread queries it should leave to the model: {misread}")
+    queries = ROUTING_QUERIES
+
+    def op():
+        for query in queries:
+            parser.parse(query)
+    return op
+
+
+@benchmark("similarity_cache_lookup")
+def _similarity_cache_lookup():
+    """SimilarityCache lookup of a near-duplicate query against 512 cached queries."""
+    from src.voice_based_aws_agent.utils.voice_integration.similarity_cache import SimilarityCache, query_terms
+    cache = SimilarityCache(max_entries=512)
+    for index in range(512):
+        terms = query_terms(f"who was at {synthetic_word(index)} party in {2000 + index % 25}")
+        cache._store(f"query {index}", None, "result", cache._columns(terms))
+    terms = query_terms("who came to the aq party in 2000")
+
+    def op():
+        return cache._lookup(cache._vector(cache._columns(terms)), None, "benchmark")
+    return op
+
+
+def _routing_table_synthetic(rules):
+    """RoutingTable.route with a synthetic table, cost should not depend on ``rules``."""
+    def setup():
+        table = large_routing_table(rules)
+        queries = ROUTING_QUERIES
+
+        def op():
+            for query in queries:
+                table.route(query)
+        return op
+    return setup
+
+
+for _rules in (10, LARGE_ROUTING_TABLE_RULES):
+    benchmark(f"routing_table_{_rules}_rules")(_routing_table_synthetic(_rules))
+
+
+def measure_ops_per_sec(op, min_time, repeats):
+    """Best-of-``repeats`` throughput, each run lasting at least ``min_time`` seconds."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            op()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time / 10:
+            break
+        loops *= 2
+    loops = max(1, int(loops * (min_time / max(elapsed, 1e-9))))
+
+    best = 0.0
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(loops):
+                op()
+            best = max(best, loops / (time.perf_counter() - start))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best
+
+
+def measure_allocations(op, iterations=200):
+    """Peak bytes allocated during one operation, averaged over ``iterations``."""
+    op()  # Warm caches outside the trace
+    tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(iterations):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            op()
+            total += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return total / iterations
+
+
+def run(names, min_time, repeats):
+    results = {}
+    for name in names:
+        try:
+            op = BENCHMARKS[name]()
+        except ImportError as e:
+            print(f"{name:<32} skipped ({e})")
+            continue
+        results[name] = {
+            "ops_per_sec": round(measure_ops_per_sec(op, min_time, repeats), 1),
+            "alloc_bytes_per_op": round(measure_allocations(op), 1),
+        }
+    return results
+
+
+def machine_info():
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Print results against the baseline. Returns the names of regressed benchmarks."""
+    regressions = []
+    print(f"{'benchmark':<32} {'ops/sec':>14} {'baseline':>14} {'change':>9} {'alloc B/op':>11}")
+    for name, result in results.items():
+        base = baseline.get("benchmarks", {}).get(name)
+        ops = result["ops_per_sec"]
+        if base:
+            change = (ops / base["ops_per_sec"] - 1) * 100
+            flag = ""
+            if change < -threshold:
+                regressions.append(name)
+                flag = "  REGRESSION"
+            print(f"{name:<32} {ops:>14,.0f} {base['ops_per_sec']:>14,.0f} {change:>+8.1f}% "
+                  f"{result['alloc_bytes_per_op']:>11,.0f}{flag}")
+        else:
+            print(f"{name:<32} {ops:>14,.0f} {'-':>14} {'-':>9} {result['alloc_bytes_per_op']:>11,.0f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the voice hot paths against a stored baseline")
+    parser.add_argument("-k", dest="pattern", help="Only run benchmarks whose name contains this string")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Percent slowdown that fails the run (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds per timing run (default: 0.2)")
+    parser.add_argument("--repeats", type=int, default=5, help="Timing runs per benchmark, best is kept (default: 5)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline file")
+    parser.add_argument("--update-baseline", action="store_true", help="Write the results as the new baseline")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if not args.pattern or args.pattern in name]
+    results = run(names, args.min_time, args.repeats)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+    if args.update_baseline:
+        baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        baseline.setdefault("benchmarks", {}).update(results)
+        baseline["machine"] = machine_info()
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    if baseline.get("machine") and baseline["machine"] != machine_info():
+        print(f"Warning: baseline was recorded on {baseline['machine']}, results may not be comparable")
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold}%: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Real-time load generator for the voice assistant WebSocket server.
+
+Opens N concurrent WebSocket clients that behave like the frontend: each one
+starts a session, then repeatedly speaks an utterance (PCM streamed at real
+time, silence in between) and waits for the assistant's spoken reply. Reports
+time to first audio (end of utterance to first audioOutput), and, when the
+server's metrics endpoint is given, memory per session and sessions per core.
+
+Run the server against the local Nova Sonic fake to test without AWS:
+
+    ./run_backend.sh --fake-sonic --max-sessions 0 --max-sessions-per-client 0
+    python scripts/load_test.py --clients 50 --duration 60
+
+A single load generator process streams a few hundred clients comfortably;
+run several for more.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import math
+import random
+import statistics
+import sys
+import time
+import urllib.request
+import uuid
+import wave
+from pathlib import Path
+
+import websockets
+
+# Reuse the backend's wire format helpers
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from src.voice_based_aws_agent.utils.voice_integration.audio_frames import (  # noqa: E402
+    BINARY_AUDIO_SUBPROTOCOL,
+    encode_audio_frame,
+)
+from src.voice_based_aws_agent.utils.voice_integration.output_events import BATCHED_OUTPUT_SUBPROTOCOL  # noqa: E402
+
+SAMPLE_RATE = 16000
+BYTES_PER_MS = SAMPLE_RATE * 2 // 1000
+
+TOOL_CONFIG = {
+    "tools": [{
+        "toolSpec": {
+            "name": "supervisorAgent",
+            "description": "Routes queries to specialized agents for photos and memories",
+            "inputSchema": {"json": json.dumps({
+                "type": "object",
+                "properties": {"query": {"type": "string"}},
+                "required": ["query"],
+            })},
+        }
+    }]
+}
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(math.ceil(fraction * len(ordered))) - 1)]
+
+
+def load_speech(path, chunk_ms):
+    """Load speech PCM chunks from a 16 kHz mono 16-bit WAV file, or synthesize a tone."""
+    chunk_bytes = chunk_ms * BYTES_PER_MS
+    if path:
+        with wave.open(path, "rb") as wav:
+            if wav.getframerate() != SAMPLE_RATE or wav.getnchannels() != 1 or wav.getsampwidth() != 2:
+                raise SystemExit("WAV input must be 16 kHz, mono, 16-bit")
+            pcm = wav.readframes(wav.getnframes())
+    else:
+        samples = (int(3000 * math.sin(2 * math.pi * 220 * i / SAMPLE_RATE)) or 1 for i in range(SAMPLE_RATE))
+        pcm = b"".join(sample.to_bytes(2, "little", signed=True) for sample in samples)
+    return [pcm[i:i + chunk_bytes] for i in range(0, len(pcm) - chunk_bytes + 1, chunk_bytes)]
+
+
+def scrape_metrics(url):
+    """Read process memory and CPU time from the server's metrics endpoint."""
+    values = {}
+    with urllib.request.urlopen(url, timeout=5) as response:
+        for line in response.read().decode("utf-8").splitlines():
+            if line.startswith(("process_resident_memory_bytes ", "process_cpu_seconds_total ",
+                                "voice_active_sessions ")):
+                name, value = line.split()
+                values[name] = float(value)
+    values["time"] = time.monotonic()
+    return values
+
+
+class ClientStats:
+    """Results collected by one simulated client."""
+
+    def __init__(self):
+        self.connected = False
+        self.rejected = None
+        self.error = None
+        self.turns = 0
+        self.ttfa_ms = []
+
+
+class VoiceClient:
+    """A simulated frontend streaming PCM at real time."""
+
+    def __init__(self, args, speech_chunks):
+        self.args = args
+        self.speech_chunks = speech_chunks
+        self.silence_chunk = b"\x00" * (args.chunk_ms * BYTES_PER_MS)
+        self.stats = ClientStats()
+        self.prompt_name = str(uuid.uuid4())
+        self.audio_content_name = str(uuid.uuid4())
+        self.binary = False
+        self.utterance_end = None
+        self.awaiting_audio = False
+        self.turn_done = asyncio.Event()
+
+    def _event(self, name, body):
+        return json.dumps({"event": {name: body}})
+
+    async def _send_audio(self, ws, pcm):
+        if self.binary:
+            await ws.send(encode_audio_frame(self.prompt_name, self.audio_content_name, pcm))
+        else:
+            await ws.send(self._event("audioInput", {
+                "promptName": self.prompt_name,
+                "contentName": self.audio_content_name,
+                "content": base64.b64encode(pcm).decode("ascii"),
+            }))
+
+    async def _start_session(self, ws):
+        text_content_name = str(uuid.uuid4())
+        await ws.send(self._event("sessionStart", {"inferenceConfiguration": {
+            "maxTokens": 1024, "topP": 0.95, "temperature": 0.7}}))
+        await ws.send(self._event("promptStart", {
+            "promptName": self.prompt_name,
+            "textOutputConfiguration": {"mediaType": "text/plain"},
+            "audioOutputConfiguration": {
+                "mediaType": "audio/lpcm", "sampleRateHertz": 24000, "sampleSizeBits": 16,
+                "channelCount": 1, "voiceId": "matthew", "encoding": "base64", "audioType": "SPEECH"},
+            "toolUseOutputConfiguration": {"mediaType": "application/json"},
+            "toolConfiguration": TOOL_CONFIG,
+        }))
+        await ws.send(self._event("contentStart", {
+            "promptName": self.prompt_name, "contentName": text_content_name, "type": "TEXT",
+            "interactive": True, "role": "SYSTEM", "textInputConfiguration": {"mediaType": "text/plain"}}))
+        await ws.send(self._event("textInput", {
+            "promptName": self.prompt_name, "contentName": text_content_name,
+            "content": "You are a photos and memories voice assistant."}))
+        await ws.send(self._event("contentEnd", {"promptName": self.prompt_name, "contentName": text_content_name}))
+        await ws.send(self._event("contentStart", {
+            "promptName": self.prompt_name, "contentName": self.audio_content_name, "type": "AUDIO",
+            "interactive": True, "role": "USER", "audioInputConfiguration": {
+                "mediaType": "audio/lpcm", "sampleRateHertz": 16000, "sampleSizeBits": 16,
+                "channelCount": 1, "audioType": "SPEECH", "encoding": "base64"}}))
+
+    async def _end_session(self, ws):
+        await ws.send(self._event("contentEnd", {"promptName": self.prompt_name, "contentName": self.audio_content_name}))
+        await ws.send(self._event("promptEnd", {"promptName": self.prompt_name}))
+        await ws.send(self._event("sessionEnd", {}))
+
+    async def _stream_audio(self, ws, deadline):
+        """Speak utterances at real time, streaming silence while the assistant replies."""
+        chunk_s = self.args.chunk_ms / 1000
+        next_send = time.monotonic()
+        speech_index = 0
+
+        async def send_paced(pcm):
+            nonlocal next_send
+            next_send += chunk_s
+            await self._send_audio(ws, pcm)
+            delay = next_send - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+        while time.monotonic() < deadline:
+            # Utterance
+            for _ in range(max(1, self.args.utterance_ms // self.args.chunk_ms)):
+                await send_paced(self.speech_chunks[speech_index % len(self.speech_chunks)])
+                speech_index += 1
+            self.utterance_end = time.monotonic()
+            self.awaiting_audio = True
+            self.turn_done.clear()
+
+            # Silence until the reply has finished, then a pause
+            reply_deadline = time.monotonic() + self.args.turn_timeout
+            while not self.turn_done.is_set() and time.monotonic() < min(reply_deadline, deadline):
+                await send_paced(self.silence_chunk)
+            for _ in range(self.args.pause_ms // self.args.chunk_ms):
+                await send_paced(self.silence_chunk)
+
+    def _handle_event(self, event):
+        body = event.get("event", {})
+        if "audioOutput" in body and self.awaiting_audio:
+            self.awaiting_audio = False
+            self.stats.ttfa_ms.append((time.monotonic() - self.utterance_end) * 1000)
+        elif "contentEnd" in body:
+            content_end = body["contentEnd"]
+            if content_end.get("type") == "AUDIO" and content_end.get("stopReason") in ("END_TURN", "INTERRUPTED"):
+                self.stats.turns += 1
+                self.turn_done.set()
+        elif "sessionRejected" in body:
+            self.stats.rejected = body["sessionRejected"].get("reason")
+
+    async def _receive(self, ws):
+        async for message in ws:
+            if isinstance(message, bytes):
+                continue
+            data = json.loads(message)
+            for event in data if isinstance(data, list) else (data,):
+                self._handle_event(event)
+
+    async def run(self, start_delay, deadline):
+        await asyncio.sleep(start_delay)
+        subprotocols = [] if self.args.json_audio else [BATCHED_OUTPUT_SUBPROTOCOL, BINARY_AUDIO_SUBPROTOCOL]
+        try:
+            async with websockets.connect(self.args.url, subprotocols=subprotocols, max_size=None) as ws:
+                self.binary = ws.subprotocol in (BATCHED_OUTPUT_SUBPROTOCOL, BINARY_AUDIO_SUBPROTOCOL)
+                self.stats.connected = True
+                receiver = asyncio.create_task(self._receive(ws))
+                try:
+                    await self._start_session(ws)
+                    await self._stream_audio(ws, deadline)
+                    await self._end_session(ws)
+                finally:
+                    receiver.cancel()
+        except websockets.exceptions.ConnectionClosed as e:
+            if self.stats.rejected is None:
+                self.stats.error = f"Connection closed: {e.code}"
+        except Exception as e:
+            self.stats.error = f"{type(e).__name__}: {e}"
+
+
+def report(clients, duration, baseline, steady):
+    """Print a summary of the run."""
+    connected = [c.stats for c in clients if c.stats.connected and c.stats.rejected is None]
+    ttfa = [value for stats in connected for value in stats.ttfa_ms]
+    turns = sum(stats.turns for stats in connected)
+    rejected = sum(1 for c in clients if c.stats.rejected)
+    errors = [c.stats.error for c in clients if c.stats.error]
+
+    summary = {
+        "clients": len(clients),
+        "sessions": len(connected),
+        "rejected": rejected,
+        "errors": len(errors),
+        "turns": turns,
+        "turns_per_second": round(turns / duration, 2),
+        "ttfa_ms": {
+            "p50": round(percentile(ttfa, 0.50), 1) if ttfa else None,
+            "p95": round(percentile(ttfa, 0.95), 1) if ttfa else None,
+            "p99": round(percentile(ttfa, 0.99), 1) if ttfa else None,
+            "max": round(max(ttfa), 1) if ttfa else None,
+            "mean": round(statistics.mean(ttfa), 1) if ttfa else None,
+        },
+    }
+
+    if baseline and steady:
+        cores = (steady["process_cpu_seconds_total"] - baseline["process_cpu_seconds_total"]) / (
+            steady["time"] - baseline["time"])
+        sessions = steady.get("voice_active_sessions") or len(connected)
+        memory = steady["process_resident_memory_bytes"] - baseline["process_resident_memory_bytes"]
+        summary["server"] = {
+            "active_sessions": sessions,
+            "cpu_cores_used": round(cores, 3),
+            "sessions_per_core": round(sessions / cores, 1) if cores > 0 else None,
+            "memory_per_session_kib": round(memory / sessions / 1024, 1) if sessions else None,
+        }
+
+    print(json.dumps(summary, indent=2))
+    for error in errors[:10]:
+        print(f"error: {error}", file=sys.stderr)
+    return summary
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Real-time load generator for the voice WebSocket server")
+    parser.add_argument("--url", default="ws://localhost:8080", help="WebSocket server URL")
+    parser.add_argument("--clients", type=int, default=10, help="Concurrent clients (default: 10)")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds each client streams (default: 60)")
+    parser.add_argument("--ramp", type=float, default=5.0, help="Seconds over which clients connect (default: 5)")
+    parser.add_argument("--chunk-ms", type=int, default=32, help="Audio per input chunk in ms (default: 32)")
+    parser.add_argument("--utterance-ms", type=int, default=1500, help="Length of each utterance (default: 1500)")
+    parser.add_argument("--pause-ms", type=int, default=1000, help="Silence after each reply (default: 1000)")
+    parser.add_argument("--turn-timeout", type=float, default=30.0, help="Seconds to wait for a reply (default: 30)")
+    parser.add_argument("--wav", help="16 kHz mono 16-bit WAV to use as speech (default: a synthetic tone)")
+    parser.add_argument("--json-audio", action="store_true", help="Send base64 audioInput events instead of binary frames")
+    parser.add_argument("--metrics-url", default="http://localhost:9090/metrics",
+                        help="Server metrics endpoint for memory and CPU ('' to skip)")
+    parser.add_argument("--output", help="Also write the summary JSON to this file")
+    args = parser.parse_args()
+
+    speech_chunks = load_speech(args.wav, args.chunk_ms)
+
+    baseline = steady = None
+    if args.metrics_url:
+        try:
+            baseline = scrape_metrics(args.metrics_url)
+        except Exception as e:
+            print(f"Metrics unavailable ({e}), skipping server measurements", file=sys.stderr)
+
+    started = time.monotonic()
+    deadline = started + args.ramp + args.duration
+    clients = [VoiceClient(args, speech_chunks) for _ in range(args.clients)]
+    tasks = [
+        asyncio.create_task(client.run(args.ramp * index / max(1, args.clients) + random.uniform(0, 0.05), deadline))
+        for index, client in enumerate(clients)
+    ]
+
+    if baseline:
+        # Measure CPU and memory once every client is streaming
+        await asyncio.sleep(args.ramp + args.duration / 2)
+        ramp_done = scrape_metrics(args.metrics_url)
+        await asyncio.sleep(max(0.5, args.duration / 2 - 1))
+        steady = scrape_metrics(args.metrics_url)
+        baseline = dict(baseline, process_cpu_seconds_total=ramp_done["process_cpu_seconds_total"],
+                        time=ramp_done["time"])
+
+    await asyncio.gather(*tasks)
+    summary = report(clients, time.monotonic() - started, baseline, steady)
+    if args.output:
+        Path(args.output).write_text(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass